@@ -20,6 +20,7 @@ import inspect
 import cmd
 import getpass
 import logging
+import multiprocessing
 
 import os
 import re
@@ -367,6 +368,8 @@ class AerospikeShell(cmd.Cmd, AsyncObject):
             logger.error(e)
             return ""
 
+        self.ctrl.pre_line()
+
         for line in lines:
             if line[0] in self.commands:
                 return " ".join(line)
@@ -805,7 +808,7 @@ async def main():
                     + "."
                 )
 
-                func = common.collect_sys_info(port=cli_args.port)
+                func = await common.collect_sys_info(port=cli_args.port)
 
                 cleanup()
                 sys.exit(1)
@@ -881,6 +884,10 @@ def get_version():
 
 
 if __name__ == "__main__":
+    # Must come first, spawned processes of the frozen binary run the worker
+    # they were started for here instead of asadm.
+    multiprocessing.freeze_support()
+
     try:
         asyncio.run(main())
     except Exception:
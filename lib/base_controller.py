@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections.abc import MutableMapping
+import contextvars
 import inspect
 import re
 import logging
@@ -153,6 +155,35 @@ def create_disabled_controller(controller, command_):
     return DisableController
 
 
+# Modifiers of the executing commands. All contexts share one dict unless a task
+# calls BaseController.isolate_mods.
+_context_mods = contextvars.ContextVar("mods", default={})
+
+
+class ContextMods(MutableMapping):
+    """
+    The dict of modifiers of the current context.
+    """
+
+    def __getitem__(self, key):
+        return _context_mods.get()[key]
+
+    def __setitem__(self, key, value):
+        _context_mods.get()[key] = value
+
+    def __delitem__(self, key):
+        del _context_mods.get()[key]
+
+    def __iter__(self):
+        return iter(_context_mods.get())
+
+    def __len__(self):
+        return len(_context_mods.get())
+
+    def __repr__(self):
+        return repr(_context_mods.get())
+
+
 class ShellException(Exception):
     def __call__(self, *ignore):
         # act as a callable and raise self
@@ -167,7 +198,7 @@ class BaseController(object):
     # Here so each command controller does not need to define them
     modifiers = set()
     required_modifiers = set()
-    mods = {}
+    mods = ContextMods()
     context = None
 
     """
@@ -180,6 +211,15 @@ class BaseController(object):
         # Create static instances of view / health_checker / asadm_version /
         # logger
         BaseController.asadm_version = asadm_version
+        BaseController.health_checker.asadm_version = asadm_version
+
+    @staticmethod
+    def isolate_mods():
+        """
+        Gives the current task, and the tasks it creates, their own modifiers so
+        that commands can execute concurrently in separate tasks.
+        """
+        _context_mods.set({})
 
     def _init_commands(self):
         command_re = re.compile("^(do_(.*))$")
@@ -441,6 +481,10 @@ class BaseController(object):
         raise ShellException("%s: command not found." % (" ".join(line)))
 
     # Hook to be defined by subclasses
+    def pre_line(self):
+        # Called by the shell before the commands of each line entered.
+        pass
+
     def pre_command(self, line):
         pass
 
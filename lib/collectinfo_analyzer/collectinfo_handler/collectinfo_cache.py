@@ -0,0 +1,252 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import Mapping
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import struct
+
+from lib.utils import log_util
+from lib.utils.lazy_json import LazyJSONObject, Span
+
+from .collectinfo_parser.collectinfo_parser import CINFO_JSON_INDEX_DEPTH
+
+# Bump whenever the layout below or the parsed collectinfo format changes.
+CACHE_VERSION = 1
+CACHE_FILE_SUFFIX = ".cache"
+
+# Header is magic, cache version, marshal version and the offset of the index.
+_MAGIC = b"ASCICACH"
+_HEADER = struct.Struct(">8sHHQ")
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _to_columnar(obj):
+    """
+    Converts dicts of flat dicts, e.g. {ns: {stat: value}}, to a table of
+    (row names, {column name: values}). A column that is missing from some rows
+    is stored as a tuple of (row indices, values).
+    """
+    if isinstance(obj, list):
+        return [_to_columnar(v) for v in obj]
+
+    if not isinstance(obj, dict):
+        return obj
+
+    is_table = len(obj) > 1 and all(
+        isinstance(row, dict)
+        and row
+        and not any(isinstance(v, (dict, list)) for v in row.values())
+        for row in obj.values()
+    )
+
+    if not is_table:
+        return {k: _to_columnar(v) for k, v in obj.items()}
+
+    rows = list(obj.keys())
+    columns = {}
+
+    for i, row in enumerate(obj.values()):
+        for name, value in row.items():
+            if name not in columns:
+                columns[name] = ([], [])
+
+            columns[name][0].append(i)
+            columns[name][1].append(value)
+
+    for name, (indices, values) in columns.items():
+        columns[name] = values if len(indices) == len(rows) else (indices, values)
+
+    return (rows, columns)
+
+
+def _from_columnar(obj):
+    if isinstance(obj, list):
+        return [_from_columnar(v) for v in obj]
+
+    if isinstance(obj, dict):
+        return {k: _from_columnar(v) for k, v in obj.items()}
+
+    if not isinstance(obj, tuple):
+        return obj
+
+    rows, columns = obj
+    table = [{} for _ in rows]
+
+    for name, column in columns.items():
+        if isinstance(column, tuple):
+            for i, value in zip(*column):
+                table[i][name] = value
+        else:
+            for row, value in zip(table, column):
+                row[name] = value
+
+    return dict(zip(rows, table))
+
+
+def _decode_section(buf):
+    return _from_columnar(marshal.loads(buf))
+
+
+def _lazy_from_index(buf, index):
+    members = {}
+
+    for key, value in index.items():
+        if isinstance(value, tuple):
+            members[key] = Span(*value)
+        else:
+            members[key] = _lazy_from_index(buf, value)
+
+    return LazyJSONObject(buf, members, decode=_decode_section)
+
+
+class CollectinfoCache:
+    """
+    On disk cache of parsed collectinfo bundles keyed by the sha256 of the
+    bundle. Each node's sections are stored in a columnar layout and, like
+    ascinfo.json, are only decoded when they are first accessed.
+    """
+
+    def __init__(self, cache_dir, max_files=8):
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.logger = logging.getLogger("asadm")
+
+    def key(self, cinfo_path):
+        """
+        Returns the sha256 of the file, or of all files in the directory, at
+        cinfo_path.
+        """
+        h = hashlib.sha256()
+
+        if os.path.isfile(cinfo_path):
+            files = [cinfo_path]
+        else:
+            files = sorted(log_util.get_all_files(cinfo_path))
+
+        for file in files:
+            h.update(os.path.relpath(file, cinfo_path).encode())
+
+            with open(file, "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                    h.update(chunk)
+
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_FILE_SUFFIX)
+
+    def load(self, key):
+        """
+        Returns (parsed collectinfo, license usage) or None if key is not cached or
+        was cached by an incompatible version.
+        """
+        path = self._path(key)
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            magic, version, marshal_version, index_offset = _HEADER.unpack_from(buf)
+
+            if (
+                magic != _MAGIC
+                or version != CACHE_VERSION
+                or marshal_version != marshal.version
+            ):
+                self.logger.debug("Ignoring incompatible collectinfo cache %s", path)
+                return None
+
+            index = marshal.loads(buf[index_offset:])
+            os.utime(path)
+        except Exception as e:
+            self.logger.debug("Failed to read collectinfo cache %s: %s", path, e)
+            return None
+
+        return _lazy_from_index(buf, index["data"]), index["license"]
+
+    def _write_sections(self, f, data, depth):
+        index = {}
+        get = data.peek if isinstance(data, LazyJSONObject) else data.__getitem__
+
+        for key in data:
+            value = get(key)
+
+            if depth > 1 and isinstance(value, Mapping):
+                index[key] = self._write_sections(f, value, depth - 1)
+                continue
+
+            section = marshal.dumps(_to_columnar(value))
+            index[key] = (f.tell(), f.tell() + len(section))
+            f.write(section)
+
+        return index
+
+    def store(self, key, data, license_data_usage):
+        """
+        Writes parsed collectinfo data, {timestamp: {cluster: {node: ...}}}, to
+        the cache. Sections that have not been accessed are decoded one at a time
+        and are not kept in data.
+        """
+        path = self._path(key)
+        tmp_path = "%s.%s.tmp" % (path, os.getpid())
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            with open(tmp_path, "wb") as f:
+                f.write(b"\0" * _HEADER.size)
+                index = {
+                    "data": self._write_sections(f, data, CINFO_JSON_INDEX_DEPTH),
+                    "license": license_data_usage,
+                }
+                index_offset = f.tell()
+                f.write(marshal.dumps(index))
+                f.seek(0)
+                f.write(
+                    _HEADER.pack(_MAGIC, CACHE_VERSION, marshal.version, index_offset)
+                )
+
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.debug("Failed to write collectinfo cache %s: %s", path, e)
+
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+            return
+
+        self._evict()
+
+    def _evict(self):
+        try:
+            paths = [
+                os.path.join(self.cache_dir, f)
+                for f in os.listdir(self.cache_dir)
+                if f.endswith(CACHE_FILE_SUFFIX)
+            ]
+            paths.sort(key=os.path.getmtime, reverse=True)
+
+            for path in paths[self.max_files :]:
+                os.remove(path)
+        except Exception as e:
+            self.logger.debug("Failed to evict collectinfo cache files: %s", e)
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
-
 from lib.utils import common, util
 from lib.utils.lookup_dict import LookupDict
 
@@ -61,7 +59,8 @@ class _CollectinfoSnapshot:
         self.nodes = {}
         self.node_names = {}
         self.node_ids = {}
-        self.cinfo_data = self.ns_name_fault_check(cinfo_data)
+        self.cinfo_data = cinfo_data
+        self._prepared_sections = set()
         self.cinfo_file = cinfo_file
         self.node_lookup = LookupDict()
         self._initialize_nodes()
@@ -87,47 +86,46 @@ class _CollectinfoSnapshot:
         except Exception:
             pass
 
-    def ns_name_fault_check(self, value):
+    def _ns_name_fault_check(self, section, type):
+        """
+        Drops namespaces and sets with a space in their name from a node's config
+        or statistics.
+        """
         try:
-            for node, node_data in value.items():
-                if not node or not node_data:
-                    continue
-                if "as_stat" not in node_data:
+            namespaces = section["namespace"]
+        except Exception:
+            return
+
+        try:
+            for ns in list(namespaces.keys()):
+                if " " in ns:
+                    del namespaces[ns]
                     continue
 
-                if "config" in node_data["as_stat"]:
-                    if "namespace" in node_data["as_stat"]["config"]:
-                        for ns in value[node]["as_stat"]["config"]["namespace"].keys():
-                            if " " in ns:
-                                del value[node]["as_stat"]["config"]["namespace"][ns]
-
-                if "statistics" in node_data["as_stat"]:
-                    if "namespace" in node_data["as_stat"]["statistics"]:
-                        for ns in value[node]["as_stat"]["statistics"][
-                            "namespace"
-                        ].keys():
-                            if " " in ns:
-                                del value[node]["as_stat"]["statistics"]["namespace"][
-                                    ns
-                                ]
-                                continue
-                            if (
-                                "set"
-                                in value[node]["as_stat"]["statistics"]["namespace"][ns]
-                            ):
-                                for sets in list(
-                                    value[node]["as_stat"]["statistics"]["namespace"][
-                                        ns
-                                    ]["set"].keys()
-                                ):
-                                    if " " in sets:
-                                        del value[node]["as_stat"]["statistics"][
-                                            "namespace"
-                                        ][ns]["set"][sets]
+                if type == "statistics" and "set" in namespaces[ns]:
+                    for sets in list(namespaces[ns]["set"].keys()):
+                        if " " in sets:
+                            del namespaces[ns]["set"][sets]
 
         except Exception:
             pass
-        return value
+
+    def _get_section(self, node, type):
+        """
+        Returns a node's as_stat section as read-only FrozenDicts that are shared
+        between queries. Sections are prepared the first time they are queried so
+        that opening a collectinfo does not decode every node's sections.
+        """
+        as_stat = self.cinfo_data[node]["as_stat"]
+
+        if (node, type) not in self._prepared_sections:
+            if type in ("config", "statistics"):
+                self._ns_name_fault_check(as_stat[type], type)
+
+            as_stat[type] = util.freeze(as_stat[type])
+            self._prepared_sections.add((node, type))
+
+        return as_stat[type]
 
     def get_node_displaynames(self, nodes=None):
         node_names = {}
@@ -151,7 +149,7 @@ class _CollectinfoSnapshot:
 
             for node_name in node_names:
                 self.node_names[node_name] = node_name
-        return copy.deepcopy(self.node_names)
+        return dict(self.node_names)
 
     def get_node_ids(self, nodes=None):
         if not self.node_ids:
@@ -161,7 +159,7 @@ class _CollectinfoSnapshot:
             for key, node in self.nodes.items():
                 self.node_ids[key] = node.node_id
 
-        return copy.deepcopy(self.node_ids)
+        return dict(self.node_ids)
 
     def get_data(self, type="", stanza=""):
         data = {}
@@ -170,7 +168,6 @@ class _CollectinfoSnapshot:
             return data
 
         try:
-            # return copy.deepcopy(self.cinfo_data[type][stanza])
             for node, node_data in self.cinfo_data.items():
                 try:
                     if not node or not node_data:
@@ -182,10 +179,10 @@ class _CollectinfoSnapshot:
                     if node not in data:
                         data[node] = {}
 
-                    d = node_data["as_stat"][type]
+                    d = self._get_section(node, type)
 
                     if not stanza:
-                        data[node] = copy.deepcopy(d)
+                        data[node] = d
                         continue
 
                     if stanza in [
@@ -205,21 +202,15 @@ class _CollectinfoSnapshot:
                         for ns_name in d.keys():
                             try:
                                 if stanza == "namespace":
-                                    data[node][ns_name] = copy.deepcopy(
-                                        d[ns_name]["service"]
-                                    )
+                                    data[node][ns_name] = d[ns_name]["service"]
 
                                 elif stanza == "bin" or stanza == "bins":
-                                    data[node][ns_name] = copy.deepcopy(
-                                        d[ns_name][stanza]
-                                    )
+                                    data[node][ns_name] = d[ns_name][stanza]
 
                                 elif stanza == "set":
                                     for _name in d[ns_name][stanza]:
                                         _key = "%s %s" % (ns_name, _name)
-                                        data[node][_key] = copy.deepcopy(
-                                            d[ns_name][stanza][_name]
-                                        )
+                                        data[node][_key] = d[ns_name][stanza][_name]
 
                                 elif stanza == "sindex":
                                     for _name in d[ns_name][stanza]:
@@ -229,26 +220,24 @@ class _CollectinfoSnapshot:
                                         except Exception:
                                             continue
 
-                                        data[node][_key] = copy.deepcopy(
-                                            d[ns_name][stanza][_name]
-                                        )
+                                        data[node][_key] = d[ns_name][stanza][_name]
 
                             except Exception:
                                 pass
 
                     elif type == "meta_data" and stanza in ["endpoints", "services"]:
                         try:
-                            data[node] = copy.deepcopy(d[stanza]).split(";")
+                            data[node] = d[stanza].split(";")
                         except Exception:
-                            data[node] = copy.deepcopy(d[stanza])
+                            data[node] = d[stanza]
 
                     elif type == "meta_data" and stanza == "edition":
-                        edition = copy.deepcopy(d[stanza])
+                        edition = d[stanza]
                         data[node] = util.convert_edition_to_shortform(edition)
 
                     elif type == "histogram" and stanza == "object-size":
                         if stanza in d:
-                            data[node] = copy.deepcopy(d[stanza])
+                            data[node] = d[stanza]
 
                         else:
                             # old collectinfo does not have object-size-logarithmic
@@ -258,13 +247,13 @@ class _CollectinfoSnapshot:
                                 not common.is_new_histogram_version(as_version)
                                 and "objsz" in d
                             ):
-                                data[node] = copy.deepcopy(d["objsz"])
+                                data[node] = d["objsz"]
 
                             else:
                                 data[node] = {}
 
                     else:
-                        data[node] = copy.deepcopy(d[stanza])
+                        data[node] = d[stanza]
 
                 except Exception:
                     data[node] = {}
@@ -419,14 +408,23 @@ class _CollectinfoSnapshot:
 
 
 class CollectinfoLog(object):
-    def __init__(self, cinfo_path, files):
+    def __init__(self, cinfo_path, files, data=None, license_data_usage=None):
+        """
+        Parses files unless already parsed data and license_data_usage, e.g. from
+        the collectinfo cache, are given.
+        """
         self.files = files
         self.snapshots = {}
         self.data = {}
         self.license_data_usage = {}
-        collectinfo_parser.parse_collectinfo_files(
-            files, self.data, self.license_data_usage, True
-        )
+
+        if data is None:
+            collectinfo_parser.parse_collectinfo_files(
+                files, self.data, self.license_data_usage, True
+            )
+        else:
+            self.data.update(data)
+            self.license_data_usage.update(license_data_usage or {})
 
         if self.data:
             for ts in sorted(self.data.keys(), reverse=True):
@@ -14,21 +14,29 @@
 
 import copy
 from datetime import datetime
+import gzip
 import json
 import logging
 import os
 
-from lib.utils import conf_parser
+from lib.utils import conf_parser, lazy_json
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.CRITICAL)
 
 
+# ascinfo.json is {timestamp: {cluster: {node: {as_stat|sys_stat: {section: ...}}}}}
+CINFO_JSON_INDEX_DEPTH = 5
+
+
 def parse_collectinfo_files(
-    file_paths, parsed_map, license_usage_map, ignore_exception=False
+    file_paths, parsed_map, license_usage_map, ignore_exception=False, lazy=True
 ):
     """
     Parses on files in the collectinfo.tgz to run in collectinfo (-cf) mode.
+
+    If lazy is True, ascinfo.json is only indexed down to the per node sections
+    and each section is decoded the first time it is accessed.
     """
     UNKNOWN_NODE = "UNKNOWN_NODE"
 
@@ -41,11 +49,18 @@ def parse_collectinfo_files(
     # IF a valid cinfo json is present in cinfo_paths then append
     # its data in parsed_map.
     for cinfo_path_name in file_paths:
-        if cinfo_path_name.endswith("ascinfo.json"):
+        if cinfo_path_name.endswith(("ascinfo.json", "ascinfo.json.gz")):
             cinfo_map = {}
             try:
-                with open(cinfo_path_name) as cinfo_json:
-                    cinfo_map = json.load(cinfo_json, object_hook=_stringify)
+                if lazy:
+                    cinfo_map = lazy_json.load(
+                        cinfo_path_name, depth=CINFO_JSON_INDEX_DEPTH
+                    )
+                else:
+                    open_json = gzip.open if cinfo_path_name.endswith(".gz") else open
+
+                    with open_json(cinfo_path_name, "rt") as cinfo_json:
+                        cinfo_map = json.load(cinfo_json)
             except IOError as e:
                 if not ignore_exception:
                     logger.error(str(e))
@@ -63,7 +78,7 @@ def parse_collectinfo_files(
 
             try:
                 with open(cinfo_path_name) as unique_json:
-                    license_map = json.load(unique_json, object_hook=_stringify)
+                    license_map = json.load(unique_json)
             except IOError as e:
                 if not ignore_exception:
                     logger.error(str(e))
@@ -139,26 +154,6 @@ def _create_node_ip_map(parsed_map):
     return node_to_ip_map
 
 
-def _stringify(data):
-    """
-    Convert unicode to string.
-
-    """
-
-    if isinstance(data, dict):
-        data_str = {}
-        for _k, v in data.items():
-            data_str[_stringify(_k)] = _stringify(v)
-
-        return data_str
-
-    elif isinstance(data, list):
-        return [_stringify(element) for element in data]
-
-    else:
-        return data
-
-
 def _merge_samelevel_maps(main_map, from_map):
     """
     :param main_map: main dictionary to update
@@ -18,7 +18,8 @@ import shutil
 import tarfile
 import zipfile
 
-from lib.utils import common, log_util, util, constants
+from lib.utils import archiver, common, log_util, util, constants
+from .collectinfo_cache import CollectinfoCache
 from .collectinfo_log import CollectinfoLog
 
 ###### Constants ######
@@ -35,6 +36,7 @@ SS = 2
 # for zipped files
 COLLECTINFO_DIR = constants.ADMIN_HOME + "collectinfo/"
 COLLECTINFO_INTERNAL_DIR = "collectinfo_analyser_extracted_files"
+COLLECTINFO_CACHE_DIR = constants.ADMIN_HOME + "collectinfo_cache/"
 
 ######################
 
@@ -50,14 +52,20 @@ class CollectinfoLogHandler(object):
     def __init__(self, cinfo_path):
         self.cinfo_path = cinfo_path
         self.collectinfo_dir = COLLECTINFO_DIR + str(os.getpid())
+        self.cinfo_timestamp = None
+        self.logger = logging.getLogger("asadm")
+        self.cache = CollectinfoCache(COLLECTINFO_CACHE_DIR)
+        cache_key = self._get_cache_key(cinfo_path)
+
+        if self._add_cached_cinfo_log(cinfo_path, cache_key):
+            return
+
         self._validate_and_extract_compressed_files(
             cinfo_path, dest_dir=self.collectinfo_dir
         )
-        self.cinfo_timestamp = None
-        self.logger = logging.getLogger("asadm")
 
         try:
-            self._add_cinfo_log_files(cinfo_path)
+            self._add_cinfo_log_files(cinfo_path, cache_key)
         except Exception as e:
             self.close()
             raise e
@@ -227,10 +235,14 @@ class CollectinfoLogHandler(object):
         """
         if stanza == "users":
             for nodes_data in data.values():
-                for users_data in nodes_data.values():
-                    for user, user_data in users_data.items():
-                        if isinstance(user_data, list):
-                            users_data[user] = {"roles": user_data}
+                for node, users_data in nodes_data.items():
+                    # Snapshot data is read-only, build a new dict per node.
+                    nodes_data[node] = {
+                        user: {"roles": user_data}
+                        if isinstance(user_data, list)
+                        else user_data
+                        for user, user_data in users_data.items()
+                    }
 
         return data
 
@@ -260,7 +272,7 @@ class CollectinfoLogHandler(object):
                 try:
                     # ToDo: It should be some proper check for asadm
                     # collectinfo json file.
-                    if os.path.splitext(log_file)[1] == ".json":
+                    if log_file.endswith((".json", ".json.gz")):
                         valid_files.append(log_file)
                         continue
                 except Exception:
@@ -300,7 +312,32 @@ class CollectinfoLogHandler(object):
 
         return files
 
-    def _add_cinfo_log_files(self, cinfo_path=""):
+    def _get_cache_key(self, cinfo_path):
+        try:
+            return self.cache.key(cinfo_path)
+        except Exception as e:
+            self.logger.debug("Failed to hash collectinfo %s: %s", cinfo_path, e)
+            return None
+
+    def _add_cached_cinfo_log(self, cinfo_path, cache_key):
+        if not cache_key:
+            return False
+
+        cached = self.cache.load(cache_key)
+
+        if not cached:
+            return False
+
+        data, license_data_usage = cached
+        cinfo_log = CollectinfoLog(cinfo_path, [], data, license_data_usage)
+
+        if not cinfo_log.snapshots:
+            return False
+
+        self._set_cinfo_log(cinfo_log)
+        return True
+
+    def _add_cinfo_log_files(self, cinfo_path="", cache_key=None):
 
         if not cinfo_path:
             raise Exception("Collectinfo path not specified.")
@@ -313,6 +350,12 @@ class CollectinfoLogHandler(object):
             raise Exception("No valid Aerospike collectinfo log available.")
 
         cinfo_log = CollectinfoLog(cinfo_path, files)
+        self._set_cinfo_log(cinfo_log)
+
+        if cache_key:
+            self.cache.store(cache_key, cinfo_log.data, cinfo_log.license_data_usage)
+
+    def _set_cinfo_log(self, cinfo_log):
         self.selected_cinfo_logs = cinfo_log.snapshots
         self.all_cinfo_logs = cinfo_log.snapshots
         self.license_data_usage = cinfo_log.license_data_usage
@@ -348,6 +391,9 @@ class CollectinfoLogHandler(object):
         if zipfile.is_zipfile(file) or tarfile.is_tarfile(file):
             return True
 
+        if archiver.HAVE_ZSTD and archiver.is_zstd_file(file):
+            return True
+
         return False
 
     def _extract_to(self, file, dest_dir):
@@ -361,6 +407,9 @@ class CollectinfoLogHandler(object):
             elif zipfile.is_zipfile(file):
                 compressed_file = zipfile.ZipFile(file, "r")
 
+            elif archiver.HAVE_ZSTD and archiver.is_zstd_file(file):
+                compressed_file = archiver.open_zstd_tarfile(file)
+
             else:
                 return False
 
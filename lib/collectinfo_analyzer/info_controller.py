@@ -161,8 +161,9 @@ class InfoController(CollectinfoCommandController):
 
                         for node in dc_stats[timestamp][dc].keys():
                             if node in dc_config[timestamp][dc]:
-                                dc_stats[timestamp][dc][node].update(
-                                    dc_config[timestamp][dc][node]
+                                dc_stats[timestamp][dc][node] = dict(
+                                    dc_stats[timestamp][dc][node],
+                                    **dc_config[timestamp][dc][node]
                                 )
 
                     elif (
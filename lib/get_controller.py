@@ -13,12 +13,18 @@
 # limitations under the License.
 
 import asyncio
+from collections import Counter
 import copy
 from distutils.command.config import config
+from itertools import compress
+from operator import itemgetter, methodcaller
 
 from lib.utils import common, util, constants, version
 from .live_cluster.client import Cluster
 
+# Partition-ID fields of the 4096 partitions of a namespace.
+_PARTITION_IDS = frozenset(map(str, range(4096)))
+
 
 async def get_sindex_stats(cluster, nodes="all", for_mods=[]):
     stats = await cluster.info_sindex(nodes=nodes)
@@ -703,6 +709,17 @@ class GetFeaturesController:
 
 
 class GetPmapController:
+    # Namespace statistics that must be 0 for a node's partition counts to be
+    # reused while its cluster_key is unchanged.
+    MIGRATION_STATS = (
+        "migrate_tx_partitions_remaining",
+        "migrate_rx_partitions_remaining",
+    )
+
+    # node -> (cache key, partition counts). Shared by all instances since
+    # controllers create a new getter for every command.
+    _pmap_cache = {}
+
     def __init__(self, cluster):
         self.cluster = cluster
 
@@ -736,10 +753,55 @@ class GetPmapController:
 
         return ns_info
 
-    def _get_pmap_data(self, pmap_info, ns_info, cluster_keys, node_ids):
+    def _get_cache_keys(self, namespace_stats, cluster_keys, node_ids):
+        """
+        Returns the key each node's partition counts are cached with. Counts
+        only change with the cluster_key once migrations are done so nodes that
+        are migrating, or whose migrations are unknown, are not cached.
+        """
+        migrating = set()
+        reporting = set()
+
+        for nodes in namespace_stats.values():
+            for node, params in nodes.items():
+                reporting.add(node)
+
+                if isinstance(params, Exception) or any(
+                    str(params.get(s)) != "0" for s in self.MIGRATION_STATS
+                ):
+                    migrating.add(node)
+
+        cache_keys = {}
+
+        for node in reporting - migrating:
+            if cluster_keys.get(node, "N/E") == "N/E" or node not in node_ids:
+                continue
+
+            cache_keys[node] = (cluster_keys[node], node_ids[node])
+
+        return cache_keys
+
+    def _get_partition_columns(self, rows, indices):
+        """
+        Returns the columns at indices of the partition-info rows. When all
+        rows have the same fields they are split at once and each column is a
+        slice of the result.
+        """
+        n_separators = rows[0].count(":")
+
+        if all(map(n_separators.__eq__, map(methodcaller("count", ":"), rows))):
+            fields = ":".join(rows).split(":")
+            n_fields = n_separators + 1
+
+            return [fields[index::n_fields] for index in indices]
+
+        rows = [row.split(":") for row in rows]
+
+        return [list(map(itemgetter(index), rows)) for index in indices]
+
+    def _get_node_pmap(self, partitions, node_id):
         pid_range = 4096  # each namespace is divided into 4096 partition
-        pmap_data = {}
-        ns_available_part = {}
+        node_pmap = {}
 
         # format : (index_ptr, field_name, default_index)
         # required fields present in all versions
@@ -759,109 +821,135 @@ class GetPmapController:
         # fields present in version >= 3.15.0
         optional_new_fields = [("working_master_index", "working_master", None)]
 
-        for _node, partitions in pmap_info.items():
-            node_pmap = dict()
-            ck = cluster_keys[_node]
-            node_id = node_ids[_node]
-
-            if isinstance(partitions, Exception):
-                continue
+        f_indices = {}
 
-            f_indices = {}
+        # Setting default indices in partition fields for server < 3.8.4
+        for t in required_fields + optional_old_fields + optional_new_fields:
+            f_indices[t[0]] = t[2]
 
-            # Setting default indices in partition fields for server < 3.8.4
-            for t in required_fields + optional_old_fields + optional_new_fields:
-                f_indices[t[0]] = t[2]
+        rows = partitions.split(";")
 
-            # First row might be header, we need to check and set indices if its header row
-            index_set = False
+        # First row might be header, we need to check and set indices if its header row
+        fields = rows[0].split(":")
 
-            for item in partitions.split(";"):
-                fields = item.split(":")
+        # pmap format contains headers from server 3.8.4 onwards
+        if all(i[1] in fields for i in required_fields):
+            for t in required_fields:
+                f_indices[t[0]] = fields.index(t[1])
 
-                if not index_set:
-                    # pmap format contains headers from server 3.8.4 onwards
-                    index_set = True
+            if all(i[1] in fields for i in optional_old_fields):
+                for t in optional_old_fields:
+                    f_indices[t[0]] = fields.index(t[1])
+            elif all(i[1] in fields for i in optional_new_fields):
+                for t in optional_new_fields:
+                    f_indices[t[0]] = fields.index(t[1])
 
-                    if all(i[1] in fields for i in required_fields):
-                        for t in required_fields:
-                            f_indices[t[0]] = fields.index(t[1])
+            del rows[0]
 
-                        if all(i[1] in fields for i in optional_old_fields):
-                            for t in optional_old_fields:
-                                f_indices[t[0]] = fields.index(t[1])
-                        elif all(i[1] in fields for i in optional_new_fields):
-                            for t in optional_new_fields:
-                                f_indices[t[0]] = fields.index(t[1])
+        if not rows:
+            return node_pmap
 
-                        continue
-
-                ns, pid, state, replica = (
-                    fields[f_indices["namespace_index"]],
-                    int(fields[f_indices["partition_index"]]),
-                    fields[f_indices["state_index"]],
-                    int(fields[f_indices["replica_index"]]),
-                )
+        if f_indices["working_master_index"]:
+            role_indices = [f_indices["working_master_index"]]
+        else:
+            role_indices = [f_indices["origin_index"], f_indices["target_index"]]
+
+        pids, *columns = self._get_partition_columns(
+            rows,
+            [
+                f_indices["partition_index"],
+                f_indices["namespace_index"],
+                f_indices["state_index"],
+                f_indices["replica_index"],
+            ]
+            + role_indices,
+        )
 
-                if f_indices["working_master_index"]:
-                    working_master = fields[f_indices["working_master_index"]]
-                    origin = target = None
-                else:
-                    origin, target = (
-                        fields[f_indices["origin_index"]],
-                        fields[f_indices["target_index"]],
-                    )
-                    working_master = None
+        if not _PARTITION_IDS.issuperset(pids):
+            valid = [int(pid) in range(pid_range) for pid in pids]
 
-                if pid not in range(pid_range):
+            for ns, pid, is_valid in zip(columns[0], pids, valid):
+                if not is_valid:
                     print(
                         "For {0} found partition-ID {1} which is beyond legal partitions(0...4096)".format(
-                            ns, pid
+                            ns, int(pid)
                         )
                     )
-                    continue
 
-                if ns not in node_pmap:
-                    node_pmap[ns] = {
-                        "master_partition_count": 0,
-                        "prole_partition_count": 0,
-                    }
+            columns = [list(compress(column, valid)) for column in columns]
+
+        # Partitions have few distinct namespace, state, replica and role
+        # combinations so each combination is counted and classified once.
+        for (ns, state, replica, *role_fields), count in Counter(zip(*columns)).items():
+            replica = int(replica)
+
+            if f_indices["working_master_index"]:
+                working_master = role_fields[0]
+                origin = target = None
+            else:
+                origin, target = role_fields
+                working_master = None
 
-                if ck not in ns_available_part:
-                    ns_available_part[ck] = {}
+            if ns not in node_pmap:
+                node_pmap[ns] = {
+                    "master_partition_count": 0,
+                    "prole_partition_count": 0,
+                }
 
-                if ns not in ns_available_part[ck]:
-                    ns_available_part[ck][ns] = {}
-                    ns_available_part[ck][ns]["available_partition_count"] = 0
+            if working_master:
+                if node_id == working_master:
+                    # Working master
+                    node_pmap[ns]["master_partition_count"] += count
 
-                if working_master:
-                    if node_id == working_master:
-                        # Working master
-                        node_pmap[ns]["master_partition_count"] += 1
+                elif replica == 0 or state == "S" or state == "D":
+                    # Eventual master or replicas
+                    node_pmap[ns]["prole_partition_count"] += count
 
-                    elif replica == 0 or state == "S" or state == "D":
-                        # Eventual master or replicas
-                        node_pmap[ns]["prole_partition_count"] += 1
+            elif replica == 0:
+                if origin == "0":
+                    # Working master (Final and proper master)
+                    node_pmap[ns]["master_partition_count"] += count
 
-                elif replica == 0:
-                    if origin == "0":
-                        # Working master (Final and proper master)
-                        node_pmap[ns]["master_partition_count"] += 1
+                else:
+                    # Eventual master
+                    node_pmap[ns]["prole_partition_count"] += count
 
-                    else:
-                        # Eventual master
-                        node_pmap[ns]["prole_partition_count"] += 1
+            else:
+                if target == "0":
+                    if state == "S" or state == "D":
+                        node_pmap[ns]["prole_partition_count"] += count
 
                 else:
-                    if target == "0":
-                        if state == "S" or state == "D":
-                            node_pmap[ns]["prole_partition_count"] += 1
+                    # Working master (Acting master)
+                    node_pmap[ns]["master_partition_count"] += count
 
-                    else:
-                        # Working master (Acting master)
-                        node_pmap[ns]["master_partition_count"] += 1
+        return node_pmap
 
-            pmap_data[_node] = node_pmap
+    def _get_pmap_data(
+        self, pmap_info, ns_info, cluster_keys, node_ids, cache_keys=None
+    ):
+        """
+        Nodes whose partition-info is None are unchanged since their counts
+        were cached.
+        """
+        if cache_keys is None:
+            cache_keys = {}
+
+        pmap_data = {}
+
+        for _node, partitions in pmap_info.items():
+            if isinstance(partitions, Exception):
+                continue
+
+            if partitions is None:
+                node_pmap = self._pmap_cache[_node][1]
+            else:
+                node_pmap = self._get_node_pmap(partitions, node_ids[_node])
+
+                if _node in cache_keys:
+                    self._pmap_cache[_node] = (cache_keys[_node], node_pmap)
+
+            pmap_data[_node] = copy.deepcopy(node_pmap)
 
         for _node, _ns_data in pmap_data.items():
             ck = cluster_keys[_node]
@@ -883,9 +971,6 @@ class GetPmapController:
             getter.get_namespace(flip=True, nodes=nodes)
         )
         node_ids = asyncio.create_task(self.cluster.info("node", nodes=nodes))
-        pmap_info = asyncio.create_task(
-            self.cluster.info("partition-info", nodes=nodes)
-        )
         service_stats = await service_stats
 
         cluster_keys = {}
@@ -897,9 +982,30 @@ class GetPmapController:
                     service_stats[node], ("cluster_key"), default_value="N/E"
                 )
 
-        ns_info = self._get_namespace_data(await namespace_stats, cluster_keys)
+        namespace_stats = await namespace_stats
+        node_ids = await node_ids
+        cache_keys = self._get_cache_keys(namespace_stats, cluster_keys, node_ids)
+        cached_nodes = [
+            node
+            for node, key in cache_keys.items()
+            if node in self._pmap_cache and self._pmap_cache[node][0] == key
+        ]
+
+        # partition-info is only requested from nodes that have changed.
+        if not cached_nodes:
+            pmap_info = await self.cluster.info("partition-info", nodes=nodes)
+        else:
+            pmap_info = dict.fromkeys(cached_nodes)
+            changed_nodes = [node for node in cluster_keys if node not in pmap_info]
+
+            if changed_nodes:
+                pmap_info.update(
+                    await self.cluster.info("partition-info", nodes=changed_nodes)
+                )
+
+        ns_info = self._get_namespace_data(namespace_stats, cluster_keys)
         pmap_data = self._get_pmap_data(
-            await pmap_info, ns_info, cluster_keys, await node_ids
+            pmap_info, ns_info, cluster_keys, node_ids, cache_keys
         )
 
         return pmap_data
@@ -23,6 +23,7 @@ from .operation import (
     AssertDetailOperation,
     BinaryOperation,
     ComplexOperation,
+    HealthVector,
     SimpleOperation,
 )
 
@@ -95,15 +96,11 @@ def do_operation(
     return None
 
 
-def select_keys(
-    data={}, select_keys=[], select_from_keys=[], ignore_keys=[], save_param=None
-):
-    if not data or not isinstance(data, dict):
-        raise HealthException("Wrong Input Data for select operation.")
-
-    if not select_keys:
-        raise HealthException("No key provided for select operation.")
-
+def get_select_from_keys(data, select_from_keys):
+    """
+    Returns the from keys a select on data starts from, with the snapshot key
+    the select is on, the last snapshot if none is given.
+    """
     if not select_from_keys:
         select_from_keys = []
 
@@ -117,18 +114,51 @@ def select_keys(
             int(re.search(SNAPSHOT_KEY_PATTERN, select_from_keys[0]).group(1))
         )
 
+    return select_from_keys
+
+
+def select_keys(
+    data={},
+    select_keys=[],
+    select_from_keys=[],
+    ignore_keys=[],
+    save_param=None,
+    index=None,
+):
+    """
+    Selects keys from data. If index, a SelectIndex, is passed the select uses
+    it and the result is shared with the same selects on data.
+    """
+    if not data or not isinstance(data, dict):
+        raise HealthException("Wrong Input Data for select operation.")
+
+    if not select_keys:
+        raise HealthException("No key provided for select operation.")
+
+    select_from_keys = get_select_from_keys(data, select_from_keys)
+
     config_param = False
     if "CONFIG" in select_from_keys:
         config_param = True
 
-    result = select_keys_from_dict(
-        data=data,
-        keys=select_keys,
-        from_keys=select_from_keys,
-        ignore_keys=ignore_keys,
-        save_param=save_param,
-        config_param=config_param,
-    )
+    if index is not None:
+        result = index.select(
+            data=data,
+            keys=select_keys,
+            from_keys=select_from_keys,
+            ignore_keys=ignore_keys,
+            save_param=save_param,
+            config_param=config_param,
+        )
+    else:
+        result = select_keys_from_dict(
+            data=data,
+            keys=select_keys,
+            from_keys=select_from_keys,
+            ignore_keys=ignore_keys,
+            save_param=save_param,
+            config_param=config_param,
+        )
 
     if not result:
         raise HealthException(
@@ -180,6 +210,9 @@ def is_data_true(data):
     if not data:
         return False
 
+    if isinstance(data, HealthVector):
+        return any(data.values)
+
     if not isinstance(data, dict):
         if not util.get_value_from_health_internal_tuple(data):
             return False
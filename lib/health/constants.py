@@ -44,6 +44,7 @@ class HealthResultType:
     EXCEPTIONS_OTHER = "other"
     STATUS_COUNTERS = "status_counters"
     DEBUG_MESSAGES = "debug_messages"
+    ASSERT_CHANGES = "assert_changes"
 
 
 class HealthResultCounter:
@@ -12,10 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ProcessPoolExecutor
 import copy
-
+import hashlib
+import logging
+import marshal
+import multiprocessing
+import os
 import re
+import threading
 
+from lib.health.commands import get_select_from_keys
 from lib.health.constants import (
     ParserResultType,
     HealthResultType,
@@ -27,17 +34,72 @@ from lib.health.parser import HealthParser
 from lib.health.query import QUERIES
 from lib.health.util import is_health_parser_variable
 from lib.utils.util import parse_queries
-from lib.utils import version
+from lib.utils import constants, version
 from lib.view import terminal
 
 VERSION_CONSTRAINT_PATTERN = "SET CONSTRAINT VERSION(.+)"
 
+# Compiled query plans are cached in this directory, keyed by the sha256 of the
+# queries, the asadm version and QUERY_PLAN_VERSION. Bump it whenever the
+# grammar or the layout of a plan changes.
+QUERY_PLAN_CACHE_DIR = constants.ADMIN_HOME + "health_plans/"
+QUERY_PLAN_VERSION = 1
+QUERY_PLAN_FILE_SUFFIX = ".plan"
+
+# Queries are only executed in a process pool for health input of at least this
+# many nodes, summed over all snapshots.
+PARALLEL_QUERIES_MIN_NODES = 32
+
+# The HealthChecker executing queries in a process pool, set while the workers
+# are forked.
+_worker_health_checker = None
+
+
+def _execute_query_group(group):
+    return _worker_health_checker._execute_query_group(group)
+
+
+def _get_fingerprint(value):
+    try:
+        # Version 2 has no references to shared objects, so equal values are
+        # always written the same.
+        return hashlib.sha1(marshal.dumps(value, 2)).digest()
+    except ValueError:
+        return None
+
+
+def _get_selects(node):
+    if isinstance(node, (tuple, list)):
+        if len(node) == 5 and node[0] == "select":
+            yield node
+        else:
+            for child in node:
+                yield from _get_selects(child)
+
+
+def _is_section_selected(path, from_keys):
+    """
+    Returns True if a select from from_keys reads the section at path. Like
+    select_keys_from_dict, the from keys are matched in order and keys which
+    do not match are skipped.
+    """
+    matched = 0
+
+    for _key in path:
+        if matched == len(from_keys):
+            break
+
+        if from_keys[matched] == "ALL" or _key == from_keys[matched]:
+            matched += 1
+
+    return matched == len(from_keys)
+
 
 class HealthChecker:
     def __init__(self):
         try:
+            # The parser tables are only built once a query has to be parsed.
             self.health_parser = HealthParser()
-            self.health_parser.build()
         except Exception:
             self.health_parser = None
             pass
@@ -45,6 +107,17 @@ class HealthChecker:
         self.verbose = False
         self.no_valid_version = False
         self.filtered_data_set_to_parser = False
+        self.asadm_version = ""
+        self.query_plans = {}
+        self.filtered_health_input_data = {}
+        self.query_contexts = []
+        self.section_fingerprints = {}
+        self.query_select_from_keys = {}
+        self.last_query_key = None
+        self.last_query_results = {}
+        self.last_assert_results = {}
+        self.max_workers = min(constants.HEALTH_MAX_WORKERS, os.cpu_count() or 1)
+        self.logger = logging.getLogger("asadm")
 
     def _reset_counters(self):
         self.status_counters = {}
@@ -64,6 +137,7 @@ class HealthChecker:
         self.syntax_exceptions = []
         self.other_exceptions = []
         self.debug_outputs = []
+        self.assert_changes = []
 
     def _increment_counter(self, counter):
         if counter and counter in self.status_counters:
@@ -93,6 +167,12 @@ class HealthChecker:
                 + terminal.fg_clear()
             )
 
+        self.filtered_health_input_data = {}
+        self.section_fingerprints = {}
+
+        if self.health_parser:
+            self.health_parser.clear_select_index()
+
         self._set_parser_input(data)
 
     def _create_health_result_dict(self):
@@ -112,6 +192,7 @@ class HealthChecker:
 
         res[HealthResultType.ASSERT] = copy.deepcopy(self.assert_outputs)
         res[HealthResultType.DEBUG_MESSAGES] = copy.deepcopy(self.debug_outputs)
+        res[HealthResultType.ASSERT_CHANGES] = copy.deepcopy(self.assert_changes)
         return res
 
     def _is_assert_query(self, query):
@@ -246,27 +327,32 @@ class HealthChecker:
             return sn_node_dict
 
     def _remove_node_data(self, data, remove_nodes):
+        """
+        Returns data without the nodes in remove_nodes. Only the dicts above
+        removed nodes are copied, the rest is shared with data.
+        """
         if not data or not isinstance(data, dict):
-            return
-        for _key in list(data.keys()):
+            return data
+
+        res = {}
+        for _key, value in data.items():
             if isinstance(_key, tuple) and _key[1] == "CLUSTER":
                 if _key not in remove_nodes or remove_nodes[_key] == 1:
+                    res[_key] = value
                     continue
                 if remove_nodes[_key] == 0:
-                    data.pop(_key)
                     continue
-                for n in list(data[_key].keys()):
-                    if n in remove_nodes[_key]:
-                        data[_key].pop(n)
-                if not data[_key]:
-                    data.pop(_key)
+                value = {n: v for n, v in value.items() if n not in remove_nodes[_key]}
             else:
-                self._remove_node_data(data[_key], remove_nodes)
-                if not data[_key]:
-                    data.pop(_key)
+                value = self._remove_node_data(value, remove_nodes)
+
+            if value:
+                res[_key] = value
+
+        return res
 
     def _filter_health_input_data(self):
-        data = copy.deepcopy(self.health_input_data)
+        data = dict(self.health_input_data)
         for sn in list(data.keys()):
             # SNAPSHOT level
             remove_nodes = self._filter_nodes_to_remove(data[sn])
@@ -276,7 +362,7 @@ class HealthChecker:
                 data.pop(sn)
                 continue
             else:
-                self._remove_node_data(data[sn], remove_nodes)
+                data[sn] = self._remove_node_data(data[sn], remove_nodes)
                 if not data[sn]:
                     data.pop(sn)
         return data
@@ -288,7 +374,12 @@ class HealthChecker:
             self._set_parser_input(self.health_input_data)
             self.filtered_data_set_to_parser = False
         else:
-            d = self._filter_health_input_data()
+            # Filtered data is kept, so selects from it can reuse the select
+            # index.
+            if line not in self.filtered_health_input_data:
+                self.filtered_health_input_data[line] = self._filter_health_input_data()
+
+            d = self.filtered_health_input_data[line]
             if not d:
                 self.no_valid_version = True
             else:
@@ -296,8 +387,77 @@ class HealthChecker:
             self._set_parser_input(d)
             self.filtered_data_set_to_parser = True
 
-    def _execute_query(self, query):
-        return self.health_parser.parse(query)
+    def _execute_query(self, query, plan=None):
+        return self.health_parser.execute(query, plan)
+
+    def _get_query_plans_key(self, queries):
+        h = hashlib.sha256()
+        h.update(
+            (
+                "%s:%s:%s:" % (self.asadm_version, QUERY_PLAN_VERSION, marshal.version)
+            ).encode()
+        )
+        h.update(";".join(queries).encode())
+        return h.hexdigest()
+
+    def _compile_query(self, query):
+        if not query or query.lower() == "exit" or self._is_version_set_query(query):
+            return None
+
+        try:
+            return self.health_parser.compile(query, resolve_vars=False)
+        except Exception:
+            # Executing the query parses it again and reports the error.
+            return None
+
+    def _load_query_plans(self, path):
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                return marshal.load(f)
+        except Exception as e:
+            self.logger.debug("Failed to read health query plans %s: %s", path, e)
+            return None
+
+    def _store_query_plans(self, path, plans):
+        tmp_path = "%s.%s.tmp" % (path, os.getpid())
+
+        try:
+            os.makedirs(QUERY_PLAN_CACHE_DIR, exist_ok=True)
+
+            with open(tmp_path, "wb") as f:
+                marshal.dump(plans, f)
+
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.debug("Failed to write health query plans %s: %s", path, e)
+
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _get_query_plans(self, queries):
+        """
+        Returns a plan, or None, for each query. Plans are compiled once per
+        set of queries and cached in memory and on disk.
+        """
+        key = self._get_query_plans_key(queries)
+
+        if key in self.query_plans:
+            return self.query_plans[key]
+
+        path = os.path.join(QUERY_PLAN_CACHE_DIR, key + QUERY_PLAN_FILE_SUFFIX)
+        plans = self._load_query_plans(path)
+
+        if not isinstance(plans, list) or len(plans) != len(queries):
+            plans = [self._compile_query(query) for query in queries]
+            self._store_query_plans(path, plans)
+
+        self.query_plans[key] = plans
+        return plans
 
     def _add_assert_output(self, assert_out):
         if not assert_out:
@@ -314,6 +474,480 @@ class HealthChecker:
         assert_ptr = assert_ptr[c]
         assert_ptr.append(assert_out)
 
+    def _get_query_outcome(self, query, plan=None):
+        """
+        Executes a query. Returns (None, result) if it succeeds, otherwise the
+        counter of its exception and the error.
+        """
+        try:
+            return None, self._execute_query(query, plan)
+        except SyntaxException as se:
+            return HealthResultCounter.SYNTAX_EXCEPTION_COUNTER, str(se)
+        except HealthException as he:
+            return HealthResultCounter.HEALTH_EXCEPTION_COUNTER, str(he)
+        except Exception as oe:
+            return HealthResultCounter.OTHER_EXCEPTION_COUNTER, str(oe)
+
+    def _add_query_outcome(self, query, outcome):
+        error_counter, result = outcome
+
+        if error_counter is not None:
+            self._increment_counter(error_counter)
+
+            if error_counter == HealthResultCounter.SYNTAX_EXCEPTION_COUNTER:
+                exceptions = self.syntax_exceptions
+            elif error_counter == HealthResultCounter.HEALTH_EXCEPTION_COUNTER:
+                exceptions = self.health_exceptions
+            else:
+                exceptions = self.other_exceptions
+
+            exceptions.append(
+                {
+                    "index": self.status_counters[HealthResultCounter.QUERY_COUNTER],
+                    "query": query,
+                    "error": result,
+                }
+            )
+            return
+
+        self._increment_counter(HealthResultCounter.QUERY_SUCCESS_COUNTER)
+
+        if result:
+            try:
+                if isinstance(result, tuple):
+                    if result[0] == ParserResultType.ASSERT:
+                        if result[1][AssertResultKey.SUCCESS]:
+                            self._increment_counter(
+                                HealthResultCounter.ASSERT_PASSED_COUNTER
+                            )
+                        else:
+                            self._increment_counter(
+                                HealthResultCounter.ASSERT_FAILED_COUNTER
+                            )
+                        self._add_assert_output(result[1])
+                    elif is_health_parser_variable(result):
+                        self._increment_counter(HealthResultCounter.DEBUG_COUNTER)
+                        self.debug_outputs.append(result)
+            except Exception:
+                pass
+
+    def _is_parallel_input(self):
+        """
+        Forking workers only pays off for health input from many nodes.
+        """
+        nodes = 0
+
+        for sn_data in self.health_input_data.values():
+            try:
+                for cl_data in sn_data["METADATA"]["CLUSTER"].values():
+                    nodes += len(cl_data)
+            except Exception:
+                pass
+
+        return nodes >= PARALLEL_QUERIES_MIN_NODES
+
+    def _get_context_queries(self, queries, plans):
+        """
+        Returns the queries which would be executed as [index, query, plan,
+        context], where context is the index of the data it is executed on in
+        self.query_contexts. Returns None if the contexts can not be found.
+        """
+        saved_state = (
+            self.no_valid_version,
+            self.filtered_data_set_to_parser,
+            self.health_parser.health_input_data,
+        )
+        self.query_contexts = [self.health_parser.health_input_data]
+        context_queries = []
+
+        try:
+            for index, (query, plan) in enumerate(zip(queries, plans)):
+                if not query:
+                    continue
+
+                if query.lower() == "exit":
+                    break
+
+                if self._is_version_set_query(query):
+                    self._filter_and_set_health_input_data(query)
+                    self.query_contexts.append(self.health_parser.health_input_data)
+                    continue
+
+                if self.no_valid_version:
+                    continue
+
+                context_queries.append(
+                    [index, query, plan, len(self.query_contexts) - 1]
+                )
+        except Exception:
+            return None
+        finally:
+            (
+                self.no_valid_version,
+                self.filtered_data_set_to_parser,
+                data,
+            ) = saved_state
+            self._set_parser_input(data)
+
+        return context_queries
+
+    def _get_section_fingerprints(self, data):
+        """
+        Returns {path: fingerprint} of the sections of data, the values below
+        its component keys such as SNAPSHOT000.SERVICE.STATISTICS, which
+        selects read as a whole. A fingerprint is None if the section can not
+        be serialized.
+        """
+        try:
+            return self.section_fingerprints[id(data)][1]
+        except KeyError:
+            pass
+
+        fingerprints = {}
+
+        def add_sections(d, path):
+            for _key, value in d.items():
+                section_path = path + (_key,)
+
+                if (
+                    value
+                    and isinstance(value, dict)
+                    and all(isinstance(k, str) for k in value)
+                ):
+                    add_sections(value, section_path)
+                else:
+                    fingerprints[section_path] = _get_fingerprint(value)
+
+        add_sections(data, ())
+        # data is kept so its id is not reused while the fingerprints are.
+        self.section_fingerprints[id(data)] = (data, fingerprints)
+        return fingerprints
+
+    def _get_query_fingerprints(self, queries, plans):
+        """
+        Returns {query index: fingerprint} for the queries which would be
+        executed. A fingerprint hashes the query, the sections its selects read
+        and the fingerprints of the variables it uses, which are those of the
+        queries that assigned them, so it only stays the same if the outcome of
+        the query does. It is None if the query has no plan, or if it depends
+        on a section which can not be fingerprinted.
+        """
+        context_queries = self._get_context_queries(queries, plans)
+
+        if context_queries is None:
+            return {}
+
+        var_fingerprints = {}
+        select_fingerprints = {}
+        fingerprints = {}
+
+        for index, query, plan, context in context_queries:
+            if plan is None:
+                # The query fails to compile again when it is executed, so it
+                # does not assign any variable.
+                fingerprints[index] = None
+                continue
+
+            fingerprint = self._get_query_fingerprint(
+                query, plan, context, var_fingerprints, select_fingerprints
+            )
+            fingerprints[index] = fingerprint
+
+            if plan[1][0] == "assign":
+                var_fingerprints[plan[1][1]] = fingerprint
+
+        return fingerprints
+
+    def _get_query_fingerprint(
+        self, query, plan, context, var_fingerprints, select_fingerprints
+    ):
+        h = hashlib.sha1(query.encode())
+        names = list(plan[0])
+
+        if plan[1][0] == "assign" and plan[1][2][0] != "select":
+            # An assignment which evaluates to None keeps the previous value,
+            # a select never does.
+            names.append(plan[1][1])
+
+        for name in names:
+            if name not in var_fingerprints:
+                h.update(("%s unassigned;" % name).encode())
+                continue
+
+            if var_fingerprints[name] is None:
+                return None
+
+            h.update(("%s=" % name).encode() + var_fingerprints[name])
+
+        data = self.query_contexts[context]
+
+        if query not in self.query_select_from_keys:
+            self.query_select_from_keys[query] = [
+                select[2] for select in _get_selects(plan[1])
+            ]
+
+        for from_keys in self.query_select_from_keys[query]:
+            from_keys = get_select_from_keys(
+                data, list(from_keys) if from_keys else None
+            )
+            select_key = (context, tuple(from_keys))
+
+            if select_key not in select_fingerprints:
+                select_h = hashlib.sha1()
+
+                for path, fingerprint in self._get_section_fingerprints(data).items():
+                    if not _is_section_selected(path, from_keys):
+                        continue
+
+                    if fingerprint is None:
+                        select_h = None
+                        break
+
+                    select_h.update(repr(path).encode() + fingerprint)
+
+                select_fingerprints[select_key] = (
+                    None if select_h is None else select_h.digest()
+                )
+
+            if select_fingerprints[select_key] is None:
+                return None
+
+            h.update(select_fingerprints[select_key])
+
+        return h.digest()
+
+    def _get_query_groups(self, queries, plans):
+        """
+        Returns the queries which would be executed, split into groups which do
+        not use each other's variables. A query is a list of [index, query,
+        plan, context, check_name], where context is the index of the data it
+        is executed on in self.query_contexts and check_name is set if the
+        query assigns a variable last assigned in another group. Returns None
+        if the groups can not be found.
+        """
+        context_queries = self._get_context_queries(queries, plans)
+
+        if context_queries is None:
+            return None
+
+        group_queries = [q + [None] for q in context_queries]
+        groups = list(range(len(group_queries)))
+
+        def find_group(i):
+            while groups[i] != i:
+                groups[i] = groups[groups[i]]
+                i = groups[i]
+
+            return i
+
+        def merge_groups(i, j):
+            groups[find_group(i)] = find_group(j)
+
+        last_assigned = {}
+        reassigned = []
+
+        for i, (_, query, plan, _, _) in enumerate(group_queries):
+            if plan is None:
+                # The query is parsed again when it is executed, it could use
+                # any variable named in it.
+                try:
+                    names, assigned = self.health_parser.get_query_vars(query)
+                except Exception:
+                    return None
+            else:
+                names = plan[0]
+                assigned = plan[1][1] if plan[1][0] == "assign" else None
+
+            for name in names:
+                if name in last_assigned:
+                    merge_groups(i, last_assigned[name])
+
+            if assigned is not None:
+                if assigned in last_assigned:
+                    if plan is None:
+                        merge_groups(i, last_assigned[assigned])
+                    else:
+                        reassigned.append((i, last_assigned[assigned], assigned))
+
+                last_assigned[assigned] = i
+
+        # An assignment which evaluates to None keeps the previous value, so
+        # queries reassigning a variable of another group are checked.
+        for i, j, name in reassigned:
+            if find_group(i) != find_group(j):
+                group_queries[i][4] = name
+
+        query_groups = {}
+
+        for i, group_query in enumerate(group_queries):
+            query_groups.setdefault(find_group(i), []).append(tuple(group_query))
+
+        return list(query_groups.values())
+
+    def _execute_query_result(self, query, plan, fingerprint):
+        """
+        Executes a query. Returns its result as (fingerprint, outcome, state of
+        the variable it assigns), the state only being kept if the result can
+        be reused.
+        """
+        error_counter, result = self._get_query_outcome(query, plan)
+
+        # Only tuple results are added to the health output.
+        if error_counter is None and not isinstance(result, tuple):
+            result = None
+
+        var_state = None
+
+        if fingerprint is not None and plan[1][0] == "assign":
+            var_state = self.health_parser.save_var(plan[1][1])
+
+        return (fingerprint, (error_counter, result), var_state)
+
+    def _execute_query_incrementally(self, query, plan, fingerprint, last_result):
+        """
+        Executes a query, unless its fingerprint is the same as that of
+        last_result, its result from the last execution, in which case the
+        variable it assigned is restored and last_result returned.
+        """
+        if fingerprint is None or last_result is None or last_result[0] != fingerprint:
+            return self._execute_query_result(query, plan, fingerprint)
+
+        if last_result[2] is not None:
+            self.health_parser.restore_var(plan[1][1], last_result[2])
+
+        return last_result
+
+    def _execute_query_group(self, group):
+        """
+        Executes a group of queries from _get_query_groups, with their
+        fingerprints, in a process forked from this one. Returns {query index:
+        result}.
+        """
+        self.health_parser.clear_health_cache()
+        results = {}
+        context = None
+
+        for index, query, plan, query_context, check_name, fingerprint in group:
+            if query_context != context:
+                self._set_parser_input(self.query_contexts[query_context])
+                context = query_context
+
+            results[index] = self._execute_query_result(query, plan, fingerprint)
+
+            if check_name is not None and not self.health_parser.is_assigned(
+                check_name
+            ):
+                raise Exception(
+                    "Query %d needs variable %s from another group"
+                    % (index, check_name)
+                )
+
+        return results
+
+    @staticmethod
+    def _can_fork_workers():
+        """
+        Returns True if query workers can be forked safely, i.e. fork is the
+        default start method of this platform and this process has no other
+        threads. Otherwise queries are executed one by one.
+
+        In practice this limits parallel queries to collectinfo analysis. Live
+        mode always has other threads once connected, e.g. those collecting
+        system statistics and resolving names for the event loop.
+        """
+        return (
+            multiprocessing.get_start_method() == "fork"
+            and threading.active_count() == 1
+        )
+
+    def _execute_queries_in_parallel(
+        self, queries, plans, fingerprints=None, last_results=None
+    ):
+        """
+        Executes groups of queries which do not share variables in a process
+        pool. Groups whose queries all have the fingerprints of last_results
+        are not executed again. Returns {query index: result} for all the
+        queries which would be executed, or None if they have to be executed
+        one by one.
+        """
+        if (
+            self.max_workers < 2
+            or not self._can_fork_workers()
+            or not self._is_parallel_input()
+        ):
+            return None
+
+        groups = self._get_query_groups(queries, plans)
+
+        if not groups:
+            return None
+
+        fingerprints = fingerprints or {}
+        last_results = last_results or {}
+        results = {}
+        changed_groups = []
+
+        for group in groups:
+            if all(
+                q[0] in last_results and last_results[q[0]][0] == fingerprints.get(q[0])
+                for q in group
+            ):
+                results.update((q[0], last_results[q[0]]) for q in group)
+            else:
+                changed_groups.append([q + (fingerprints.get(q[0]),) for q in group])
+
+        if len(changed_groups) < 2:
+            return None
+
+        global _worker_health_checker
+        _worker_health_checker = self
+
+        try:
+            # Workers are forked, see _can_fork_workers(), so they have the
+            # health input data and the query contexts without pickling them.
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(groups)),
+                mp_context=multiprocessing.get_context(),
+            ) as executor:
+                futures = [
+                    executor.submit(_execute_query_group, group)
+                    for group in sorted(changed_groups, key=len, reverse=True)
+                ]
+
+                for future in futures:
+                    results.update(future.result())
+        except Exception as e:
+            self.logger.debug("Failed to execute health queries in parallel: %s", e)
+            return None
+        finally:
+            _worker_health_checker = None
+
+        return results
+
+    def _set_assert_changes(self, queries, last_assert_results, assert_results):
+        """
+        Sets the assert queries whose outcome changed since the last execution.
+        An assert which was skipped or failed to execute has no outcome.
+        """
+        for index in sorted(set(last_assert_results) | set(assert_results)):
+            last_result = last_assert_results.get(index)
+            result = assert_results.get(index)
+            last_success = last_result and last_result[AssertResultKey.SUCCESS]
+            success = result and result[AssertResultKey.SUCCESS]
+
+            if last_success == success:
+                continue
+
+            self.assert_changes.append(
+                {
+                    "index": index,
+                    "query": queries[index],
+                    "previous": last_success,
+                    "current": success,
+                    "assert": result or last_result,
+                }
+            )
+
     def _execute_queries(self, query_source=None, is_source_file=True):
         self._reset_counters()
         if not self.health_input_data or not isinstance(self.health_input_data, dict):
@@ -330,7 +964,24 @@ class HealthChecker:
         if not queries:
             raise Exception("Wrong Health query source.")
 
-        for query in queries:
+        plans = self._get_query_plans(queries)
+        fingerprints = self._get_query_fingerprints(queries, plans)
+        key = self._get_query_plans_key(queries)
+
+        if key == self.last_query_key:
+            last_results = self.last_query_results
+            last_assert_results = self.last_assert_results
+        else:
+            last_results = {}
+            last_assert_results = None
+
+        results = self._execute_queries_in_parallel(
+            queries, plans, fingerprints, last_results
+        )
+        executed_results = {}
+        assert_results = {}
+
+        for index, (query, plan) in enumerate(zip(queries, plans)):
             if not query:
                 continue
 
@@ -340,7 +991,6 @@ class HealthChecker:
                 self._increment_counter(HealthResultCounter.QUERY_SUCCESS_COUNTER)
                 break
 
-            result = None
             if self._is_version_set_query(query):
                 self._filter_and_set_health_input_data(query)
                 self._increment_counter(HealthResultCounter.QUERY_SUCCESS_COUNTER)
@@ -352,62 +1002,40 @@ class HealthChecker:
             if self._is_assert_query(query):
                 self._increment_counter(HealthResultCounter.ASSERT_QUERY_COUNTER)
 
-            try:
-                result = self._execute_query(query)
-                self._increment_counter(HealthResultCounter.QUERY_SUCCESS_COUNTER)
-            except SyntaxException as se:
-                self._increment_counter(HealthResultCounter.SYNTAX_EXCEPTION_COUNTER)
-                self.syntax_exceptions.append(
-                    {
-                        "index": self.status_counters[
-                            HealthResultCounter.QUERY_COUNTER
-                        ],
-                        "query": query,
-                        "error": str(se),
-                    }
-                )
-            except HealthException as he:
-                self._increment_counter(HealthResultCounter.HEALTH_EXCEPTION_COUNTER)
-                self.health_exceptions.append(
-                    {
-                        "index": self.status_counters[
-                            HealthResultCounter.QUERY_COUNTER
-                        ],
-                        "query": query,
-                        "error": str(he),
-                    }
-                )
-            except Exception as oe:
-                self._increment_counter(HealthResultCounter.OTHER_EXCEPTION_COUNTER)
-                self.other_exceptions.append(
-                    {
-                        "index": self.status_counters[
-                            HealthResultCounter.QUERY_COUNTER
-                        ],
-                        "query": query,
-                        "error": str(oe),
-                    }
+            if results is not None:
+                result = results[index]
+            else:
+                result = self._execute_query_incrementally(
+                    query, plan, fingerprints.get(index), last_results.get(index)
                 )
 
-            if result:
-                try:
-                    if isinstance(result, tuple):
-                        if result[0] == ParserResultType.ASSERT:
-                            if result[1][AssertResultKey.SUCCESS]:
-                                self._increment_counter(
-                                    HealthResultCounter.ASSERT_PASSED_COUNTER
-                                )
-                            else:
-                                self._increment_counter(
-                                    HealthResultCounter.ASSERT_FAILED_COUNTER
-                                )
-                            self._add_assert_output(result[1])
-                        elif is_health_parser_variable(result):
-                            self._increment_counter(HealthResultCounter.DEBUG_COUNTER)
-                            self.debug_outputs.append(result)
-                except Exception:
-                    pass
+            executed_results[index] = result
+            outcome = result[1]
+
+            if (
+                self._is_assert_query(query)
+                and outcome[0] is None
+                and isinstance(outcome[1], tuple)
+                and outcome[1][0] == ParserResultType.ASSERT
+            ):
+                assert_results[index] = outcome[1][1]
+
+            self._add_query_outcome(query, outcome)
+
+        if last_assert_results is not None:
+            self._set_assert_changes(queries, last_assert_results, assert_results)
 
+        self.logger.debug(
+            "Reused %d of %d health query results",
+            sum(1 for i, r in executed_results.items() if last_results.get(i) is r),
+            len(executed_results),
+        )
+        # Only results with a fingerprint can be reused.
+        self.last_query_key = key
+        self.last_query_results = {
+            i: r for i, r in executed_results.items() if r[0] is not None
+        }
+        self.last_assert_results = assert_results
         return True
 
     def execute(self, query_file=None):
@@ -14,7 +14,8 @@
 
 import copy
 import itertools
-from math import sqrt
+from functools import reduce
+from math import isfinite, sqrt
 import operator
 import re
 
@@ -68,6 +69,342 @@ def find_pct_value(pct, v):
     return None
 
 
+# Vector form of health values
+
+# Largest magnitude of an int which converts to float exactly, so operating on
+# it gives the same result with or without the float cast of BinaryOperation.
+MAX_EXACT_INT = 2**53
+
+ATOMIC_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_number(value):
+    if type(value) is float:
+        return isfinite(value)
+
+    return type(value) in (int, bool) and -MAX_EXACT_INT <= value <= MAX_EXACT_INT
+
+
+def _is_vector_leaf(leaf):
+    return (
+        type(leaf) is tuple
+        and len(leaf) == 2
+        and type(leaf[0]) in ATOMIC_TYPES
+        and type(leaf[1]) is list
+    )
+
+
+def _is_vector_key(key):
+    return type(key) is tuple and len(key) == 2 and all(type(k) is str for k in key)
+
+
+def _nest_leaves(paths, leaves):
+    result = {}
+
+    for path, leaf in zip(paths, leaves):
+        d = result
+
+        for _key in path[:-1]:
+            d = d.setdefault(_key, {})
+
+        d[path[-1]] = leaf
+
+    return result
+
+
+def _get_kv_name(path):
+    """
+    Returns the key find_kv_vector gives to the leaf at path.
+    """
+    if not path:
+        return NOKEY
+
+    return "/".join(_key[0] for _key in path)
+
+
+class HealthVector:
+
+    """
+    Immutable form of a health value dict whose leaves are health internal
+    tuples of atomic values.
+
+    paths holds the key path of every leaf in the order of the dict, values
+    and saved their values and saved value lists. Vectors computed from each
+    other share paths, so their values line up without matching keys, and
+    valid masks the values which are numbers that operations can be applied
+    to as a whole.
+    """
+
+    __slots__ = ("paths", "values", "saved", "_valid", "_layouts")
+
+    def __init__(self, paths, values, saved):
+        self.paths = paths
+        self.values = values
+        self.saved = saved
+        self._valid = None
+        self._layouts = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Returns the vector of data, or None if data has leaves or keys a
+        vector can not hold.
+        """
+        paths = []
+        leaves = []
+
+        def add_leaves(d, prefix):
+            for _key, value in d.items():
+                if not _is_vector_key(_key):
+                    return False
+
+                path = prefix + (_key,)
+
+                if isinstance(value, dict):
+                    if not value or not add_leaves(value, path):
+                        return False
+
+                elif _is_vector_leaf(value):
+                    paths.append(path)
+                    leaves.append(value)
+
+                else:
+                    return False
+
+            return True
+
+        if not data or not isinstance(data, dict) or not add_leaves(data, ()):
+            return None
+
+        return cls.from_leaves(tuple(paths), leaves)
+
+    @classmethod
+    def from_leaves(cls, paths, leaves):
+        """
+        Returns the vector of the leaves at paths, or their dict if the leaves
+        can not be held by a vector.
+        """
+        if not all(_is_vector_leaf(leaf) for leaf in leaves):
+            return _nest_leaves(paths, leaves)
+
+        return cls(paths, [leaf[0] for leaf in leaves], [leaf[1] for leaf in leaves])
+
+    @property
+    def valid(self):
+        if self._valid is None:
+            self._valid = [_is_number(v) for v in self.values]
+
+        return self._valid
+
+    def is_valid(self, indexes=None):
+        """
+        Returns True if all the values, or the values at indexes, are valid.
+        """
+        if indexes is None:
+            return all(self.valid)
+
+        valid = self.valid
+        return all(valid[i] for i in indexes)
+
+    def has_saved_values(self):
+        return any(self.saved)
+
+    def leaves(self):
+        return list(zip(self.values, self.saved))
+
+    def get_leaf(self, index):
+        return create_health_internal_tuple(self.values[index], list(self.saved[index]))
+
+    def to_dict(self):
+        return _nest_leaves(
+            self.paths, [self.get_leaf(i) for i in range(len(self.paths))]
+        )
+
+    def _get_layouts(self):
+        if self._layouts is None:
+            self._layouts = {tuple(_key[1] for _key in path) for path in self.paths}
+
+        return self._layouts
+
+    def _get_key_position(self, key_type, first=False):
+        """
+        Returns the position of the key of key_type, or of the first one, if it
+        is the same in all paths, else None.
+        """
+        positions = set()
+
+        for layout in self._get_layouts():
+            layout_positions = [p for p, t in enumerate(layout) if t == key_type]
+
+            if not layout_positions or (len(layout_positions) > 1 and not first):
+                return None
+
+            positions.add(layout_positions[0])
+
+        if len(positions) != 1:
+            return None
+
+        return positions.pop()
+
+    def _get_groups(self, group_by):
+        groups = {}
+
+        if group_by:
+            positions = []
+
+            for group_id in group_by:
+                position = self._get_key_position(group_id)
+
+                if position is None or position in positions:
+                    return None
+
+                positions.append(position)
+
+            for i, path in enumerate(self.paths):
+                group_path = tuple(path[p] for p in positions)
+                rest = tuple(k for p, k in enumerate(path) if p not in positions)
+                groups.setdefault(group_path, []).append((rest, i))
+
+        else:
+            position = self._get_key_position("CLUSTER", first=True)
+
+            if position is None:
+                return None
+
+            for i, path in enumerate(self.paths):
+                groups.setdefault(path[: position + 1], []).append(
+                    (path[position + 1 :], i)
+                )
+
+        for members in groups.values():
+            if len(members) > 1 and not all(rest for rest, _ in members):
+                return None
+
+        return groups
+
+    def get_groups(self, group_by=None):
+        """
+        Returns [(group path, [(rest path, index), ...]), ...] with the leaves
+        apply_operator would pass to an operation together after
+        do_multiple_group_by(group_by), their key paths below the group and
+        their indexes, sorted like find_kv_vector. Returns None if the leaves
+        do not have the group keys at the same place in all paths, in which
+        case the dict form has to be grouped.
+        """
+        groups = self._get_groups(group_by)
+
+        if groups is None:
+            return None
+
+        return [(group_path, sorted(members)) for group_path, members in groups.items()]
+
+    def group_by(self, group_by):
+        """
+        Returns the vector of do_multiple_group_by(group_by) of the dict form,
+        or None if it has to be grouped in the dict form.
+        """
+        groups = self._get_groups(group_by)
+
+        if groups is None:
+            return None
+
+        paths = []
+        indexes = []
+
+        for group_path, members in groups.items():
+            for rest, i in members:
+                paths.append(group_path + rest)
+                indexes.append(i)
+
+        return self.take(indexes, tuple(paths))
+
+    def take(self, indexes, paths):
+        """
+        Returns the vector of the leaves at indexes, at paths.
+        """
+        return HealthVector(
+            paths, [self.values[i] for i in indexes], [self.saved[i] for i in indexes]
+        )
+
+    def get_prefix_indexes(self, vector):
+        """
+        Returns the index of the leaf whose path is a prefix of the path of
+        each leaf of vector, if the paths of all leaves are the prefixes of the
+        paths of vector at the same depth. Operating on the dict forms of both
+        pairs leaves this way. Returns None otherwise.
+        """
+        depths = {len(path) for path in self.paths}
+
+        if len(depths) != 1:
+            return None
+
+        depth = depths.pop()
+        index = {path: i for i, path in enumerate(self.paths)}
+
+        try:
+            indexes = [
+                index[path[:depth]] for path in vector.paths if len(path) > depth
+            ]
+        except KeyError:
+            return None
+
+        if len(indexes) != len(vector) or len(set(indexes)) != len(index):
+            return None
+
+        return indexes
+
+    def get_kv_vector(self, members=None, update_saved_list=False):
+        """
+        Returns find_kv_vector(NOKEY, data, recurse=True, update_saved_list)
+        of the dict form of the members, a sorted group from get_groups, or of
+        the whole vector.
+        """
+        if members is None:
+            members = sorted((path, i) for i, path in enumerate(self.paths))
+
+        if len(members) == 1 and not members[0][0]:
+            return [make_map(" ", self.get_leaf(members[0][1]))]
+
+        kv = []
+
+        for rest, i in members:
+            leaf = self.get_leaf(i)
+
+            if update_saved_list:
+                leaf = add_prefix_to_saved_keys(
+                    _get_kv_name(rest[:-1] if rest[-1][1] == "KEY" else rest), leaf
+                )
+
+            kv.append(make_map(_get_kv_name(rest), leaf))
+
+        return kv
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __eq__(self, other):
+        if isinstance(other, HealthVector):
+            other = other.to_dict()
+
+        return self.to_dict() == other
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return "HealthVector(%r)" % (self.to_dict(),)
+
+
+def _to_dict(data):
+    if isinstance(data, HealthVector):
+        return data.to_dict()
+
+    return data
+
+
 # Aggregation Operations
 
 
@@ -405,6 +742,55 @@ def vector_to_vector_sd_anomaly_operation(kv, op, a, save_param):
     return res
 
 
+def vector_sd_anomaly_operation(vector, members, op, a, save_param):
+    """
+    Same as vector_to_vector_sd_anomaly_operation on the members of a
+    HealthVector group, with the mean and standard deviation computed over
+    their values at once when all of them are valid.
+    """
+    sd_multiplier = get_value_from_health_internal_tuple(a)
+    indexes = [i for _, i in members]
+
+    if (
+        len(indexes) >= 3
+        and sd_multiplier
+        and _is_number(sd_multiplier)
+        and vector.is_valid(indexes)
+    ):
+        try:
+            values = [vector.values[i] for i in indexes]
+            n = len(values)
+            mean = float(sum(values)) / float(n)
+            variance = reduce(operator.add, [pow(v - mean, 2) for v in values], 0)
+            sd = sqrt(float(variance) / float(n))
+            range_start = mean - (sd_multiplier * sd)
+            range_end = mean + (sd_multiplier * sd)
+            anomalies = [
+                m
+                for m, v in zip(members, values)
+                if float(v) < range_start or float(v) > range_end
+            ]
+            result = bool(anomalies)
+            val_to_save = []
+
+            for x in vector.get_kv_vector(anomalies, update_saved_list=True):
+                val_to_save += create_value_list_to_save(
+                    save_param=None, value=result, op1=get_kv(x)[1]
+                )
+
+            val_to_save += create_value_list_to_save(
+                save_param=save_param, value=result
+            )
+            return create_health_internal_tuple(result, val_to_save)
+
+        except Exception:
+            pass
+
+    return vector_to_vector_sd_anomaly_operation(
+        vector.get_kv_vector(members, update_saved_list=True), op, a, save_param
+    )
+
+
 ###
 
 
@@ -427,6 +813,22 @@ class BinaryOperation:
     or value and value comparison.
     """
 
+    # Operators which give the same results on valid values applied to whole
+    # vectors as applied to each value with _operate_each_key.
+    vector_operators = (
+        operator.add,
+        operator.sub,
+        operator.mul,
+        operator.truediv,
+        operator.mod,
+        operator.gt,
+        operator.lt,
+        operator.ge,
+        operator.le,
+        operator.eq,
+        operator.ne,
+    )
+
     def __init__(self, op):
         self.op = operators[op]
 
@@ -482,6 +884,99 @@ class BinaryOperation:
 
         return res_dict
 
+    @staticmethod
+    def _get_valid_values(arg, n):
+        if isinstance(arg, HealthVector):
+            return arg.values if arg.is_valid() else None
+
+        if _is_vector_leaf(arg) and _is_number(arg[0]):
+            return itertools.repeat(arg[0], n)
+
+        return None
+
+    @staticmethod
+    def _get_leaves(arg, n):
+        if isinstance(arg, HealthVector):
+            return arg.leaves()
+
+        return [arg] * n
+
+    def _operate_vectors(self, arg1, arg2, save_param=None):
+        """
+        Operates on a HealthVector and a value, or on two HealthVectors with the
+        same paths or where the paths of one are prefixes of the paths of the
+        other. Returns None if the operands have to be operated on in the dict
+        form.
+        """
+        if isinstance(arg1, HealthVector):
+            vector = arg1
+
+            if isinstance(arg2, HealthVector):
+                if arg2.paths is not arg1.paths and arg2.paths != arg1.paths:
+                    # The dict form operates on each leaf of the deeper
+                    # operand with the leaf at the prefix of its path.
+                    indexes = arg2.get_prefix_indexes(arg1)
+
+                    if indexes is not None:
+                        arg2 = arg2.take(indexes, arg1.paths)
+                    else:
+                        indexes = arg1.get_prefix_indexes(arg2)
+
+                        if indexes is None:
+                            return None
+
+                        vector = arg2
+                        arg1 = arg1.take(indexes, arg2.paths)
+
+            elif isinstance(arg2, dict):
+                return None
+
+        elif isinstance(arg1, dict):
+            return None
+
+        else:
+            vector = arg2
+
+        n = len(vector)
+        values = None
+
+        if self.op in self.vector_operators:
+            values1 = self._get_valid_values(arg1, n)
+            values2 = self._get_valid_values(arg2, n)
+
+            if values1 is not None and values2 is not None:
+                try:
+                    values = list(map(self.op, values1, values2))
+                except Exception:
+                    # Division by zero gives 0, let each value be operated on.
+                    pass
+
+        leaves1 = self._get_leaves(arg1, n)
+        leaves2 = self._get_leaves(arg2, n)
+
+        if values is None:
+            return HealthVector.from_leaves(
+                vector.paths,
+                [
+                    self._operate_each_key(l1, l2, save_param=save_param)
+                    for l1, l2 in zip(leaves1, leaves2)
+                ],
+            )
+
+        if (
+            save_param is None
+            and not any(l1[1] for l1 in leaves1)
+            and not any(l2[1] for l2 in leaves2)
+        ):
+            saved = [[] for _ in values]
+        else:
+            saved = [
+                create_value_list_to_save(save_param, value=v, op1=l1, op2=l2)
+                for v, l1, l2 in zip(values, leaves1, leaves2)
+            ]
+
+        return HealthVector(vector.paths, values, saved)
+
     def _operate_dicts(self, arg1, arg2, on_common_only=False, save_param=None):
         if isinstance(arg1, dict) and isinstance(arg2, dict):
             k1_set = set(arg1.keys())
@@ -517,6 +1012,15 @@ class BinaryOperation:
         if arg1 is None or arg2 is None:
             raise HealthException("Wrong operands for Binary operation.")
 
+        if isinstance(arg1, HealthVector) or isinstance(arg2, HealthVector):
+            result = self._operate_vectors(arg1, arg2, save_param=save_param)
+
+            if result is not None:
+                return result
+
+            arg1 = _to_dict(arg1)
+            arg2 = _to_dict(arg2)
+
         # No Group By So No Key Merging
         return self._operate_dicts(
             arg1, arg2, on_common_only=on_common_only, save_param=save_param
@@ -624,6 +1128,9 @@ class ApplyOperation:
         if result_comp_op is None:
             raise HealthException("Wrong operator for Apply operation.")
 
+        arg1 = _to_dict(arg1)
+        arg2 = _to_dict(arg2)
+
         # No Group By So No Key Merging
         return self._operate_dicts(
             arg1, arg2, comp_op=operators[result_comp_op], save_param=save_param
@@ -692,6 +1199,9 @@ class SimpleOperation:
         if arg1 is None:
             raise HealthException("Wrong operands for Simple operation.")
 
+        arg1 = _to_dict(arg1)
+        arg2 = _to_dict(arg2)
+
         # No Group By So No Key Merging
         return self._operate_dicts(arg1, arg2, save_param=save_param)
 
@@ -715,6 +1225,16 @@ class AggOperation:
         "COUNT_ALL": operators["COUNT"],
     }
 
+    # Operations computed with reduce over the values of a HealthVector group
+    # when all of them are valid, as (typecast of the first value, operator).
+    vector_reductions = {
+        "+": (float, operators["+"]),
+        "*": (float, operators["*"]),
+        "AVG": (int, operators["+"]),
+        "MAX": (float, operators["MAX"]),
+        "MIN": (float, operators["MIN"]),
+    }
+
     def __init__(self, op):
         self.op = op
         self.op_fn = self.op_fn_distributor
@@ -726,6 +1246,38 @@ class AggOperation:
 
         return create_health_internal_tuple(result, val_to_save)
 
+    def _operate_group(self, vector, members, save_param):
+        if self.op == "COUNT":
+            # Counts the keys of the next level only.
+            if not members[0][0]:
+                return self.op_fn([vector.get_leaf(members[0][1])], save_param)
+
+            return self.op_fn(
+                list(dict.fromkeys(rest[0] for rest, _ in members)), save_param
+            )
+
+        indexes = [i for _, i in members]
+
+        if self.op not in self.vector_reductions or not vector.is_valid(indexes):
+            return self.op_fn(
+                vector.get_kv_vector(members, update_saved_list=True), save_param
+            )
+
+        typecast, op = self.vector_reductions[self.op]
+        values = [vector.values[i] for i in indexes]
+        result = reduce(op, values[1:], typecast(values[0]))
+
+        if self.op == "AVG":
+            result = float(result) / float(len(values)) if result else None
+
+        if any(vector.saved[i] for i in indexes):
+            op1 = vector.get_kv_vector(members, update_saved_list=True)
+        else:
+            op1 = None
+
+        val_to_save = create_value_list_to_save(save_param, value=result, op1=op1)
+        return create_health_internal_tuple(result, val_to_save)
+
     def operate(
         self,
         arg1,
@@ -739,6 +1291,23 @@ class AggOperation:
         if not arg1:
             raise HealthException("Wrong operand for Aggregation operation.")
 
+        if isinstance(arg1, HealthVector):
+            groups = arg1.get_groups(group_by)
+
+            if groups is not None:
+                try:
+                    return HealthVector.from_leaves(
+                        tuple(group_path for group_path, _ in groups),
+                        [
+                            self._operate_group(arg1, members, save_param)
+                            for _, members in groups
+                        ],
+                    )
+                except Exception as e:
+                    raise HealthException(str(e) + " for Aggregation Operation")
+
+            arg1 = arg1.to_dict()
+
         if group_by:
             arg1 = do_multiple_group_by(arg1, group_by)
 
@@ -778,6 +1347,19 @@ class ComplexOperation:
         self.op = op
         self.op_fn = ComplexOperation.operator_and_function[op]
 
+    def _operate_group(self, vector, members, comp_op, comp_val, save_param):
+        if self.op == "SD_ANOMALY":
+            return vector_sd_anomaly_operation(
+                vector, members, comp_op, comp_val, save_param
+            )
+
+        return self.op_fn(
+            vector.get_kv_vector(members, update_saved_list=True),
+            comp_op,
+            comp_val,
+            save_param,
+        )
+
     def operate(
         self,
         arg1,
@@ -792,6 +1374,27 @@ class ComplexOperation:
             # if empty opearand
             raise HealthException("Wrong operand for Complex operation.")
 
+        if isinstance(arg1, HealthVector):
+            groups = arg1.get_groups(group_by)
+
+            if groups is not None:
+                try:
+                    comp_op = operators[result_comp_op]
+
+                    return HealthVector.from_leaves(
+                        tuple(group_path for group_path, _ in groups),
+                        [
+                            self._operate_group(
+                                arg1, members, comp_op, result_comp_val, save_param
+                            )
+                            for _, members in groups
+                        ],
+                    )
+                except Exception as e:
+                    raise HealthException(str(e) + " for Complex Operation")
+
+            arg1 = arg1.to_dict()
+
         if group_by:
             arg1 = do_multiple_group_by(arg1, group_by)
 
@@ -853,7 +1456,7 @@ class AssertDetailOperation:
 
         res[AssertResultKey.LEVEL] = level
 
-        if not isinstance(data, dict):
+        if not isinstance(data, (dict, HealthVector)):
             if not self.op(
                 get_value_from_health_internal_tuple(data),
                 get_value_from_health_internal_tuple(check_val),
@@ -938,6 +1541,15 @@ def do_group_by(data, group_by, keys=[]):
 def do_multiple_group_by(d, group_by_list):
     if not group_by_list:
         raise HealthException("No Group ID for group by operation")
+
+    if isinstance(d, HealthVector):
+        result = d.group_by(group_by_list)
+
+        if result is not None:
+            return result
+
+        d = d.to_dict()
+
     if not d or not isinstance(d, dict):
         raise HealthException("Wrong Input Data for group by operation.")
 
@@ -1071,6 +1683,244 @@ def select_keys_from_dict(
     return result_dict
 
 
+def _match_select_key(key, keys, ignore_keys):
+    """
+    Returns (True, new_name) for the first of keys which select_keys_from_dict
+    would match key with, or (False, None).
+    """
+    for check_substring, s_key, new_name in keys:
+        if (
+            (s_key == "*" and not _is_key_in_ignore_keys(key, ignore_keys))
+            or (check_substring and re.search(s_key, key))
+            or (not check_substring and key == s_key)
+        ):
+            return True, new_name
+
+    return False, None
+
+
+class _SelectNode:
+    """
+    Index of the keys select_keys_from_dict visits in one dict. Entries are
+    (position, is_child, key, value or child node), names holds the names of
+    all the KEY entries at or below the dict.
+    """
+
+    __slots__ = ("leaves", "leaf_index", "leaf_names", "children", "names")
+
+
+class SelectIndex:
+    """
+    Selects keys like select_keys_from_dict, using an index of the dicts which
+    are selected from. Each dict is indexed the first time it is selected from
+    and the index is kept for as long as the SelectIndex, so dicts must not be
+    changed while it is in use. Data filtered from the same input shares the
+    indexes of the dicts it shares.
+
+    Selects only visit the dicts holding matching keys, key patterns are only
+    matched once per key name and the result of a select is reused for the
+    same select on the same data. Results are shared, so they are returned as
+    HealthVectors where the dict can be held by one.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+        self._key_matches = {}
+        self._results = {}
+
+    def _get_node(self, data):
+        try:
+            indexed_data, node = self._nodes[id(data)]
+
+            if indexed_data is data:
+                return node
+        except KeyError:
+            pass
+
+        node = _SelectNode()
+        node.leaves = []
+        node.leaf_index = {}
+        node.children = []
+        names = set()
+
+        for pos, (_key, value) in enumerate(data.items()):
+            if isinstance(_key, tuple) and _key[1] == "KEY":
+                entry = (pos, False, _key, value)
+                node.leaves.append(entry)
+                node.leaf_index[_key[0]] = entry
+
+            elif value and isinstance(value, dict):
+                child = self._get_node(value)
+
+                # A dict without any KEY below it never adds to a result.
+                if child.names:
+                    node.children.append((pos, True, _key, child))
+                    names.update(child.names)
+
+        node.leaf_names = frozenset(node.leaf_index)
+        names.update(node.leaf_names)
+        node.names = frozenset(names)
+
+        # Holding data keeps its id from being reused.
+        self._nodes[id(data)] = (data, node)
+        return node
+
+    def _get_key_matches(self, keys, ignore_keys, names):
+        """
+        Returns {name: new_name} for the names in names which match keys.
+        """
+        if not any(
+            check_substring or s_key == "*" for check_substring, s_key, _ in keys
+        ):
+            matches = {}
+
+            for _, s_key, new_name in keys:
+                if s_key in names and s_key not in matches:
+                    matches[s_key] = new_name
+
+            return matches
+
+        known_matches = self._key_matches.setdefault((keys, ignore_keys), {})
+        matches = {}
+
+        for name in names:
+            try:
+                is_match, new_name = known_matches[name]
+            except KeyError:
+                is_match, new_name = known_matches[name] = _match_select_key(
+                    name, keys, ignore_keys
+                )
+
+            if is_match:
+                matches[name] = new_name
+
+        return matches
+
+    def _select_node(self, node, matches, match_names, save_param, formatting):
+        if len(match_names) >= len(node.leaf_names):
+            leaves = [e for e in node.leaves if e[2][0] in match_names]
+        else:
+            leaves = sorted(
+                node.leaf_index[name]
+                for name in match_names.intersection(node.leaf_names)
+            )
+
+        entries = [e for e in node.children if not e[3].names.isdisjoint(match_names)]
+
+        if leaves:
+            if entries:
+                entries = sorted(leaves + entries)
+            else:
+                entries = leaves
+
+        result_dict = {}
+
+        for _, is_child, _key, value in entries:
+            if not is_child:
+                new_name = matches[_key[0]]
+                val_to_save = create_value_list_to_save(
+                    save_param=save_param,
+                    key=_key[0],
+                    value=value,
+                    formatting=formatting,
+                )
+
+                if new_name:
+                    result_dict[(new_name, "KEY")] = create_health_internal_tuple(
+                        value, val_to_save
+                    )
+
+                else:
+                    result_dict[_key] = create_health_internal_tuple(value, val_to_save)
+
+                continue
+
+            child_res = self._select_node(
+                value, matches, match_names, save_param, formatting
+            )
+
+            if isinstance(_key, tuple):
+                result_dict[_key] = child_res
+            else:
+                result_dict = deep_merge_dicts(result_dict, child_res)
+
+        return result_dict
+
+    def _select(self, data, keys, from_keys, ignore_keys, save_param, formatting):
+        if not data or not isinstance(data, dict):
+            raise HealthException("Wrong Input Data for select operation.")
+
+        if not from_keys:
+            node = self._get_node(data)
+            matches = self._get_key_matches(keys, ignore_keys, node.names)
+
+            return self._select_node(
+                node, matches, frozenset(matches), save_param, formatting
+            )
+
+        result_dict = {}
+        f_key = from_keys[0]
+
+        for _key in data:
+            if isinstance(_key, tuple):
+                # Same as select_keys_from_dict, from_keys only match the
+                # component keys before the first tuple key.
+                break
+
+            if (f_key == "ALL") or (_key == f_key):
+                child_res = self._select(
+                    data[_key], keys, from_keys[1:], ignore_keys, save_param, formatting
+                )
+            else:
+                child_res = self._select(
+                    data[_key], keys, from_keys, ignore_keys, save_param, formatting
+                )
+
+            if child_res:
+                if f_key == "ALL":
+                    result_dict[(_key, "SNAPSHOT")] = child_res
+                else:
+                    result_dict = deep_merge_dicts(result_dict, child_res)
+
+        return result_dict
+
+    def select(
+        self,
+        data={},
+        keys=[],
+        from_keys=[],
+        ignore_keys=[],
+        save_param=None,
+        config_param=False,
+    ):
+        """
+        Same as select_keys_from_dict(data, keys, from_keys, ignore_keys,
+        save_param, config_param).
+        """
+        if not keys:
+            raise HealthException("No key provided for select operation.")
+
+        keys = tuple(tuple(k) for k in keys)
+        from_keys = tuple(from_keys)
+        ignore_keys = tuple(tuple(k) for k in ignore_keys)
+        result_key = (id(data), keys, from_keys, ignore_keys, save_param, config_param)
+
+        try:
+            selected_data, result_dict = self._results[result_key]
+
+            if selected_data is data:
+                return result_dict
+        except KeyError:
+            pass
+
+        result_dict = self._select(
+            data, keys, from_keys, ignore_keys, save_param, not config_param
+        )
+        result_dict = HealthVector.from_dict(result_dict) or result_dict
+        self._results[result_key] = (data, result_dict)
+        return result_dict
+
+
 # Recursive worker functions to apply operation
 
 
@@ -1176,6 +2026,12 @@ def find_kv_vector(key, data, recurse=False, update_saved_list=False):
     if data is None:
         return v
 
+    if isinstance(data, HealthVector):
+        if key == NOKEY and recurse:
+            return data.get_kv_vector(update_saved_list=update_saved_list)
+
+        data = data.to_dict()
+
     if not isinstance(data, dict):
         k = merge_key(key, " ", recurse)
         v.append(make_map(k, data))
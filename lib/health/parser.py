@@ -139,6 +139,10 @@ class HealthLexer:
 
     bool_vals = {"true": True, "false": False}
 
+    # When False every identifier which is not a keyword is lexed as VAR, so a
+    # query can be compiled before the variables it uses are assigned.
+    resolve_vars = True
+
     reserved = {
         "as": "AS",
         "by": "BY",
@@ -239,12 +243,12 @@ class HealthLexer:
         elif t.value in HealthLexer.assert_levels.keys():
             t.value = HealthLexer.assert_levels[t.value]
             t.type = "ASSERT_LEVEL"
-        elif t.value in HealthVars:
+        elif not self.resolve_vars or t.value in HealthVars:
             t.type = "VAR"
             t.value = (
                 constants.HEALTH_PARSER_VAR,
                 t.value,
-                copy.deepcopy(HealthVars[t.value]),
+                HealthVars.get(t.value),
             )
         return t
 
@@ -295,6 +299,7 @@ class HealthParser:
 
     tokens = HealthLexer.tokens
     health_input_data = {}
+    select_index = None
 
     precedence = (
         ("left", "ASSIGN"),
@@ -313,20 +318,13 @@ class HealthParser:
                    | assert_statement
         """
         if len(p) > 2 and p[2] is not None:
-            if isinstance(p[2], Exception):
-                val = None
-            elif util.is_health_parser_variable(p[2]):
-                val = p[2][2]
-            else:
-                val = p[2]
-
             if util.is_health_parser_variable(p[1]):
-                HealthVars[p[1][1]] = val
+                p[0] = ("assign", p[1][1], p[2])
             else:
-                HealthVars[p[1]] = val
-            p[0] = val
-            if isinstance(p[2], Exception):
-                raise p[2]
+                p[0] = ("assign", p[1], p[2])
+        elif len(p) > 2:
+            self.plan_vars.add(p[1][1])
+            p[0] = ("show", p[1][1])
         else:
             p[0] = p[1]
 
@@ -378,7 +376,7 @@ class HealthParser:
         if len(p) == 1:
             p[0] = None
         else:
-            p[0] = util.create_health_internal_tuple(p[2], [])
+            p[0] = ("const", p[2])
 
     def p_apply_comparison_op(self, p):
         """
@@ -392,12 +390,8 @@ class HealthParser:
         complex_comparison_operand : COMPLEX_PARAM
                    | operand
         """
-        if util.is_health_parser_variable(p[1]):
-            p[0] = p[1][2]
-
-        elif not isinstance(p[1], tuple):
-            p[0] = util.create_health_internal_tuple(p[1], [])
-
+        if p.slice[1].type == "COMPLEX_PARAM":
+            p[0] = ("const", p[1])
         else:
             p[0] = p[1]
 
@@ -407,9 +401,10 @@ class HealthParser:
                    | constant
         """
         if util.is_health_parser_variable(p[1]):
-            p[0] = p[1][2]
+            self.plan_vars.add(p[1][1])
+            p[0] = ("var", p[1][1])
         else:
-            p[0] = util.create_health_internal_tuple(p[1], [])
+            p[0] = ("const", p[1])
 
     def p_value(self, p):
         """
@@ -496,10 +491,8 @@ class HealthParser:
         """
         group_by_statement : group_by_clause VAR
         """
-        try:
-            p[0] = operation.do_multiple_group_by(p[2][2], p[1])
-        except Exception as e:
-            p[0] = e
+        self.plan_vars.add(p[2][1])
+        p[0] = ("group_by", p[1], ("var", p[2][1]))
 
     def p_opt_assign_statement(self, p):
         """
@@ -533,19 +526,7 @@ class HealthParser:
                         | opt_group_by_clause DO apply_operation opt_save_clause
                         | opt_group_by_clause DO simple_operation opt_save_clause
         """
-        try:
-            p[0] = commands.do_operation(
-                op=p[3][0],
-                arg1=p[3][1],
-                arg2=p[3][2],
-                group_by=p[1],
-                result_comp_op=p[3][3],
-                result_comp_val=p[3][4],
-                on_common_only=p[3][5],
-                save_param=p[4],
-            )
-        except Exception as e:
-            p[0] = e
+        p[0] = ("op", p[1]) + p[3] + (p[4],)
 
     def p_opt_save_clause(self, p):
         """
@@ -570,86 +551,27 @@ class HealthParser:
                              | ASSERT_OP LPAREN assert_arg COMMA assert_comparison_arg COMMA error_string COMMA assert_category COMMA ASSERT_LEVEL COMMA assert_desc_string RPAREN
                              | ASSERT_OP LPAREN assert_arg COMMA assert_comparison_arg COMMA error_string COMMA assert_category COMMA ASSERT_LEVEL RPAREN
         """
-        if len(p) < 14:
-            p[0] = commands.do_assert(
-                op=p[1],
-                data=p[3],
-                check_val=p[5],
-                error=p[7],
-                category=p[9],
-                level=p[11],
-            )
-        elif len(p) < 16:
-            p[0] = commands.do_assert(
-                op=p[1],
-                data=p[3],
-                check_val=p[5],
-                error=p[7],
-                category=p[9],
-                level=p[11],
-                description=p[13],
-            )
-        elif len(p) < 18:
-            p[0] = commands.do_assert(
-                op=p[1],
-                data=p[3],
-                check_val=p[5],
-                error=p[7],
-                category=p[9],
-                level=p[11],
-                description=p[13],
-                success_msg=p[15],
-            )
-        else:
-            skip_assert, assert_filter_arg = p[17]
-            if skip_assert:
-                p[0] = None
-            else:
-                if assert_filter_arg is not None:
-                    data = commands.do_operation(op="==", arg1=p[3], arg2=p[5])
-                    try:
-                        # If key filtration throws exception (due to non-matching), it just passes that and executes main assert
-                        new_data = commands.do_operation(
-                            op="||",
-                            arg1=data,
-                            arg2=assert_filter_arg,
-                            on_common_only=True,
-                        )
-                        if new_data:
-                            data = new_data
-                    except Exception:
-                        pass
-
-                    p[0] = commands.do_assert(
-                        op=p[1],
-                        data=data,
-                        check_val=util.create_health_internal_tuple(True, []),
-                        error=p[7],
-                        category=p[9],
-                        level=p[11],
-                        description=p[13],
-                        success_msg=p[15],
-                    )
-                else:
-                    p[0] = commands.do_assert(
-                        op=p[1],
-                        data=p[3],
-                        check_val=p[5],
-                        error=p[7],
-                        category=p[9],
-                        level=p[11],
-                        description=p[13],
-                        success_msg=p[15],
-                    )
+        description = p[13] if len(p) > 14 else None
+        success_msg = p[15] if len(p) > 16 else None
+        if_condition = p[17] if len(p) > 18 else None
+        p[0] = (
+            "assert",
+            p[1],
+            p[3],
+            p[5],
+            p[7],
+            p[9],
+            p[11],
+            description,
+            success_msg,
+            if_condition,
+        )
 
     def p_assert_if_condition(self, p):
         """
         assert_if_condition : assert_arg opt_assert_if_arg2
         """
-        skip_assert, assert_filter_arg = commands.do_assert_if_check(
-            p[2][0], p[1], p[2][1]
-        )
-        p[0] = (skip_assert, assert_filter_arg)
+        p[0] = (p[2][0], p[1], p[2][1])
 
     def p_opt_assert_if_arg2(self, p):
         """
@@ -671,7 +593,7 @@ class HealthParser:
         """
         assert_comparison_arg : constant
         """
-        p[0] = util.create_health_internal_tuple(p[1], [])
+        p[0] = ("const", p[1])
 
     def p_constant(self, p):
         """
@@ -714,16 +636,7 @@ class HealthParser:
                           | operand
         """
         if len(p) > 2:
-            try:
-                p[0] = commands.select_keys(
-                    data=self.health_input_data,
-                    select_keys=p[2],
-                    select_from_keys=p[3],
-                    ignore_keys=p[4],
-                    save_param=p[5],
-                )
-            except Exception as e:
-                p[0] = e
+            p[0] = ("select", p[2], p[3], p[4], p[5])
         else:
             p[0] = p[1]
 
@@ -872,7 +785,8 @@ class HealthParser:
             errorlog=yacc.NullLogger(),
             **kwargs
         )
-        self.lexer = HealthLexer().build()
+        self.health_lexer = HealthLexer()
+        self.lexer = self.health_lexer.build()
         return self.parser
 
     def set_health_data(self, health_input_data):
@@ -882,5 +796,271 @@ class HealthParser:
         global HealthVars
         HealthVars = {}
 
+    def clear_select_index(self):
+        """
+        Drops the select index. It has to be dropped before the health input
+        data, or any data it was selected from, is changed.
+        """
+        self.select_index = None
+
+    def compile(self, text, resolve_vars=True):
+        """
+        Parses a query into a plan of (variables used, statement). Statements
+        and their operands are nested tuples which only hold names and constants,
+        so a plan can be serialized and executed repeatedly with execute.
+
+        With resolve_vars=False the variables used by the query need not be
+        assigned yet.
+        """
+        if not hasattr(self, "parser"):
+            self.build()
+
+        self.plan_vars = set()
+        self.health_lexer.resolve_vars = resolve_vars
+
+        try:
+            statement = self.parser.parse(text, lexer=self.lexer)
+        finally:
+            self.health_lexer.resolve_vars = True
+
+        return (sorted(self.plan_vars), statement)
+
+    def execute(self, text, plan=None):
+        """
+        Executes a query using plan, a result of compile for text, if all the
+        variables it uses are assigned. Otherwise text is parsed again, which
+        raises the same errors as parsing it would have.
+        """
+        if plan is None or not all(v in HealthVars for v in plan[0]):
+            plan = self.compile(text)
+
+        return self._execute_statement(plan[1])
+
     def parse(self, text):
-        return self.parser.parse(text, lexer=self.lexer)
+        return self.execute(text)
+
+    def is_assigned(self, name):
+        return name in HealthVars
+
+    def save_var(self, name):
+        """
+        Returns the state of a variable, which restore_var sets it back to.
+        """
+        if name in HealthVars:
+            return (True, HealthVars[name])
+
+        return (False, None)
+
+    def restore_var(self, name, state):
+        assigned, value = state
+
+        if assigned:
+            HealthVars[name] = value
+        else:
+            HealthVars.pop(name, None)
+
+    def get_query_vars(self, text):
+        """
+        Returns (names, assigned) for a query which can not be compiled. names
+        are the variables the query could use and assigned is the variable it
+        could assign, or None.
+        """
+        if not hasattr(self, "parser"):
+            self.build()
+
+        self.health_lexer.resolve_vars = False
+
+        try:
+            self.lexer.input(text)
+            tokens = list(self.lexer)
+        except Exception:
+            # The query fails to lex before it uses any variable.
+            return [], None
+        finally:
+            self.health_lexer.resolve_vars = True
+
+        names = sorted(set(t.value[1] for t in tokens if t.type == "VAR"))
+        assigned = None
+
+        if len(tokens) > 1 and tokens[0].type == "VAR" and tokens[1].type == "ASSIGN":
+            assigned = tokens[0].value[1]
+
+        return names, assigned
+
+    def _get_var(self, name):
+        """
+        Returns a copy of the value of a variable in the dict form.
+        """
+        value = HealthVars[name]
+
+        if isinstance(value, operation.HealthVector):
+            return value.to_dict()
+
+        return copy.deepcopy(value)
+
+    def _execute_statement(self, statement):
+        if statement[0] == "assign":
+            _, name, cmd = statement
+            result = self._evaluate(cmd)
+
+            if result is None:
+                if name in HealthVars:
+                    return (constants.HEALTH_PARSER_VAR, name, self._get_var(name))
+
+                return name
+
+            if isinstance(result, Exception):
+                HealthVars[name] = None
+                raise result
+
+            if util.is_health_parser_variable(result):
+                result = result[2]
+
+            HealthVars[name] = result
+            return result
+
+        if statement[0] == "show":
+            return (
+                constants.HEALTH_PARSER_VAR,
+                statement[1],
+                self._get_var(statement[1]),
+            )
+
+        return self._execute_assert(statement)
+
+    def _execute_assert(self, statement):
+        (
+            _,
+            op,
+            arg,
+            check_val,
+            error,
+            category,
+            level,
+            description,
+            success_msg,
+            if_condition,
+        ) = statement
+        data = self._evaluate(arg)
+        check_val = self._evaluate(check_val)
+
+        if if_condition is None:
+            return commands.do_assert(
+                op=op,
+                data=data,
+                check_val=check_val,
+                error=error,
+                category=category,
+                level=level,
+                description=description,
+                success_msg=success_msg,
+            )
+
+        if_op, if_arg1, if_arg2 = if_condition
+        skip_assert, assert_filter_arg = commands.do_assert_if_check(
+            if_op, self._evaluate(if_arg1), self._evaluate(if_arg2)
+        )
+
+        if skip_assert:
+            return None
+
+        if assert_filter_arg is not None:
+            data = commands.do_operation(op="==", arg1=data, arg2=check_val)
+            try:
+                # If key filtration throws exception (due to non-matching), it just passes that and executes main assert
+                new_data = commands.do_operation(
+                    op="||",
+                    arg1=data,
+                    arg2=assert_filter_arg,
+                    on_common_only=True,
+                )
+                if new_data:
+                    data = new_data
+            except Exception:
+                pass
+
+            check_val = util.create_health_internal_tuple(True, [])
+
+        return commands.do_assert(
+            op=op,
+            data=data,
+            check_val=check_val,
+            error=error,
+            category=category,
+            level=level,
+            description=description,
+            success_msg=success_msg,
+        )
+
+    def _evaluate(self, node):
+        """
+        Evaluates an operand or command of a plan. Like the actions of the
+        original parser, a failed command returns its exception.
+        """
+        if node is None:
+            return None
+
+        kind = node[0]
+
+        if kind == "var":
+            # HealthVectors are immutable and not copied.
+            return copy.deepcopy(HealthVars[node[1]])
+
+        if kind == "const":
+            return util.create_health_internal_tuple(node[1], [])
+
+        if kind == "select":
+            _, keys, from_keys, ignore_keys, save_param = node
+
+            if self.select_index is None:
+                self.select_index = operation.SelectIndex()
+
+            try:
+                return commands.select_keys(
+                    data=self.health_input_data,
+                    select_keys=list(keys),
+                    select_from_keys=None if from_keys is None else list(from_keys),
+                    ignore_keys=list(ignore_keys),
+                    save_param=save_param,
+                    index=self.select_index,
+                )
+            except Exception as e:
+                return e
+
+        if kind == "group_by":
+            _, group_by, var = node
+            try:
+                return operation.do_multiple_group_by(
+                    self._evaluate(var), list(group_by)
+                )
+            except Exception as e:
+                return e
+
+        (
+            _,
+            group_by,
+            op,
+            arg1,
+            arg2,
+            result_comp_op,
+            result_comp_val,
+            on_common_only,
+            save_param,
+        ) = node
+        arg1 = self._evaluate(arg1)
+        arg2 = self._evaluate(arg2)
+        result_comp_val = self._evaluate(result_comp_val)
+
+        try:
+            return commands.do_operation(
+                op=op,
+                arg1=arg1,
+                arg2=arg2,
+                group_by=None if group_by is None else list(group_by),
+                result_comp_op=result_comp_op,
+                result_comp_val=result_comp_val,
+                on_common_only=on_common_only,
+                save_param=save_param,
+            )
+        except Exception as e:
+            return e
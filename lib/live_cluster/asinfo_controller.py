@@ -17,6 +17,13 @@ class ASInfoController(LiveClusterCommandController):
     def __init__(self):
         self.modifiers = set(["with", "like"])
 
+    async def execute(self, line):
+        try:
+            return await super().execute(line)
+        finally:
+            # The info command may have changed the cluster.
+            self.cluster.new_snapshot_generation()
+
     @CommandHelp("Executes an info command.")
     async def _do_default(self, line):
         mods = self.parse_modifiers(line)
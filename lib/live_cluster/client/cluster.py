@@ -760,10 +760,24 @@ class Cluster(AsyncObject):
         else:
             raise AttributeError("Cluster has no attribute '%s'" % (name))
 
+    def new_snapshot_generation(self):
+        """
+        Makes the data already fetched from the cluster stale, so that the next
+        reads fetch it again. See SnapshotStore.
+        """
+        Node.snapshot_store.new_generation()
+
     async def close(self):
+        self.logger.debug("Snapshot store stats: %s", Node.snapshot_store.stats())
+
         for node_key in self.nodes.keys():
             try:
                 node = self.nodes[node_key]
+                self.logger.debug(
+                    "%s socket pool stats: %s",
+                    node_key,
+                    await node.info_socket_pool_stats(),
+                )
                 await node.close()
             except Exception:
                 pass
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import ArgumentError
 import copy
 import logging
@@ -29,6 +30,8 @@ from lib.utils import common, constants, util, version, logger_debug, conf_parse
 from lib.utils.async_object import AsyncObject
 
 from .assocket import ASSocket
+from .socket_pool import ASSocketPool
+from .snapshot_store import SnapshotStore
 from .config_handler import JsonDynamicConfigHandler
 from . import client_util
 from . import sys_cmd_parser
@@ -47,6 +50,8 @@ logger = logger_debug.get_debug_logger(__name__, logging.CRITICAL)
 
 #### Remote Server connection module
 
+SYS_CMD_STATUS_MARKER = "ASADM_CMD_STATUS:"
+
 PXSSH_NO_MODULE = 0  # Non-linux
 PXSSH_NEW_MODULE = 1
 
@@ -103,6 +108,8 @@ def return_exceptions(func):
 
 class Node(AsyncObject):
     dns_cache = {}
+    snapshot_store = SnapshotStore()
+    _sys_stats_executor: Optional[ThreadPoolExecutor] = None
     info_roster_list_fields = ["roster", "pending_roster", "observed_nodes"]
     security_disabled_warning = False  # We only want to warn the user once.
 
@@ -220,6 +227,9 @@ class Node(AsyncObject):
             ),
         ]
 
+        self.sys_stats_timings: dict[str, float] = {}
+        self.sys_stats_total_time = 0.0
+
         # hack, _key needs to be defines before info calls... but may have
         # wrong (localhost) address before info_service is called. Will set
         # again after that call.
@@ -251,9 +261,9 @@ class Node(AsyncObject):
 
     def _initialize_socket_pool(self):
         logger.debug("%s:%s init socket pool", self.ip, self.port)
-        self.socket_pool: dict[int, set[ASSocket]] = {}
-        self.socket_pool[self.port] = set()
-        self.socket_pool_max_size = 3
+        self.socket_pool: dict[tuple[str, int], ASSocketPool] = {}
+        self._info_batches: dict[tuple[str, int], dict[str, asyncio.Future]] = {}
+        self.info_batch_max_size = 64
 
     def _is_any_my_ip(self, ips):
         if not ips:
@@ -350,6 +360,7 @@ class Node(AsyncObject):
             self._key = hash(self._service_IP_port)
             self.new_histogram_version = await self._is_new_histogram_version()
             self.alive = True
+            self._get_socket_pool(self.ip, self.port).start()
         except (ASInfoNotAuthenticatedError, ASProtocolError):
             raise
         except Exception as e:
@@ -433,7 +444,9 @@ class Node(AsyncObject):
                 await sock.close()
                 raise
 
-        self.socket_pool[self.port].add(sock)
+        if not self._get_socket_pool(self.ip, self.port).add(sock):
+            await sock.close()
+
         self.session_token, self.session_expiration = sock.get_session_info()
         self.perform_login = False
         self.logger.debug(
@@ -524,29 +537,46 @@ class Node(AsyncObject):
 
         return common.is_new_histogram_version(as_version)
 
+    def _get_socket_pool(self, ip, port) -> ASSocketPool:
+        key = (ip, port)
+        pool = self.socket_pool.get(key)
+
+        if pool is None:
+            pool = ASSocketPool(
+                lambda: self._create_connection(ip, port),
+                min_size=constants.SOCKET_POOL_MIN_SIZE,
+                max_size=constants.SOCKET_POOL_MAX_SIZE,
+                max_idle_time=constants.SOCKET_POOL_MAX_IDLE_TIME,
+                probe_interval=constants.SOCKET_POOL_PROBE_INTERVAL,
+                borrow_timeout=constants.SOCKET_POOL_BORROW_TIMEOUT,
+            )
+            self.socket_pool[key] = pool
+
+        return pool
+
     async def _get_connection(self, ip, port) -> ASSocket:
-        sock = None
+        sock = await self._get_socket_pool(ip, port).acquire()
 
-        try:
-            while True:
+        if sock and not self.ssl_context:
+            sock.settimeout(self._timeout)
 
-                sock = self.socket_pool[port].pop()
+        return sock
 
-                if await sock.is_connected():
-                    if not self.ssl_context:
-                        sock.settimeout(self._timeout)
-                    break
+    async def _release_connection(self, sock: ASSocket, ip, port):
+        pool = self._get_socket_pool(ip, port)
 
-                await sock.close()
-                sock = None
+        try:
+            sock.settimeout(None)
+        except Exception:
+            await pool.discard(sock)
+            return
 
-        except Exception as e:
-            self.logger.debug(e, include_traceback=True)
-            pass
+        await pool.release(sock)
 
-        if sock:
-            return sock
+    async def _discard_connection(self, sock: ASSocket, ip, port):
+        await self._get_socket_pool(ip, port).discard(sock)
 
+    async def _create_connection(self, ip, port) -> ASSocket:
         sock = ASSocket(
             ip,
             port,
@@ -593,14 +623,23 @@ class Node(AsyncObject):
         return None
 
     async def close(self):
-        try:
-            while True:
-                sock = self.socket_pool[self.port].pop()
-                await sock.close()
-        except Exception:
-            pass
+        for pool in self.socket_pool.values():
+            try:
+                await pool.close()
+            except Exception:
+                pass
+
+        self.socket_pool = {}
+
+    @async_return_exceptions
+    async def info_socket_pool_stats(self):
+        """
+        Get the counters of this node's socket pools.
 
-        self.socket_pool = None
+        Returns:
+        dict -- {"ip:port": {size, idle, created, reused, discarded, waits, wait_time}}
+        """
+        return {"%s:%s" % key: pool.stats() for key, pool in self.socket_pool.items()}
 
     ############################################################################
     #
@@ -618,33 +657,103 @@ class Node(AsyncObject):
     # issues in future process.
 
     @async_return_exceptions
-    @util.async_cached
-    async def _info_cinfo(self, command, ip=None, port=None):
+    async def _info_cinfo(self, command, ip=None, port=None, disable_cache=False):
         if ip is None:
             ip = self.ip
         if port is None:
             port = self.port
+
+        if not isinstance(command, str):
+            return await self._info_request(command, ip, port)
+
+        if disable_cache:
+            return await self._info_batched(command, ip, port)
+
+        return await Node.snapshot_store.get(
+            (self, ip, port), command, self._info_batched, command, ip, port
+        )
+
+    async def _info_batched(self, command, ip, port):
+        """
+        Queues command to be sent with all other info commands requested for the same
+        ip and port during this iteration of the event loop. The queued commands are
+        sent as a single multi-command info request.
+        """
+        key = (ip, port)
+        batch = self._info_batches.get(key)
+
+        if batch is None:
+            batch = {}
+            self._info_batches[key] = batch
+            asyncio.get_event_loop().call_soon(self._flush_info_batch, ip, port)
+
+        future = batch.get(command)
+
+        if future is None:
+            future = asyncio.get_event_loop().create_future()
+            batch[command] = future
+
+        return await asyncio.shield(future)
+
+    def _flush_info_batch(self, ip, port):
+        batch = self._info_batches.pop((ip, port), None)
+
+        if not batch:
+            return
+
+        commands = list(batch.keys())
+        max_size = self.info_batch_max_size
+
+        for i in range(0, len(commands), max_size):
+            asyncio.ensure_future(
+                self._send_info_batch(
+                    {c: batch[c] for c in commands[i : i + max_size]}, ip, port
+                )
+            )
+
+    async def _send_info_batch(self, batch, ip, port):
+        commands = list(batch.keys())
+
+        try:
+            if len(commands) == 1:
+                results = {commands[0]: await self._info_request(commands[0], ip, port)}
+            else:
+                results = await self._info_request(commands, ip, port)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+
+            return
+
+        for command, future in batch.items():
+            if future.done():
+                continue
+
+            if isinstance(results, Exception):
+                future.set_result(results)
+            elif command in results:
+                future.set_result(results[command])
+            else:
+                # The response did not echo this command back. Fallback to sending
+                # it by itself.
+                try:
+                    future.set_result(await self._info_request(command, ip, port))
+                except Exception as e:
+                    future.set_exception(e)
+
+    async def _info_request(self, command, ip, port):
         result = None
+        released = False
 
         sock = await self._get_connection(ip, port)
         if not sock:
             raise IOError("Error: Could not connect to node %s" % ip)
 
         try:
-            if sock:
-                result = await sock.info(command)
-                try:
-                    # TODO: same code is in _admin_cadmin. management of socket_pool should
-                    # be abstracted.
-                    if len(self.socket_pool[port]) < self.socket_pool_max_size:
-                        sock.settimeout(None)
-                        self.socket_pool[port].add(sock)
-
-                    else:
-                        await sock.close()
-
-                except Exception as e:
-                    await sock.close()
+            result = await sock.info(command)
+            released = True
+            await self._release_connection(sock, ip, port)
 
             if result != -1 and result is not None:
                 self.logger.debug(
@@ -661,8 +770,8 @@ class Node(AsyncObject):
                 raise IOError("Error: Invalid command '%s'" % command)
 
         except Exception as ex:
-            if sock:
-                await sock.close()
+            if not released:
+                await self._discard_connection(sock, ip, port)
 
             self.logger.debug(
                 "%s:%s info cmd '%s' and sock %s raised %s for",
@@ -952,11 +1061,11 @@ class Node(AsyncObject):
         if isinstance(namespaces, Exception):
             return namespaces
 
-        stats = {}
-        for ns in namespaces:
-            stats[ns] = await self.info_namespace_statistics(ns)
+        stats = await asyncio.gather(
+            *[self.info_namespace_statistics(ns) for ns in namespaces]
+        )
 
-        return stats
+        return dict(zip(namespaces, stats))
 
     @async_return_exceptions
     async def info_set_statistics(self, namespace, set_):
@@ -1698,15 +1807,20 @@ class Node(AsyncObject):
             ]
 
         hist_info = []
-        for cmd in cmd_latencies:
-            try:
-                hist_info.append(await self.info(cmd))
-            except Exception:
+        try:
+            results = await asyncio.gather(*[self.info(cmd) for cmd in cmd_latencies])
+        except Exception:
+            return data
+
+        for result in results:
+            if isinstance(result, Exception):
                 return data
-            if hist_info[-1].startswith("error"):
-                hist_info.pop()
+
+            if result.startswith("error"):
                 continue
 
+            hist_info.append(result)
+
         # example hist info after join:
         # batch-index:;{test}-read:msec,0.0,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00, /
         # 0.00,0.00,0.00,0.00,0.00,0.00,0.00;{test}-write:msec,0.0,0.00,0.00,0.00,0.00,0.00,0.00, /
@@ -2617,21 +2731,13 @@ class Node(AsyncObject):
 
         try:
             result = await admin_func(sock, *args)
-
-            # Either restore the socket in the pool or close it if it is full.
-            if len(self.socket_pool[port]) < self.socket_pool_max_size:
-                sock.settimeout(None)
-                self.socket_pool[port].add(sock)
-            else:
-                await sock.close()
-
         except Exception:
-            if sock:
-                await sock.close()
+            await self._discard_connection(sock, ip, port)
 
             # Re-raise the last exception
             raise
 
+        await self._release_connection(sock, ip, port)
         return result
 
     @async_return_exceptions
@@ -2979,8 +3085,8 @@ class Node(AsyncObject):
         sectionlist.append(command)
         sys_cmd_parser.parse_sys_section(sectionlist, imap, parsed_map)
 
-    @return_exceptions
-    def _get_localhost_system_statistics(self, commands):
+    @async_return_exceptions
+    async def _get_localhost_system_statistics(self, commands):
         sys_stats = {}
 
         logger.debug(
@@ -2989,26 +3095,43 @@ class Node(AsyncObject):
             commands,
         )
 
-        for _key, ignore_error, cmds in self.sys_cmds:
-            if _key not in commands:
-                continue
+        runner = util.ShellCommandRunner(
+            constants.SYS_CMD_MAX_WORKERS, timeout=constants.SYS_CMD_TIMEOUT
+        )
 
-            for cmd in cmds:
-                logger.debug(
-                    ("%s._get_localhost_system_statistics running cmd=%s"),
-                    self.ip,
-                    cmd,
-                )
-                o, e = util.shell_command([cmd])
-                if (e and not ignore_error) or not o:
-                    continue
+        async def get_output(_key, ignore_error, cmds):
+            start = time.monotonic()
 
-                try:
-                    self.parse_system_live_command(_key, o, sys_stats)
-                except Exception:
-                    pass
+            try:
+                for cmd in cmds:
+                    if not cmd:
+                        continue
 
-                break
+                    logger.debug(
+                        ("%s._get_localhost_system_statistics running cmd=%s"),
+                        self.ip,
+                        cmd,
+                    )
+                    o, e = await runner.run([cmd])
+                    if (e and not ignore_error) or not o:
+                        continue
+
+                    return o
+            finally:
+                self.sys_stats_timings[_key] = time.monotonic() - start
+
+        # Commands run concurrently but are parsed in order.
+        sys_cmds = [sys_cmd for sys_cmd in self.sys_cmds if sys_cmd[0] in commands]
+        outputs = await asyncio.gather(*[get_output(*sys_cmd) for sys_cmd in sys_cmds])
+
+        for (_key, _, _), o in zip(sys_cmds, outputs):
+            if o is None:
+                continue
+
+            try:
+                self.parse_system_live_command(_key, o, sys_stats)
+            except Exception:
+                pass
 
         return sys_stats
 
@@ -3044,12 +3167,20 @@ class Node(AsyncObject):
 
     @return_exceptions
     def _execute_system_command(self, conn, cmd):
-        out = self._execute_remote_system_command(conn, cmd)
-        status = self._execute_remote_system_command(conn, "echo $?")
-        status = status.split("\r\n")
-        status = status[1].strip() if len(status) > 1 else status[0].strip()
+        # The exit status is echoed as part of the same command line so that each
+        # command costs a single round trip to the remote shell.
+        out = self._execute_remote_system_command(
+            conn, "%s; echo %s$?" % (cmd, SYS_CMD_STATUS_MARKER)
+        )
+        out, sep, status = out.rpartition("\n" + SYS_CMD_STATUS_MARKER)
+
+        if sep:
+            out += "\n"
+        else:
+            out, status = status, ""
+
         try:
-            status = int(status)
+            status = int(status.strip())
         except Exception:
             status = 1
 
@@ -3121,6 +3252,8 @@ class Node(AsyncObject):
                     if _key not in commands:
                         continue
 
+                    start = time.monotonic()
+
                     for cmd in cmds:
                         try:
                             status, o = self._execute_system_command(s, cmd)
@@ -3132,6 +3265,8 @@ class Node(AsyncObject):
                         except Exception:
                             pass
 
+                    self.sys_stats_timings[_key] = time.monotonic() - start
+
                 sys_stats_collected = True
                 self._stop_ssh_connection(s)
 
@@ -3154,8 +3289,40 @@ class Node(AsyncObject):
 
         return sys_stats
 
-    @return_exceptions
-    def info_system_statistics(
+    @classmethod
+    def _get_sys_stats_executor(cls) -> ThreadPoolExecutor:
+        """
+        System statistics are collected with blocking shell and ssh calls. They run
+        in a thread pool shared by all nodes which bounds how many nodes are
+        collected from at once.
+        """
+        if cls._sys_stats_executor is None:
+            cls._sys_stats_executor = ThreadPoolExecutor(
+                max_workers=constants.SYS_STATS_MAX_WORKERS,
+                thread_name_prefix="asadm-sys-stats",
+            )
+
+        return cls._sys_stats_executor
+
+    async def _run_in_sys_stats_executor(self, func, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._get_sys_stats_executor(), func, *args)
+
+    @async_return_exceptions
+    async def info_system_statistics_timings(self):
+        """
+        Get the time taken by the last system statistics collection.
+
+        Returns:
+        dict -- {"total": seconds, "commands": {command_name: seconds, ...}}
+        """
+        return {
+            "total": self.sys_stats_total_time,
+            "commands": dict(self.sys_stats_timings),
+        }
+
+    @async_return_exceptions
+    async def info_system_statistics(
         self,
         default_user=None,
         default_pwd=None,
@@ -3171,7 +3338,6 @@ class Node(AsyncObject):
         Returns:
         dict -- {stat_name : stat_value, ...}
         """
-        # TODO make async
         logger.debug(
             (
                 "%s.info_system_statistics default_user=%s default_pws=%s"
@@ -3189,14 +3355,53 @@ class Node(AsyncObject):
         )
 
         if commands:
-            cmd_list = copy.deepcopy(commands)
+            cmd_list = tuple(commands)
         else:
-            cmd_list = [_key for _key, _, _ in self.sys_cmds]
+            cmd_list = tuple(_key for _key, _, _ in self.sys_cmds)
 
-        if self.localhost:
-            return self._get_localhost_system_statistics(cmd_list)
+        # Stored per set of options, readers get their own copy.
+        sys_stats = await Node.snapshot_store.get(
+            (self, self.ip, self.port),
+            (
+                "system_statistics",
+                cmd_list,
+                collect_remote_data,
+                default_user,
+                default_pwd,
+                default_ssh_key,
+                default_ssh_port,
+                credential_file,
+            ),
+            self._fetch_system_statistics,
+            list(cmd_list),
+            default_user,
+            default_pwd,
+            default_ssh_key,
+            default_ssh_port,
+            credential_file,
+            collect_remote_data,
+        )
+
+        return copy.deepcopy(sys_stats)
+
+    async def _fetch_system_statistics(
+        self,
+        cmd_list,
+        default_user,
+        default_pwd,
+        default_ssh_key,
+        default_ssh_port,
+        credential_file,
+        collect_remote_data,
+    ):
+        self.sys_stats_timings = {}
+        self.sys_stats_total_time = 0.0
+        start = time.monotonic()
+        sys_stats = {}
 
-        if collect_remote_data:
+        if self.localhost:
+            sys_stats = await self._get_localhost_system_statistics(cmd_list)
+        elif collect_remote_data:
             self._set_default_system_credentials(
                 default_user,
                 default_pwd,
@@ -3204,9 +3409,19 @@ class Node(AsyncObject):
                 default_ssh_port,
                 credential_file,
             )
-            return self._get_remote_host_system_statistics(cmd_list)
+            sys_stats = await self._run_in_sys_stats_executor(
+                self._get_remote_host_system_statistics, cmd_list
+            )
 
-        return {}
+        self.sys_stats_total_time = time.monotonic() - start
+        logger.debug(
+            "%s.info_system_statistics took %ss cmd timings=%s",
+            self.ip,
+            self.sys_stats_total_time,
+            self.sys_stats_timings,
+        )
+
+        return sys_stats
 
     ############################################################################
     #
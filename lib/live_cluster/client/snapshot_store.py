@@ -0,0 +1,157 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from collections import OrderedDict
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+from lib.utils import constants
+
+
+class SnapshotStore:
+    """
+    Session wide store of the data fetched from the cluster. Entries are keyed
+    by (node, command, generation) and every controller reads through it, so
+    commands run back to back share one fetch of each response.
+
+    How long an entry stays fresh is decided by the policy of its command, see
+    constants.SNAPSHOT_POLICIES. Concurrent reads of a missing entry share a
+    single fetch, and fetches that raise or return an exception are not kept.
+    new_generation() makes every entry stale, e.g. for every line entered or
+    after the cluster was changed. Entries of static_commands, which hardly ever
+    change, are kept across generations.
+    """
+
+    def __init__(
+        self,
+        policies=constants.SNAPSHOT_POLICIES,
+        max_age=constants.SNAPSHOT_MAX_AGE,
+        max_size=constants.SNAPSHOT_MAX_SIZE,
+        static_commands=constants.SNAPSHOT_STATIC_COMMANDS,
+    ):
+        self.policies = policies
+        self.max_age = max_age
+        self.max_size = max_size
+        self.static_commands = frozenset(static_commands)
+        self.generation = 0
+
+        # Entries are (task, fetch time) in least recently used order.
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_max_age(self, command) -> float:
+        """
+        Returns the max age, in seconds, of the policy matching command. A tuple
+        command uses the policy of its first element.
+        """
+        if not isinstance(command, str):
+            command = command[0]
+
+        for policy_command, max_age in self.policies:
+            if command == policy_command or (
+                policy_command[-1] in "/:" and command.startswith(policy_command)
+            ):
+                return max_age
+
+        return self.max_age
+
+    def new_generation(self):
+        """
+        Starts a new generation. Entries of older generations, but those of
+        static_commands, are dropped and fetches already in flight are not
+        shared with the new generation.
+        """
+        self.generation += 1
+
+        for key in [key for key in self._entries if key[2] is not None]:
+            del self._entries[key]
+
+    @staticmethod
+    def _is_reusable(task: asyncio.Future) -> bool:
+        if task.get_loop() is not asyncio.get_event_loop():
+            return False
+
+        if not task.done():
+            return True
+
+        return not (
+            task.cancelled()
+            or task.exception() is not None
+            or isinstance(task.result(), Exception)
+        )
+
+    def _get_task(self, key, command, fetch, args):
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            task, fetch_time = entry
+
+            if now - fetch_time <= self.get_max_age(command) and self._is_reusable(
+                task
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return task
+
+        self.misses += 1
+        task = asyncio.ensure_future(fetch(*args))
+        self._entries[key] = (task, now)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        return task
+
+    async def get(
+        self,
+        node: Hashable,
+        command: Hashable,
+        fetch: Callable[..., Awaitable[Any]],
+        *args
+    ) -> Any:
+        """
+        Returns the stored result of command for node, if still fresh, otherwise
+        the result of fetch(*args), which is then stored.
+        """
+        if command in self.static_commands:
+            key = (node, command, None)
+        else:
+            key = (node, command, self.generation)
+
+        # The shield keeps a cancelled reader from cancelling the fetch of the
+        # other readers.
+        return await asyncio.shield(self._get_task(key, command, fetch, args))
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the counters of this store. Useful for tuning the policies.
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
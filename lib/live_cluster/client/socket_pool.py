@@ -0,0 +1,293 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from .assocket import ASSocket
+
+
+class ASSocketPool:
+    """
+    Pool of authenticated ASSocket connections to a single ip and port.
+
+    At most max_size sockets are open at once, borrowed or idle. When all of them
+    are borrowed, acquire() waits up to borrow_timeout seconds for one to be
+    released. Idle sockets are probed in the background every probe_interval
+    seconds, sockets idle for longer than max_idle_time are closed, and the pool
+    is kept warm with at least min_size sockets.
+    """
+
+    logger = logging.getLogger("asadm")
+
+    def __init__(
+        self,
+        create_socket: Callable[[], Awaitable[Optional[ASSocket]]],
+        min_size=1,
+        max_size=10,
+        max_idle_time=55.0,
+        probe_interval=10.0,
+        borrow_timeout: Optional[float] = 30.0,
+    ):
+        self._create_socket = create_socket
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.probe_interval = probe_interval
+        self.borrow_timeout = borrow_timeout
+
+        # Entries are [socket, last release time, last time known to be connected]
+        self._idle: deque[list] = deque()
+        self._size = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._probe_handle: Optional[asyncio.TimerHandle] = None
+        self._probe_task: Optional[asyncio.Future] = None
+        self._closed = False
+
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def __len__(self):
+        """
+        Number of idle sockets.
+        """
+        return len(self._idle)
+
+    def __contains__(self, sock):
+        return any(entry[0] is sock for entry in self._idle)
+
+    @property
+    def size(self):
+        """
+        Number of open sockets, borrowed or idle.
+        """
+        return self._size
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "created": self.created,
+            "reused": self.reused,
+            "discarded": self.discarded,
+            "waits": self.waits,
+            "wait_time": self.wait_time,
+        }
+
+    def _wake_waiter(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def _new_socket(self) -> Optional[ASSocket]:
+        self._size += 1
+
+        try:
+            sock = await self._create_socket()
+        except Exception:
+            self._size -= 1
+            self._wake_waiter()
+            raise
+
+        if not sock:
+            self._size -= 1
+            self._wake_waiter()
+            return None
+
+        self.created += 1
+        return sock
+
+    async def _discard(self, sock: ASSocket):
+        self._size -= 1
+        self.discarded += 1
+        self._wake_waiter()
+
+        try:
+            await sock.close()
+        except Exception:
+            pass
+
+    async def acquire(self) -> Optional[ASSocket]:
+        """
+        Borrow a socket from the pool, creating one if none are idle. Returns None
+        if a new socket could not connect.
+        """
+        start = time.monotonic()
+
+        while True:
+            while self._idle:
+                # Most recently released socket first. It is the least likely to have
+                # been closed by the server.
+                sock, _, verified = self._idle.pop()
+
+                if time.monotonic() - verified < self.probe_interval:
+                    self.reused += 1
+                    return sock
+
+                if await sock.is_connected():
+                    self.reused += 1
+                    return sock
+
+                await self._discard(sock)
+
+            if self._closed or self._size < self.max_size:
+                return await self._new_socket()
+
+            waiter = asyncio.get_event_loop().create_future()
+            self._waiters.append(waiter)
+            self.waits += 1
+            timeout = None
+
+            if self.borrow_timeout is not None:
+                timeout = self.borrow_timeout - (time.monotonic() - start)
+
+            try:
+                await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                raise IOError(
+                    "Error: Timed out waiting for a connection after %ss"
+                    % self.borrow_timeout
+                )
+            finally:
+                self.wait_time += time.monotonic() - start
+
+    async def release(self, sock: ASSocket):
+        """
+        Return a borrowed socket to the pool.
+        """
+        if self._closed:
+            await self._discard(sock)
+            return
+
+        now = time.monotonic()
+        self._idle.append([sock, now, now])
+        self._wake_waiter()
+
+    async def discard(self, sock: ASSocket):
+        """
+        Close a borrowed socket that should not be reused, e.g. after an error.
+        """
+        await self._discard(sock)
+
+    def add(self, sock: ASSocket) -> bool:
+        """
+        Adopt a socket that was created outside of the pool, e.g. by login. Returns
+        False if the pool is full and the socket was not added.
+        """
+        if self._closed or self._size >= self.max_size:
+            return False
+
+        now = time.monotonic()
+        self._size += 1
+        self.created += 1
+        self._idle.append([sock, now, now])
+        self._wake_waiter()
+        return True
+
+    async def prewarm(self):
+        """
+        Open sockets until the pool holds min_size sockets.
+        """
+        while not self._closed and self._size < self.min_size:
+            sock = await self._new_socket()
+
+            if not sock:
+                return
+
+            await self.release(sock)
+
+    async def _probe_idle(self):
+        now = time.monotonic()
+
+        for entry in list(self._idle):
+            if entry not in self._idle:
+                # Borrowed since the list was copied.
+                continue
+
+            sock, released, verified = entry
+
+            if now - verified < self.probe_interval:
+                continue
+
+            self._idle.remove(entry)
+
+            if now - released > self.max_idle_time and self._size > self.min_size:
+                await self._discard(sock)
+            elif await sock.is_connected():
+                entry[2] = time.monotonic()
+                self._idle.appendleft(entry)
+            else:
+                await self._discard(sock)
+
+    async def _probe(self):
+        try:
+            await self.prewarm()
+            await self._probe_idle()
+        except Exception as e:
+            self.logger.debug(e, include_traceback=True)
+        finally:
+            self._probe_task = None
+            self._schedule_probe(self.probe_interval)
+
+    def _run_probe(self):
+        self._probe_handle = None
+
+        if not self._closed:
+            self._probe_task = asyncio.ensure_future(self._probe())
+
+    def _schedule_probe(self, delay):
+        if self._closed:
+            return
+
+        self._probe_handle = asyncio.get_event_loop().call_later(delay, self._run_probe)
+
+    def start(self):
+        """
+        Start prewarming the pool and periodically probing idle sockets in the
+        background.
+        """
+        if self._closed or self._probe_handle is not None or self._probe_task:
+            return
+
+        self._schedule_probe(0)
+
+    async def close(self):
+        self._closed = True
+
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+        while self._idle:
+            sock, _, _ = self._idle.pop()
+            await self._discard(sock)
+
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        self._waiters.clear()
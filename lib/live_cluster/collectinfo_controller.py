@@ -1,17 +1,21 @@
 import asyncio
 import copy
+import gzip
 import json
 import logging
+import os
 import pprint
 import shutil
 import time
 import sys
 import traceback
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 from lib.view.sheet.render import get_style_json, set_style_json
 from lib.view.terminal import terminal
 from lib.utils import common, constants, util, version, logger
+from lib.utils.archiver import CollectinfoArchiver, create_collectinfo_archiver
+from lib.utils.json_writer import JSONObjectWriter
 from lib.base_controller import CommandHelp
 from lib.collectinfo_analyzer.collectinfo_root_controller import (
     CollectinfoRootController,
@@ -50,16 +54,56 @@ class CollectinfoController(LiveClusterCommandController):
         except Exception as e:
             raise e
 
-    async def _collectinfo_capture_and_write_to_file(
-        self, filename: str, func: Callable, param: list[str] = []
-    ):
+    async def _collectinfo_capture(self, func: Callable, param: list[str] = []):
+        """
+        Returns (param, output) of running func with param. Output and modifiers
+        are local to the current task, so captures can run concurrently in
+        separate tasks.
+        """
         if self.nodes and isinstance(self.nodes, list):
-            param += ["with"] + self.nodes
+            param = param + ["with"] + self.nodes
 
+        self.isolate_mods()
         o = await util.capture_stdout(func, param[:])
 
+        return param, o
+
+    async def _collectinfo_capture_and_write_to_file(
+        self, filename: str, func: Callable, param: list[str] = []
+    ):
+        param, o = await self._collectinfo_capture(func, param)
+
         self._write_func_output_to_file(filename, func, param, o)
 
+    async def _collectinfo_capture_all_and_write_to_file(
+        self, filename: str, commands: list[list[tuple[Callable, list[str]]]]
+    ):
+        """
+        Captures groups of (func, param) concurrently and writes their output to
+        filename in order. Like running each group in sequence, the first error
+        of a group is written instead of its remaining output.
+        """
+        results = await asyncio.gather(
+            *[
+                self._collectinfo_capture(func, param)
+                for group in commands
+                for func, param in group
+            ],
+            return_exceptions=True,
+        )
+        results = iter(results)
+
+        for group in commands:
+            group_results = [next(results) for _ in group]
+
+            for (func, _), result in zip(group, group_results):
+                if isinstance(result, Exception):
+                    util.write_to_file(filename, str(result))
+                    break
+
+                param, o = result
+                self._write_func_output_to_file(filename, func, param, o)
+
     def _write_func_output_to_file(
         self, filename: str, func: Callable, param: list[str], content: str
     ):
@@ -392,6 +436,11 @@ class CollectinfoController(LiveClusterCommandController):
             ),
         )
 
+        self.logger.debug(
+            "System statistics timings: %s",
+            await self.cluster.info_system_statistics_timings(nodes=self.nodes),
+        )
+
         cluster_names = asyncio.create_task(self.cluster.info("cluster-name"))
         pmap_map = None
 
@@ -445,6 +494,18 @@ class CollectinfoController(LiveClusterCommandController):
             self.logger.debug(pretty_json)
             raise
 
+    def _dump_json_snapshot(self, json_writer, snp_timestamp, snapshot):
+        """
+        Writes one snapshot of ascinfo.json. Each node's data is encoded on its
+        own, so only one node's JSON is held in memory at a time.
+        """
+        try:
+            json_writer.write(snp_timestamp, snapshot)
+        except Exception:
+            pretty_json = pprint.pformat(snapshot, indent=1)
+            self.logger.debug(pretty_json)
+            raise
+
     async def _dump_collectinfo_json(
         self,
         timestamp,
@@ -457,28 +518,72 @@ class CollectinfoController(LiveClusterCommandController):
         enable_ssh,
         snp_count,
         wait_time,
+        compact_json=False,
+        compress_json=False,
     ):
-        snpshots = {}
+        loop = asyncio.get_event_loop()
+        complete_filename = as_logfile_prefix + "ascinfo.json"
+        json_file = None
+        json_writer = None
+        dumping = None
+        start_time = loop.time()
 
-        for i in range(snp_count):
+        try:
+            for i in range(snp_count):
+                if i:
+                    # Snapshots start every wait_time seconds, however long
+                    # collecting the previous ones took.
+                    await asyncio.sleep(
+                        max(0, start_time + i * wait_time - loop.time())
+                    )
+                    self.cluster.new_snapshot_generation()
 
-            snp_timestamp = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
-            self.logger.info(
-                "Data collection for Snapshot: " + str(i + 1) + " in progress..."
-            )
+                snp_timestamp = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
+                self.logger.info(
+                    "Data collection for Snapshot: " + str(i + 1) + " in progress..."
+                )
 
-            snpshots[snp_timestamp] = await self._get_collectinfo_data_json(
-                default_user,
-                default_pwd,
-                default_ssh_port,
-                default_ssh_key,
-                credential_file,
-                enable_ssh,
-            )
+                snapshot = await self._get_collectinfo_data_json(
+                    default_user,
+                    default_pwd,
+                    default_ssh_port,
+                    default_ssh_key,
+                    credential_file,
+                    enable_ssh,
+                )
 
-            time.sleep(wait_time)
+                if dumping:
+                    await dumping
+                else:
+                    if compress_json:
+                        complete_filename += ".gz"
+                        json_file = gzip.open(complete_filename, "wt")
+                    else:
+                        json_file = open(complete_filename, "w")
+
+                    self.logger.info("Dumping collectinfo %s.", complete_filename)
+                    # Snapshots are {cluster: {node: ...}}, nodes are encoded
+                    # one at a time.
+                    json_writer = JSONObjectWriter(
+                        json_file, indent=None if compact_json else 2, depth=2
+                    )
 
-        self._dump_in_json_file(as_logfile_prefix + "ascinfo.json", snpshots)
+                # The snapshot is written while the next one is collected.
+                dumping = loop.run_in_executor(
+                    None,
+                    self._dump_json_snapshot,
+                    json_writer,
+                    snp_timestamp,
+                    snapshot,
+                )
+        finally:
+            try:
+                if dumping:
+                    await dumping
+            finally:
+                if json_file:
+                    json_writer.close()
+                    json_file.close()
 
     def _dump_collectinfo_file(self, filename: str, dump: str):
         self.logger.info("Dumping collectinfo %s.", filename)
@@ -616,50 +721,34 @@ class CollectinfoController(LiveClusterCommandController):
 
             util.write_to_file(complete_filename, file_header)
 
-            # All these calls to collectinfo_content must happen synchronously because they
-            # capture std output.
-            try:
-                await self._collectinfo_capture_and_write_to_file(
-                    complete_filename, self._write_version
-                )
-            except Exception as e:
-                util.write_to_file(complete_filename, str(e))
+            # Each command runs in its own task with its own controller, so that
+            # they can run concurrently.
+            await self._collectinfo_capture_all_and_write_to_file(
+                complete_filename,
+                [
+                    [(self._write_version, [])],
+                    [(InfoController(), p.split()) for p in dignostic_info_params],
+                    [(ShowController(), p.split()) for p in dignostic_show_params],
+                    [
+                        (FeaturesController(), p.split())
+                        for p in dignostic_features_params
+                    ],
+                ],
+            )
 
-            try:
-                info_controller = InfoController()
-                for info_param in dignostic_info_params:
-                    await self._collectinfo_capture_and_write_to_file(
-                        complete_filename, info_controller, info_param.split()
-                    )
-            except Exception as e:
-                util.write_to_file(complete_filename, str(e))
+            results = await asyncio.gather(
+                *[self.cluster.info(cmd) for cmd in dignostic_aerospike_info_commands],
+                return_exceptions=True,
+            )
 
-            try:
-                show_controller = ShowController()
-                for show_param in dignostic_show_params:
-                    await self._collectinfo_capture_and_write_to_file(
-                        complete_filename, show_controller, show_param.split()
-                    )
-            except Exception as e:
-                util.write_to_file(complete_filename, str(e))
+            for cmd, result in zip(dignostic_aerospike_info_commands, results):
+                if isinstance(result, Exception):
+                    util.write_to_file(complete_filename, str(result))
+                    break
 
-            try:
-                features_controller = FeaturesController()
-                for cmd in dignostic_features_params:
-                    await self._collectinfo_capture_and_write_to_file(
-                        complete_filename, features_controller, cmd.split()
-                    )
-            except Exception as e:
-                util.write_to_file(complete_filename, str(e))
-
-            try:
-                for cmd in dignostic_aerospike_info_commands:
-                    result = await self.cluster.info(cmd)
-                    self._write_func_output_to_file(
-                        complete_filename, self.cluster.info, [cmd], result
-                    )
-            except Exception as e:
-                util.write_to_file(complete_filename, str(e))
+                self._write_func_output_to_file(
+                    complete_filename, self.cluster.info, [cmd], result
+                )
         except Exception as e:
             util.write_to_file(complete_filename, str(e))
             self.logger.warning("Failed to generate {} file.", complete_filename)
@@ -686,24 +775,16 @@ class CollectinfoController(LiveClusterCommandController):
                 self.logger.critical("Collectinfo root controller is not initialized.")
                 return
 
-            try:
-                for summary_param in summary_params:
-                    await self._collectinfo_capture_and_write_to_file(
-                        complete_filename,
-                        self.collectinfo_root_controller.execute,
-                        summary_param.split(),
-                    )
-            except Exception as e:
-                util.write_to_file(complete_filename, str(e))
-
-            try:
-                info_controller = InfoController()
-                for info_param in summary_info_params:
-                    await self._collectinfo_capture_and_write_to_file(
-                        complete_filename, info_controller, info_param.split()
-                    )
-            except Exception as e:
-                util.write_to_file(complete_filename, str(e))
+            await self._collectinfo_capture_all_and_write_to_file(
+                complete_filename,
+                [
+                    [
+                        (self.collectinfo_root_controller.execute, p.split())
+                        for p in summary_params
+                    ],
+                    [(InfoController(), p.split()) for p in summary_info_params],
+                ],
+            )
 
         except Exception as e:
             util.write_to_file(complete_filename, str(e))
@@ -746,7 +827,7 @@ class CollectinfoController(LiveClusterCommandController):
             port = 3000
 
         try:
-            self.failed_cmds = common.collect_sys_info(
+            self.failed_cmds = await common.collect_sys_info(
                 port=port, timestamp=fileHeader, outfile=complete_filename
             )
         except Exception as e:
@@ -790,6 +871,10 @@ class CollectinfoController(LiveClusterCommandController):
         enable_ssh: bool = False,
         output_prefix: str = "",
         config_path: str = "",
+        compact_json: bool = False,
+        compress_json: bool = False,
+        archive_level: Optional[int] = None,
+        archive_zstd: bool = False,
     ):
 
         # JSON collectinfo snapshot count check
@@ -844,6 +929,8 @@ class CollectinfoController(LiveClusterCommandController):
                 enable_ssh,
                 snp_count,
                 wait_time,
+                compact_json=compact_json,
+                compress_json=compress_json,
             )
         except:
             if not self.ignore_errors:
@@ -856,36 +943,87 @@ class CollectinfoController(LiveClusterCommandController):
             asadm_version=self.asadm_version, clinfo_path=aslogdir
         )
 
+        try:
+            archiver = create_collectinfo_archiver(
+                aslogdir, level=archive_level, use_zstd=archive_zstd
+            )
+        except Exception as e:
+            self.logger.error(e)
+            return
+
+        # Each file is archived as soon as it is written, while the other dumps
+        # are still running.
         coroutines = [
-            self._dump_collectinfo_ascollectinfo(as_logfile_prefix, file_header),
-            self._dump_collectinfo_summary(as_logfile_prefix, file_header),
-            self._dump_collectinfo_health(as_logfile_prefix, file_header),
-            self._dump_collectinfo_sysinfo(as_logfile_prefix, file_header),
-            self._dump_collectinfo_aerospike_conf(as_logfile_prefix, config_path),
+            self._archive_files(
+                archiver,
+                as_logfile_prefix + "ascinfo.json",
+                as_logfile_prefix + "ascinfo.json.gz",
+            ),
+            self._dump_and_archive(
+                archiver,
+                self._dump_collectinfo_ascollectinfo(as_logfile_prefix, file_header),
+                as_logfile_prefix + "ascollectinfo.log",
+            ),
+            self._dump_and_archive(
+                archiver,
+                self._dump_collectinfo_summary(as_logfile_prefix, file_header),
+                as_logfile_prefix + "summary.log",
+            ),
+            self._dump_and_archive(
+                archiver,
+                self._dump_collectinfo_health(as_logfile_prefix, file_header),
+                as_logfile_prefix + "health.log",
+            ),
+            self._dump_and_archive(
+                archiver,
+                self._dump_collectinfo_sysinfo(as_logfile_prefix, file_header),
+                as_logfile_prefix + "sysinfo.log",
+            ),
+            self._dump_and_archive(
+                archiver,
+                self._dump_collectinfo_aerospike_conf(as_logfile_prefix, config_path),
+                as_logfile_prefix + "aerospike.conf",
+            ),
         ]
 
-        for c in coroutines:
-            try:
-                await c
-            except:
-                # close remaining coroutines.  An error will be raised if they are not
-                # awaited.
-                for c in coroutines:
-                    c.close()
+        # The dumps write separate files and run concurrently.
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
 
-                if not ignore_errors:
-                    self.logger.error(ignore_errors_msg)
-                    return
+        if not ignore_errors and any(isinstance(r, Exception) for r in results):
+            archiver.discard()
+            self.logger.error(ignore_errors_msg)
+            return
 
         self.logger.removeHandler(debug_output_handler)
 
-        # Archive collectinfo directory
-        common.archive_log(aslogdir)
+        # Archive the rest of the collectinfo directory
+        common.archive_log(aslogdir, archiver)
 
         # printing collectinfo summary
-        common.print_collectinfo_summary(aslogdir, failed_cmds=self.failed_cmds)
+        common.print_collectinfo_summary(
+            aslogdir, failed_cmds=self.failed_cmds, archive_path=archiver.path
+        )
         terminal.enable_color(True)
 
+    async def _archive_files(self, archiver: CollectinfoArchiver, *file_paths: str):
+        """
+        Adds the file_paths that exist to archiver without blocking the event
+        loop.
+        """
+        loop = asyncio.get_event_loop()
+
+        for file_path in file_paths:
+            if os.path.exists(file_path):
+                await loop.run_in_executor(None, archiver.add, file_path)
+
+    async def _dump_and_archive(
+        self, archiver: CollectinfoArchiver, dump: Awaitable, *file_paths: str
+    ):
+        try:
+            return await dump
+        finally:
+            await self._archive_files(archiver, *file_paths)
+
     @CommandHelp(
         "Collects cluster info, aerospike conf file for local node and system stats from all nodes if",
         "remote server credentials provided. If credentials are not available then it will collect system",
@@ -918,6 +1056,12 @@ class CollectinfoController(LiveClusterCommandController):
         "    --output-prefix <string>     - Output directory name prefix.",
         "    --asconfig-file <string>     - Aerospike config file path to collect.",
         "                                   Default: /etc/aerospike/aerospike.conf",
+        "    --compact-json               - Write ascinfo.json without indentation.",
+        "    --compress-json              - Write ascinfo.json gzip compressed, as ascinfo.json.gz.",
+        "    --archive-level <int>        - Compression level of the collectinfo archive.",
+        "                                   Default: 6, 3 with --archive-zstd",
+        "    --archive-zstd               - Compress the collectinfo archive with zstd, as .tar.zst.",
+        "                                   Requires the zstandard module.",
     )
     async def _do_default(self, line):
         snp_count = util.get_arg_and_delete_from_mods(
@@ -1045,6 +1189,39 @@ class CollectinfoController(LiveClusterCommandController):
             mods=self.mods,
         )
 
+        compact_json = util.check_arg_and_delete_from_mods(
+            line=line,
+            arg="--compact-json",
+            default=False,
+            modifiers=self.modifiers,
+            mods=self.mods,
+        )
+
+        compress_json = util.check_arg_and_delete_from_mods(
+            line=line,
+            arg="--compress-json",
+            default=False,
+            modifiers=self.modifiers,
+            mods=self.mods,
+        )
+
+        archive_level = util.get_arg_and_delete_from_mods(
+            line=line,
+            arg="--archive-level",
+            return_type=int,
+            default=None,
+            modifiers=self.modifiers,
+            mods=self.mods,
+        )
+
+        archive_zstd = util.check_arg_and_delete_from_mods(
+            line=line,
+            arg="--archive-zstd",
+            default=False,
+            modifiers=self.modifiers,
+            mods=self.mods,
+        )
+
         if line:
             self.logger.error("Unrecognized option(s): {}".format(", ".join(line)))
 
@@ -1063,4 +1240,8 @@ class CollectinfoController(LiveClusterCommandController):
             enable_ssh=enable_ssh,
             output_prefix=output_prefix,
             config_path=config_path,
+            compact_json=compact_json,
+            compress_json=compress_json,
+            archive_level=archive_level,
+            archive_zstd=archive_zstd,
         )
@@ -1,6 +1,5 @@
 import asyncio
 import copy
-import time
 
 from lib.health import util as health_util
 from lib.get_controller import (
@@ -19,9 +18,6 @@ from .live_cluster_command_controller import LiveClusterCommandController
     hide=True,
 )
 class HealthCheckController(LiveClusterCommandController):
-    last_snapshot_collection_time = 0
-    last_snapshot_count = 0
-
     def __init__(self):
         self.modifiers = set()
 
@@ -257,562 +253,558 @@ class HealthCheckController(LiveClusterCommandController):
                 output_filter_warning_level
             ).upper()
 
-        if (
-            time.time() - HealthCheckController.last_snapshot_collection_time > 60
-        ) or HealthCheckController.last_snapshot_count != snap_count:
-            # There is possibility of different cluster-names in old
-            # heartbeat protocol. As asadm works with single cluster,
-            # so we are setting one static cluster-name.
-            cluster_name = "C1"
-
-            stanza_dict = {
-                "statistics": (
-                    self._get_asstat_data,
-                    [
-                        (
-                            "service",
-                            "SERVICE",
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "namespace",
-                            "NAMESPACE",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("NAMESPACE", None),
-                            ],
-                        ),
-                        (
-                            "sets",
-                            "SET",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
+        # There is possibility of different cluster-names in old
+        # heartbeat protocol. As asadm works with single cluster,
+        # so we are setting one static cluster-name.
+        cluster_name = "C1"
+
+        stanza_dict = {
+            "statistics": (
+                self._get_asstat_data,
+                [
+                    (
+                        "service",
+                        "SERVICE",
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "namespace",
+                        "NAMESPACE",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("NAMESPACE", None),
+                        ],
+                    ),
+                    (
+                        "sets",
+                        "SET",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            (
+                                "NAMESPACE",
                                 (
-                                    "NAMESPACE",
-                                    (
-                                        "ns_name",
-                                        "ns",
-                                    ),
+                                    "ns_name",
+                                    "ns",
                                 ),
+                            ),
+                            (
+                                "SET",
                                 (
-                                    "SET",
-                                    (
-                                        "set_name",
-                                        "set",
-                                    ),
+                                    "set_name",
+                                    "set",
                                 ),
-                            ],
-                        ),
-                        (
-                            "bins",
-                            "BIN",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("NAMESPACE", None),
-                            ],
-                        ),
-                        (
-                            "xdr",
-                            "XDR",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("DC", None),
-                            ],
-                        ),
-                        (
-                            "dc",
-                            "DC",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("DC", None),
-                            ],
-                        ),
-                        (
-                            "sindex",
-                            "SINDEX",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("NAMESPACE", ("ns",)),
-                                ("SET", ("set",)),
-                                ("SINDEX", ("indexname",)),
-                            ],
-                        ),
-                    ],
-                ),
-                "config": (
-                    self._get_asconfig_data,
-                    [
-                        (
-                            "service",
-                            "SERVICE",
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "security",
-                            "SECURITY",
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        ("xdr", "XDR", [("CLUSTER", cluster_name), ("NODE", None)]),
-                        (
-                            "network",
-                            "NETWORK",
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "dc",
-                            "DC",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("DC", None),
-                            ],
-                        ),
-                        (
-                            "namespace",
-                            "NAMESPACE",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("NAMESPACE", None),
-                            ],
-                        ),
-                        (
-                            "roster",
-                            "ROSTER",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("NAMESPACE", None),
-                            ],
-                        ),
-                        (
-                            "racks",
-                            "RACKS",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("NAMESPACE", None),
-                                (None, None),
-                                ("RACKS", None),
-                            ],
-                        ),
-                    ],
-                ),
-                "original_config": (
-                    self.cluster.info_get_originalconfig,
-                    [
-                        (
-                            "service",
-                            "SERVICE",
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        ("xdr", "XDR", [("CLUSTER", cluster_name), ("NODE", None)]),
-                        (
-                            "network",
-                            "NETWORK",
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "dc",
-                            "DC",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("DC", None),
-                            ],
-                        ),
-                        (
-                            "namespace",
-                            "NAMESPACE",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("NAMESPACE", None),
-                            ],
-                        ),
-                    ],
-                ),
-                "cluster": (
-                    self._get_as_meta_data,
-                    [
-                        (
-                            "build",
-                            "METADATA",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("KEY", "version"),
-                            ],
-                        ),
-                        (
-                            "edition",
-                            "METADATA",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("KEY", "edition"),
-                            ],
-                        ),
-                        (
-                            "node_id",
-                            "METADATA",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("KEY", "node-id"),
-                            ],
-                        ),
-                    ],
-                ),
-                "endpoints": (
-                    self._get_asstat_data,
-                    [
-                        (
-                            "endpoints",
-                            "METADATA",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("KEY", "endpoints"),
-                            ],
-                        ),
-                    ],
-                ),
-                "services": (
-                    self._get_asstat_data,
-                    [
-                        (
-                            "services",
-                            "METADATA",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("KEY", "services"),
-                            ],
-                        ),
-                    ],
-                ),
-                "metadata": (
-                    self._get_asstat_data,
-                    [
-                        (
-                            "udf",
-                            "UDF",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("FILENAME", None),
-                            ],
-                        ),
-                    ],
-                ),
-                "health": (
-                    self._get_as_meta_data,
-                    [
-                        (
-                            "health",
-                            "METADATA",
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("OUTLIER", None),
-                            ],
-                        ),
-                    ],
-                ),
-            }
-            sys_cmd_dict = {
-                "sys_stats": (
-                    util.restructure_sys_data,
-                    [
-                        (
-                            "free-m",
-                            "SYSTEM",
-                            "FREE",
-                            True,
-                            [(None, None), ("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "top",
-                            "SYSTEM",
-                            "TOP",
-                            True,
-                            [(None, None), ("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "iostat",
-                            "SYSTEM",
-                            "IOSTAT",
-                            False,
-                            [
-                                (None, None),
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("DEVICE", None),
-                            ],
-                        ),
-                        (
-                            "meminfo",
-                            "SYSTEM",
-                            "MEMINFO",
-                            True,
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "dmesg",
-                            "SYSTEM",
-                            "DMESG",
-                            True,
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "lscpu",
-                            "SYSTEM",
-                            "LSCPU",
-                            True,
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("LSCPU", None),
-                            ],
-                        ),
-                        (
-                            "iptables",
-                            "SYSTEM",
-                            "IPTABLES",
-                            True,
-                            [("CLUSTER", cluster_name), ("NODE", None)],
-                        ),
-                        (
-                            "sysctlall",
-                            "SYSTEM",
-                            "SYSCTLALL",
-                            True,
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("SYSCTL", None),
-                            ],
-                        ),
-                        (
-                            "hdparm",
-                            "SYSTEM",
-                            "HDPARM",
-                            True,
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("HDPARM", None),
-                            ],
-                        ),
-                        (
-                            "limits",
-                            "SYSTEM",
-                            "LIMITS",
-                            True,
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("LIMITS", None),
-                            ],
-                        ),
-                        (
-                            "interrupts",
-                            "SYSTEM",
-                            "INTERRUPTS",
-                            False,
-                            [
-                                (None, None),
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("INTERRUPT_TYPE", None),
-                                (None, None),
-                                ("INTERRUPT_ID", None),
-                                (None, None),
-                                ("INTERRUPT_DEVICE", None),
-                            ],
-                        ),
-                        (
-                            "df",
-                            "SYSTEM",
-                            "DF",
-                            True,
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("FILE_SYSTEM", None),
-                            ],
-                        ),
-                        (
-                            "lsb",
-                            "SYSTEM",
-                            "LSB",
-                            True,
-                            [("CLUSTER", cluster_name), ("NODE", None), ("LSB", None)],
-                        ),
-                        (
-                            "environment",
-                            "SYSTEM",
-                            "ENVIRONMENT",
-                            True,
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                ("ENVIRONMENT", None),
-                            ],
-                        ),
-                        (
-                            "scheduler",
-                            "SYSTEM",
-                            "SCHEDULER",
-                            False,
-                            [
-                                ("CLUSTER", cluster_name),
-                                ("NODE", None),
-                                (None, None),
-                                ("DEVICE", None),
-                            ],
-                        ),
-                    ],
-                ),
-            }
-            health_input = {}
-
-            sn_ct = 0
-            sleep = sleep_tm * 1.0
-
-            self.logger.info(
-                "Collecting "
-                + str(snap_count)
-                + " collectinfo snapshot. Use -n to set number of snapshots."
-            )
-            while sn_ct < snap_count:
-                fetched_as_val = {}
-
-                for _key, (info_function, stanza_list) in stanza_dict.items():
-
-                    for stanza_item in stanza_list:
-
-                        stanza = stanza_item[0]
-                        fetched_as_val[(_key, stanza)] = asyncio.create_task(
-                            info_function(stanza)
-                        )
-
-                # Collecting data
-                sys_stats = asyncio.create_task(
-                    self.cluster.info_system_statistics(
-                        nodes=self.nodes,
-                        default_user=default_user,
-                        default_pwd=default_pwd,
-                        default_ssh_key=default_ssh_key,
-                        default_ssh_port=default_ssh_port,
-                        credential_file=credential_file,
-                        collect_remote_data=enable_ssh,
+                            ),
+                        ],
+                    ),
+                    (
+                        "bins",
+                        "BIN",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("NAMESPACE", None),
+                        ],
+                    ),
+                    (
+                        "xdr",
+                        "XDR",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("DC", None),
+                        ],
+                    ),
+                    (
+                        "dc",
+                        "DC",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("DC", None),
+                        ],
+                    ),
+                    (
+                        "sindex",
+                        "SINDEX",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("NAMESPACE", ("ns",)),
+                            ("SET", ("set",)),
+                            ("SINDEX", ("indexname",)),
+                        ],
+                    ),
+                ],
+            ),
+            "config": (
+                self._get_asconfig_data,
+                [
+                    (
+                        "service",
+                        "SERVICE",
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "security",
+                        "SECURITY",
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    ("xdr", "XDR", [("CLUSTER", cluster_name), ("NODE", None)]),
+                    (
+                        "network",
+                        "NETWORK",
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "dc",
+                        "DC",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("DC", None),
+                        ],
+                    ),
+                    (
+                        "namespace",
+                        "NAMESPACE",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("NAMESPACE", None),
+                        ],
+                    ),
+                    (
+                        "roster",
+                        "ROSTER",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("NAMESPACE", None),
+                        ],
+                    ),
+                    (
+                        "racks",
+                        "RACKS",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("NAMESPACE", None),
+                            (None, None),
+                            ("RACKS", None),
+                        ],
+                    ),
+                ],
+            ),
+            "original_config": (
+                self.cluster.info_get_originalconfig,
+                [
+                    (
+                        "service",
+                        "SERVICE",
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    ("xdr", "XDR", [("CLUSTER", cluster_name), ("NODE", None)]),
+                    (
+                        "network",
+                        "NETWORK",
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "dc",
+                        "DC",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("DC", None),
+                        ],
+                    ),
+                    (
+                        "namespace",
+                        "NAMESPACE",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("NAMESPACE", None),
+                        ],
+                    ),
+                ],
+            ),
+            "cluster": (
+                self._get_as_meta_data,
+                [
+                    (
+                        "build",
+                        "METADATA",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("KEY", "version"),
+                        ],
+                    ),
+                    (
+                        "edition",
+                        "METADATA",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("KEY", "edition"),
+                        ],
+                    ),
+                    (
+                        "node_id",
+                        "METADATA",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("KEY", "node-id"),
+                        ],
+                    ),
+                ],
+            ),
+            "endpoints": (
+                self._get_asstat_data,
+                [
+                    (
+                        "endpoints",
+                        "METADATA",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("KEY", "endpoints"),
+                        ],
+                    ),
+                ],
+            ),
+            "services": (
+                self._get_asstat_data,
+                [
+                    (
+                        "services",
+                        "METADATA",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("KEY", "services"),
+                        ],
+                    ),
+                ],
+            ),
+            "metadata": (
+                self._get_asstat_data,
+                [
+                    (
+                        "udf",
+                        "UDF",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("FILENAME", None),
+                        ],
+                    ),
+                ],
+            ),
+            "health": (
+                self._get_as_meta_data,
+                [
+                    (
+                        "health",
+                        "METADATA",
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("OUTLIER", None),
+                        ],
+                    ),
+                ],
+            ),
+        }
+        sys_cmd_dict = {
+            "sys_stats": (
+                util.restructure_sys_data,
+                [
+                    (
+                        "free-m",
+                        "SYSTEM",
+                        "FREE",
+                        True,
+                        [(None, None), ("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "top",
+                        "SYSTEM",
+                        "TOP",
+                        True,
+                        [(None, None), ("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "iostat",
+                        "SYSTEM",
+                        "IOSTAT",
+                        False,
+                        [
+                            (None, None),
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("DEVICE", None),
+                        ],
+                    ),
+                    (
+                        "meminfo",
+                        "SYSTEM",
+                        "MEMINFO",
+                        True,
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "dmesg",
+                        "SYSTEM",
+                        "DMESG",
+                        True,
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "lscpu",
+                        "SYSTEM",
+                        "LSCPU",
+                        True,
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("LSCPU", None),
+                        ],
+                    ),
+                    (
+                        "iptables",
+                        "SYSTEM",
+                        "IPTABLES",
+                        True,
+                        [("CLUSTER", cluster_name), ("NODE", None)],
+                    ),
+                    (
+                        "sysctlall",
+                        "SYSTEM",
+                        "SYSCTLALL",
+                        True,
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("SYSCTL", None),
+                        ],
+                    ),
+                    (
+                        "hdparm",
+                        "SYSTEM",
+                        "HDPARM",
+                        True,
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("HDPARM", None),
+                        ],
+                    ),
+                    (
+                        "limits",
+                        "SYSTEM",
+                        "LIMITS",
+                        True,
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("LIMITS", None),
+                        ],
+                    ),
+                    (
+                        "interrupts",
+                        "SYSTEM",
+                        "INTERRUPTS",
+                        False,
+                        [
+                            (None, None),
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("INTERRUPT_TYPE", None),
+                            (None, None),
+                            ("INTERRUPT_ID", None),
+                            (None, None),
+                            ("INTERRUPT_DEVICE", None),
+                        ],
+                    ),
+                    (
+                        "df",
+                        "SYSTEM",
+                        "DF",
+                        True,
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("FILE_SYSTEM", None),
+                        ],
+                    ),
+                    (
+                        "lsb",
+                        "SYSTEM",
+                        "LSB",
+                        True,
+                        [("CLUSTER", cluster_name), ("NODE", None), ("LSB", None)],
+                    ),
+                    (
+                        "environment",
+                        "SYSTEM",
+                        "ENVIRONMENT",
+                        True,
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            ("ENVIRONMENT", None),
+                        ],
+                    ),
+                    (
+                        "scheduler",
+                        "SYSTEM",
+                        "SCHEDULER",
+                        False,
+                        [
+                            ("CLUSTER", cluster_name),
+                            ("NODE", None),
+                            (None, None),
+                            ("DEVICE", None),
+                        ],
+                    ),
+                ],
+            ),
+        }
+        health_input = {}
+
+        sn_ct = 0
+        sleep = sleep_tm * 1.0
+
+        self.logger.info(
+            "Collecting "
+            + str(snap_count)
+            + " collectinfo snapshot. Use -n to set number of snapshots."
+        )
+        while sn_ct < snap_count:
+            if sn_ct:
+                # Every snapshot but the first must be fetched anew.
+                self.cluster.new_snapshot_generation()
+
+            fetched_as_val = {}
+
+            for _key, (info_function, stanza_list) in stanza_dict.items():
+
+                for stanza_item in stanza_list:
+
+                    stanza = stanza_item[0]
+                    fetched_as_val[(_key, stanza)] = asyncio.create_task(
+                        info_function(stanza)
                     )
+
+            # Collecting data
+            sys_stats = asyncio.create_task(
+                self.cluster.info_system_statistics(
+                    nodes=self.nodes,
+                    default_user=default_user,
+                    default_pwd=default_pwd,
+                    default_ssh_key=default_ssh_key,
+                    default_ssh_port=default_ssh_port,
+                    credential_file=credential_file,
+                    collect_remote_data=enable_ssh,
                 )
+            )
 
-                # Creating health input model
-                for _key, (info_function, stanza_list) in stanza_dict.items():
+            # Creating health input model
+            for _key, (info_function, stanza_list) in stanza_dict.items():
 
-                    for stanza_item in stanza_list:
+                for stanza_item in stanza_list:
 
-                        stanza = stanza_item[0]
-                        component_name = stanza_item[1]
+                    stanza = stanza_item[0]
+                    component_name = stanza_item[1]
 
-                        try:
-                            d = await fetched_as_val[(_key, stanza)]
-                        except Exception:
-                            continue
+                    try:
+                        d = await fetched_as_val[(_key, stanza)]
+                    except Exception:
+                        continue
 
-                        try:
-                            new_tuple_keys = copy.deepcopy(stanza_item[2])
-                        except Exception:
-                            new_tuple_keys = []
+                    try:
+                        new_tuple_keys = copy.deepcopy(stanza_item[2])
+                    except Exception:
+                        new_tuple_keys = []
 
-                        new_component_keys = [
-                            health_util.create_snapshot_key(sn_ct),
-                            component_name,
-                            _key.upper(),
-                        ]
+                    new_component_keys = [
+                        health_util.create_snapshot_key(sn_ct),
+                        component_name,
+                        _key.upper(),
+                    ]
 
-                        health_input = health_util.create_health_input_dict(
-                            d, health_input, new_tuple_keys, new_component_keys
-                        )
+                    health_input = health_util.create_health_input_dict(
+                        d, health_input, new_tuple_keys, new_component_keys
+                    )
 
-                sys_stats = util.flip_keys(await sys_stats)
+            sys_stats = util.flip_keys(await sys_stats)
 
-                for cmd_key, (sys_function, sys_cmd_list) in sys_cmd_dict.items():
+            for cmd_key, (sys_function, sys_cmd_list) in sys_cmd_dict.items():
 
-                    for cmd_item in sys_cmd_list:
+                for cmd_item in sys_cmd_list:
 
-                        cmd_section = cmd_item[0]
-                        component_name = cmd_item[1]
-                        sub_component_name = cmd_item[2]
-                        forced_all_new_keys = cmd_item[3]
+                    cmd_section = cmd_item[0]
+                    component_name = cmd_item[1]
+                    sub_component_name = cmd_item[2]
+                    forced_all_new_keys = cmd_item[3]
 
-                        try:
-                            d = sys_function(sys_stats[cmd_section], cmd_section)
-                        except Exception:
-                            continue
+                    try:
+                        d = sys_function(sys_stats[cmd_section], cmd_section)
+                    except Exception:
+                        continue
 
-                        if cmd_section == "free-m":
-                            d = util.mbytes_to_bytes(d)
+                    if cmd_section == "free-m":
+                        d = util.mbytes_to_bytes(d)
 
-                        try:
-                            new_tuple_keys = copy.deepcopy(cmd_item[4])
-                        except Exception:
-                            new_tuple_keys = []
+                    try:
+                        new_tuple_keys = copy.deepcopy(cmd_item[4])
+                    except Exception:
+                        new_tuple_keys = []
 
-                        new_component_keys = [
-                            health_util.create_snapshot_key(sn_ct),
-                            component_name,
-                            sub_component_name,
-                        ]
+                    new_component_keys = [
+                        health_util.create_snapshot_key(sn_ct),
+                        component_name,
+                        sub_component_name,
+                    ]
 
-                        health_input = health_util.create_health_input_dict(
-                            d,
-                            health_input,
-                            new_tuple_keys,
-                            new_component_keys,
-                            forced_all_new_keys,
-                        )
+                    health_input = health_util.create_health_input_dict(
+                        d,
+                        health_input,
+                        new_tuple_keys,
+                        new_component_keys,
+                        forced_all_new_keys,
+                    )
 
-                sn_ct += 1
-                self.logger.info("Snapshot " + str(sn_ct))
-                time.sleep(sleep)
+            sn_ct += 1
+            self.logger.info("Snapshot " + str(sn_ct))
 
-            health_input = health_util.h_eval(health_input)
-            self.health_checker.set_health_input_data(health_input)
-            HealthCheckController.last_snapshot_collection_time = time.time()
-            HealthCheckController.last_snapshot_count = snap_count
+            if sn_ct < snap_count:
+                await asyncio.sleep(sleep)
 
-        else:
-            self.logger.info(
-                "Using previous collected snapshot data since it is not older than 1 minute."
-            )
+        health_input = health_util.h_eval(health_input)
+        self.health_checker.set_health_input_data(health_input)
 
         health_summary = self.health_checker.execute(query_file=query_file)
 
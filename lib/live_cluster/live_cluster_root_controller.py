@@ -93,6 +93,11 @@ class LiveClusterRootController(BaseController, AsyncObject):
         except Exception:
             pass
 
+    def pre_line(self):
+        # The commands of a line share one snapshot of the cluster, the next
+        # line fetches it again.
+        self.cluster.new_snapshot_generation()
+
     def _do_default(self, line):
         self.execute_help(line)
 
@@ -126,7 +131,7 @@ class LiveClusterRootController(BaseController, AsyncObject):
     )
     @DisableAutoComplete()
     async def do_watch(self, line):
-        await self.view.watch(self, line)
+        await self.view.watch(self, line, refresh=self.cluster.new_snapshot_generation)
 
     @DisableAutoComplete()
     @CommandHelp(
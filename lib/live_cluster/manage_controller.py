@@ -77,6 +77,13 @@ class ManageController(LiveClusterCommandController):
             "acl": ManageACLController,
         }
 
+    async def execute(self, line):
+        try:
+            return await super().execute(line)
+        finally:
+            # Data fetched before the cluster was changed is stale.
+            self.cluster.new_snapshot_generation()
+
     def _do_default(self, line):
         self.execute_help(line)
 
@@ -357,6 +357,7 @@ class _GrepFile(LogAnalyzerCommandController):
         title_every_nth = 0
         ns = None
         show_relative_stats = False
+        cache = False
 
         while tline:
             word = tline.pop(0)
@@ -407,6 +408,8 @@ class _GrepFile(LogAnalyzerCommandController):
                     pass
             elif word == "--relative-stats":
                 show_relative_stats = True
+            elif word == "--cache":
+                cache = True
             else:
                 raise ShellException(
                     "Do not understand '%s' in '%s'" % (word, " ".join(line))
@@ -439,6 +442,7 @@ class _GrepFile(LogAnalyzerCommandController):
             output_page_size=output_page_size,
             ns=ns,
             show_relative_stats=show_relative_stats,
+            cache=cache,
         )
 
         page_index = 1
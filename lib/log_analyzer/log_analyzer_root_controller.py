@@ -50,6 +50,12 @@ class LogAnalyzerRootController(BaseController):
             "pager": PagerController,
         }
 
+    def close(self):
+        try:
+            self.log_handler.close()
+        except Exception:
+            pass
+
     @CommandHelp("Terminate session")
     def do_exit(self, line):
         # This function is a hack for autocomplete
@@ -182,6 +188,8 @@ class DiffController(LogAnalyzerCommandController):
     "                   default: 0, no repetition.",
     "    -N <string>  - Namespace name. It will display histogram latency for ns namespace.",
     "                   This feature is available for namespace level histograms in server >= 3.9.",
+    "    --cache      - Keep the histogram dumps read from the whole log so repeating the command,",
+    "                   e.g. with other -f, -d, -t, -b or -e, does not read the log again.",
 )
 class HistogramController(LogAnalyzerCommandController):
     def __init__(self):
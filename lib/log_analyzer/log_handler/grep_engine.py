@@ -0,0 +1,130 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Searches byte ranges of server logs for lines matching grep's search and ignore
+strings. The log is memory mapped and searched as bytes, and only matching lines
+are decoded. grep_range is a module level function so ranges can be searched in
+a process pool.
+"""
+
+import mmap
+import re
+
+# A log is split at hour boundaries from its timestamp index into ranges of at
+# least this many bytes, each of which is searched separately.
+GREP_MIN_RANGE_BYTES = 8 * 1024 * 1024
+
+
+def get_patterns(search_strs, ignore_strs, is_casesensitive):
+    """
+    Returns (search patterns, ignore patterns, flags) for grep_range. Like
+    ServerLog, case sensitive strings are matched as substrings and case
+    insensitive strings as regular expressions.
+    """
+
+    def to_pattern(s):
+        s = s.encode("utf-8")
+
+        if is_casesensitive:
+            return re.escape(s)
+
+        return s
+
+    # The anchor search starts at line offsets of the whole log, ^ and $ have to
+    # match at every line like they did when each line was searched.
+    flags = re.MULTILINE if is_casesensitive else re.MULTILINE | re.IGNORECASE
+
+    return (
+        [to_pattern(s) for s in search_strs],
+        [to_pattern(s) for s in ignore_strs or []],
+        flags,
+    )
+
+
+def split_range(offsets, start, end, min_range_bytes=None):
+    """
+    Splits [start, end) at the line offsets in offsets, e.g. the values of a
+    timestamp index, into ranges of at least min_range_bytes, the last excepted.
+    """
+    if min_range_bytes is None:
+        min_range_bytes = GREP_MIN_RANGE_BYTES
+
+    ranges = []
+    range_start = start
+
+    for offset in sorted(offsets):
+        if offset <= range_start or offset >= end:
+            continue
+
+        if offset - range_start >= min_range_bytes:
+            ranges.append((range_start, offset))
+            range_start = offset
+
+    if range_start < end:
+        ranges.append((range_start, end))
+
+    return ranges
+
+
+def grep_range(file_path, start, end, search_patterns, ignore_patterns, is_and, flags):
+    """
+    Returns the decoded lines, with their line endings, that start in [start, end)
+    of file_path and match any, or with is_and all, of search_patterns and none of
+    ignore_patterns. start should be the offset of a line.
+    """
+    search_res = [re.compile(p, flags) for p in search_patterns]
+    ignore_res = [re.compile(p, flags) for p in ignore_patterns]
+
+    if is_and:
+        anchor_re = search_res[0]
+    else:
+        anchor_re = re.compile(
+            b"|".join(b"(?:" + p + b")" for p in search_patterns), flags
+        )
+
+    lines = []
+
+    with open(file_path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        end = min(end, len(buf))
+        pos = start
+
+        while pos < end:
+            m = anchor_re.search(buf, pos, end)
+
+            if not m:
+                break
+
+            line_start = buf.rfind(b"\n", pos, m.start()) + 1 or pos
+            line_end = buf.find(b"\n", m.start())
+            line_end = len(buf) if line_end < 0 else line_end + 1
+            pos = line_end
+
+            # The anchor only locates candidate lines, a match may span lines.
+            line = buf[line_start:line_end]
+
+            if is_and:
+                matched = all(r.search(line) for r in search_res)
+            else:
+                matched = any(r.search(line) for r in search_res)
+
+            if matched and not any(r.search(line) for r in ignore_res):
+                lines.append(line.decode("utf-8", "replace"))
+    finally:
+        buf.close()
+
+    return lines
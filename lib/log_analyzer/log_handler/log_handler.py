@@ -16,6 +16,8 @@ import os
 import re
 import hashlib
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 from lib.utils import constants, log_util
 from lib.view import terminal
@@ -54,6 +56,8 @@ class LogHandler(object):
         self.logger = logging.getLogger("asadm")
 
         self.reader = LogReader()
+        self.grep_executor = None
+        self.grep_executor_failed = False
 
         log_added, err = self.add_log_files_at_path(log_path)
 
@@ -87,6 +91,45 @@ class LogHandler(object):
     def __str__(self):
         return ""
 
+    def close(self):
+        if self.grep_executor:
+            self.grep_executor.shutdown(wait=False)
+            self.grep_executor = None
+
+    def _get_grep_executor(self):
+        """
+        Logs are searched in a process pool shared by all grep commands. Returns
+        None, and logs are searched in this process, if the pool can not be
+        started.
+        """
+        if self.grep_executor is None and not self.grep_executor_failed:
+            executor = None
+
+            try:
+                # Workers are spawned on every platform, forking asadm is not
+                # safe once it has threads. The frozen binary supports spawn
+                # through multiprocessing.freeze_support().
+                executor = ProcessPoolExecutor(
+                    max_workers=min(
+                        constants.LOG_GREP_MAX_WORKERS, os.cpu_count() or 1
+                    ),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+
+                # Workers start on the first submit, make sure they can.
+                executor.submit(os.getpid).result(
+                    timeout=constants.LOG_GREP_START_TIMEOUT
+                )
+                self.grep_executor = executor
+            except Exception as e:
+                self.grep_executor_failed = True
+                self.logger.debug("Failed to start grep process pool: %s" % str(e))
+
+                if executor:
+                    executor.shutdown(wait=False)
+
+        return self.grep_executor
+
     def add_log_files_at_path(self, log_path=""):
 
         if not log_path:
@@ -230,6 +273,7 @@ class LogHandler(object):
 
         show_itrs = {}
         min_start_tm = min(s.get_start_tm(start_tm=start_tm_arg) for s in logs)
+        executor = None if system_grep else self._get_grep_executor()
 
         for log in logs:
             log.set_input(
@@ -241,6 +285,7 @@ class LogHandler(object):
                 duration=duration_arg,
                 system_grep=system_grep,
                 uniq=uniq,
+                executor=executor,
             )
 
             show_itrs[log.display_name] = log.show_iterator()
@@ -286,6 +331,7 @@ class LogHandler(object):
             try:
                 count_itrs = {}
                 min_start_tm = min(s.get_start_tm(start_tm=start_tm_arg) for s in logs)
+                executor = None if system_grep else self._get_grep_executor()
 
                 for log in logs:
                     log.set_input(
@@ -298,6 +344,7 @@ class LogHandler(object):
                         slice_duration=slice_duration,
                         uniq=uniq,
                         system_grep=system_grep,
+                        executor=executor,
                     )
 
                     count_itrs[log.display_name] = log.count_iterator()
@@ -346,6 +393,7 @@ class LogHandler(object):
 
             diff_itrs = {}
             min_start_tm = min(s.get_start_tm(start_tm=start_tm_arg) for s in logs)
+            executor = self._get_grep_executor()
 
             for log in logs:
                 log.set_input(
@@ -357,6 +405,7 @@ class LogHandler(object):
                     slice_duration=slice_duration,
                     upper_limit_check=upper_limit_check,
                     every_nth_slice=every_nth_slice,
+                    executor=executor,
                 )
 
                 diff_itrs[log.display_name] = log.diff_iterator()
@@ -389,10 +438,11 @@ class LogHandler(object):
         output_page_size=10,
         ns=None,
         show_relative_stats=False,
+        cache=False,
     ):
         """
         Function takes a serverlog logs, histogram, start time, duration, slice_duratiion, number of buckets, nth_bucket to show, rounding_time,
-        output page size, namespace name
+        output page size, namespace name, enable caching of histogram dumps read
 
         It collects latency iterators from all handlers and merge output from them and returns merged lines
 
@@ -417,6 +467,7 @@ class LogHandler(object):
                     rounding_time=rounding_time,
                     ns=ns,
                     show_relative_stats=show_relative_stats,
+                    cache_latency=cache,
                 )
 
                 latency_itrs[log.display_name] = log.latency_iterator()
@@ -19,6 +19,7 @@
 #
 
 import datetime
+import operator
 import re
 
 from lib.utils import constants
@@ -41,6 +42,13 @@ HIST_BUCKET_LINE_SUBSTRING = "hist.c:"
 SIZE_HIST_LIST = ["device-read-size", "device-write-size"]
 COUNT_HIST_LIST = ["query-rec-count"]
 
+HIST_BUCKET_PATTERN = re.compile(r"\((\d{2}): (\d+)\)")
+
+# Kinds of events histogram dumps are read as, see LogLatency._read_events.
+HIST_EVENT = 0
+STAT_EVENT = 1
+OTHER_EVENT = 2
+
 # Unit map
 UNITS_MAP = {"msec": "ms", "usec": "\u03bcs"}
 
@@ -59,6 +67,8 @@ relative_stat_info = {"batch-index": (["batch-sub:", "read"], [(0, "recs/sec")])
 class LogLatency(object):
     def __init__(self, reader):
         self.reader = reader
+        # (hist tags, relative stat path) -> events read from the whole log
+        self.events_cache = {}
 
     # ------------------------------------------------
     # Read a complete line from the log file.
@@ -163,6 +173,15 @@ class LogLatency(object):
         except Exception:
             return None
 
+    def _read_tm_and_line(self, file_itr):
+        try:
+            tm, line = next(file_itr)
+            if not line:
+                return None, None
+            return tm, line
+        except Exception:
+            return None, None
+
     # ------------------------------------------------
     # Parse a histogram total from a log line.
     #
@@ -175,9 +194,7 @@ class LogLatency(object):
     #
 
     def _read_bucket_values(self, line, file_itr):
-        values = {}
-        for b in range(self._all_buckets):
-            values[b] = 0
+        values = [0] * self._all_buckets
         total = self._parse_total_ops(line)
         line = self._read_line(file_itr)
         if not line:
@@ -187,12 +204,11 @@ class LogLatency(object):
         while True:
             found = 0
             if HIST_BUCKET_LINE_SUBSTRING in line:
-                for b in range(b_min, self._all_buckets):
-                    pattern = r".*?\(" + self._bucket_labels[b] + r": (.*?)\).*?"
-                    r = re.compile(pattern)
-                    if r.search(line):
+                for label, value in HIST_BUCKET_PATTERN.findall(line):
+                    b = int(label)
+                    if b_min <= b < self._all_buckets:
                         found = found + 1
-                        values[b] = int(r.search(line).group(1))
+                        values[b] = int(value)
                         b_total = b_total + values[b]
                 if found == 0:
                     break
@@ -210,48 +226,36 @@ class LogLatency(object):
         return total, values, line
 
     # ------------------------------------------------
-    # Subtract one set of bucket values from another.
+    # Subtract one set of bucket values from another. Returns new values, raised
+    # to old values where lower, and the difference.
     #
 
     def _subtract_buckets(self, new_values, old_values):
-        slice_values = {}
-        for b in range(self._all_buckets):
-            if new_values[b] < old_values[b]:
-                new_values[b] = old_values[b]
-            slice_values[b] = new_values[b] - old_values[b]
-        return slice_values
+        new_values = list(map(max, new_values, old_values))
+        return new_values, list(map(operator.sub, new_values, old_values))
 
     # ------------------------------------------------
     # Add one set of bucket values to another.
     #
 
     def _add_buckets(self, b1_values, b2_values):
-        slice_values = {}
-        for b in range(self._all_buckets):
-            slice_values[b] = b1_values[b] + b2_values[b]
-        return slice_values
+        return list(map(operator.add, b1_values, b2_values))
 
     # ------------------------------------------------
     # Get the percentage of operations within every bucket.
     #
 
     def _bucket_percentages(self, total, values):
-        percentages = [0.0] * self._all_buckets
         if total > 0:
-            for b in range(self._all_buckets):
-                percentages[b] = (float(values[b]) / total) * 100
-        return percentages
+            return [(float(v) / total) * 100 for v in values]
+        return [0.0] * self._all_buckets
 
     # ------------------------------------------------
     # Get the percentage of operations in all buckets > bucket.
     #
 
     def _percentage_over(self, bucket, percentages):
-        percentage = 0.0
-        for b in range(self._all_buckets):
-            if b > bucket:
-                percentage = percentage + percentages[b]
-        return percentage
+        return sum(percentages[bucket + 1 :], 0.0)
 
     def ceil_time(self, dt):
         seconds = 10 - (dt.second % 10)
@@ -371,24 +375,69 @@ class LogLatency(object):
 
         return values
 
+    # ------------------------------------------------
+    # Read histogram dumps and relative stat values from log lines.
+    #
+
+    def _read_events(self, file_itr, hist_re, relative_stat_path=[]):
+        """
+        Yields (kind, timestamp, total, values, unit) for every histogram dump
+        and relative stat line in file_itr. Of the other lines only the first
+        after each event is yielded, they are only needed for their timestamp.
+        A dump at the end of the log, as incomplete, ends the events.
+        """
+        tm, line = self._read_tm_and_line(file_itr)
+        other_read = False
+
+        while line:
+            if relative_stat_path and util.contains_substrings_in_order(
+                line, relative_stat_path
+            ):
+                yield (
+                    STAT_EVENT,
+                    tm,
+                    None,
+                    self._read_stat(line, relative_stat_path),
+                    None,
+                )
+                other_read = False
+
+            elif hist_re.search(line):
+                unit = "usec" if "usec" in line else "msec"
+                total, values, line = self._read_bucket_values(line, file_itr)
+
+                if not line:
+                    return
+
+                yield HIST_EVENT, tm, total, values, unit
+                other_read = False
+                # line is the first line after the buckets
+                tm = self.reader.parse_dt(line)
+                continue
+
+            elif not other_read:
+                yield OTHER_EVENT, tm, None, None, None
+                other_read = True
+
+            tm, line = self._read_tm_and_line(file_itr)
+
     # ------------------------------------------------
     # Get a histogram at or just after the specified datetime.
     #
 
     def _read_hist(
         self,
-        hist_tags,
+        events,
         after_dt,
-        file_itr,
-        line=0,
+        event=None,
         end_dt=None,
         before_dt=None,
         read_all_dumps=False,
-        relative_stat_path=[],
+        relative_stats=False,
     ):
-        if not line:
-            # read next line
-            line = self._read_line(file_itr)
+        if not event:
+            # read next event
+            event = next(events, None)
 
         total = 0
         values = 0
@@ -397,58 +446,47 @@ class LogLatency(object):
         unit = "msec"
 
         while True:
-            if not line:
-                return total, values, 0, 0, stat_values, unit
+            if not event:
+                return total, values, 0, None, stat_values, unit
 
-            dt = self.reader.parse_dt(line)
+            kind, dt, event_total, event_values, event_unit = event
 
             if dt < after_dt:
-                # ignore lines with timestamp before before_dt
-                line = self._read_line(file_itr)
+                # ignore events with timestamp before after_dt
+                event = next(events, None)
                 continue
 
             if end_dt and dt > end_dt:
-                # found line with timestamp after end_dt
-                return total, values, dt, line, stat_values, unit
+                # found event with timestamp after end_dt
+                return total, values, dt, event, stat_values, unit
 
             if before_dt and dt > before_dt:
-                # found line with timestamp after before_dt
-                return total, values, dt, line, stat_values, unit
+                # found event with timestamp after before_dt
+                return total, values, dt, event, stat_values, unit
 
-            if relative_stat_path and util.contains_substrings_in_order(
-                line, relative_stat_path
-            ):
-                temp_sval = self._read_stat(line, relative_stat_path)
-                stat_values = self._add_stat_values(stat_values, temp_sval)
+            if kind == STAT_EVENT:
+                stat_values = self._add_stat_values(stat_values, event_values)
 
-            elif any(re.search(ht, line) for ht in hist_tags):
+            elif kind == HIST_EVENT:
                 break
 
-            line = self._read_line(file_itr)
-
-        if "usec" in line:
-            unit = "usec"
-        elif "msec" in line:
-            unit = "msec"
+            event = next(events, None)
 
-        total, values, line = self._read_bucket_values(line, file_itr)
+        total, values, unit = event_total, event_values, event_unit
+        event = next(events, None)
 
-        if not line:
-            return 0, 0, 0, 0, stat_values, unit
-
-        if read_all_dumps or relative_stat_path:
+        if read_all_dumps or relative_stats:
             if not before_dt:
                 before_dt = dt + datetime.timedelta(seconds=NS_SLICE_SECONDS)
 
-            r_total, r_values, r_dt, line, r_stat_values, _ = self._read_hist(
-                hist_tags,
+            r_total, r_values, r_dt, event, r_stat_values, _ = self._read_hist(
+                events,
                 after_dt,
-                file_itr,
-                line,
+                event,
                 end_dt,
                 before_dt,
                 read_all_dumps=read_all_dumps,
-                relative_stat_path=relative_stat_path,
+                relative_stats=relative_stats,
             )
 
             total += r_total
@@ -458,7 +496,7 @@ class LogLatency(object):
             if r_stat_values:
                 stat_values = self._add_stat_values(stat_values, r_stat_values)
 
-        return total, values, dt, line, stat_values, unit
+        return total, values, dt, event, stat_values, unit
 
     # ------------------------------------------------
     # Get a timedelta in seconds.
@@ -489,7 +527,14 @@ class LogLatency(object):
         arg_rounding_time=True,
         arg_ns=None,
         arg_relative_stats=False,
+        arg_cache=False,
     ):
+        """
+        Yields the latency of every slice of histogram arg_hist in arg_log_itr.
+        With arg_cache the dumps read from arg_log_itr, which should then iterate
+        over the whole log, are kept and reused by later calls for the same
+        histogram.
+        """
 
         latency = {}
         tps_key = ("ops/sec", None)
@@ -557,17 +602,32 @@ class LogLatency(object):
                 for idx_name in relative_stat_index:
                     latency[(idx_name[1], None)] = {}
 
+            hist_re = re.compile("|".join("(?:%s)" % (ht) for ht in hist_tags))
+
+            if arg_cache:
+                cache_key = (tuple(hist_tags), tuple(relative_stat_path))
+
+                if cache_key not in self.events_cache:
+                    self.events_cache[cache_key] = list(
+                        self._read_events(file_itr, hist_re, relative_stat_path)
+                    )
+
+                events = iter(self.events_cache[cache_key])
+            else:
+                events = self._read_events(file_itr, hist_re, relative_stat_path)
+
+            relative_stats = bool(relative_stat_path)
+
             # Find first histogram:
-            old_total, old_values, old_dt, line, old_stat_values, _ = self._read_hist(
-                hist_tags,
+            old_total, old_values, old_dt, event, old_stat_values, _ = self._read_hist(
+                events,
                 init_dt,
-                file_itr,
                 end_dt=arg_end_date,
                 read_all_dumps=read_all_dumps,
-                relative_stat_path=relative_stat_path,
+                relative_stats=relative_stats,
             )
 
-            if line:
+            if event:
                 end_dt = arg_end_date
                 labels = []
 
@@ -591,17 +651,16 @@ class LogLatency(object):
                         new_total,
                         new_values,
                         new_dt,
-                        line,
+                        event,
                         new_stat_values,
                         new_unit,
                     ) = self._read_hist(
-                        hist_tags,
+                        events,
                         after_dt,
-                        file_itr,
-                        line,
+                        event,
                         end_dt=arg_end_date,
                         read_all_dumps=read_all_dumps,
-                        relative_stat_path=relative_stat_path,
+                        relative_stats=relative_stats,
                     )
 
                     self._bucket_unit = UNITS_MAP[new_unit]
@@ -613,7 +672,9 @@ class LogLatency(object):
 
                     # Get the "deltas" for this slice:
                     slice_total = new_total - old_total
-                    slice_values = self._subtract_buckets(new_values, old_values)
+                    new_values, slice_values = self._subtract_buckets(
+                        new_values, old_values
+                    )
                     slice_seconds_actual = self._elapsed_seconds(new_dt - old_dt)
 
                     slice_stat_values = []
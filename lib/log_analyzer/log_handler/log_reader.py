@@ -13,9 +13,13 @@
 # limitations under the License.
 
 import datetime
+import hashlib
+import json
+import logging
+import os
 import re
 import time
-import logging
+from collections import OrderedDict
 
 from lib.utils import util, constants
 
@@ -35,6 +39,14 @@ SS = 2
 
 INDEX_DT_LEN = 4
 STEP = 1000
+SEEK_BLOCK_BYTES = 8192
+
+# Server log indices are persisted here, keyed by the log's path, and reused while
+# the log's inode is unchanged. A log that has grown since is indexed from its last
+# indexed hour onward.
+INDEX_CACHE_DIR = constants.ADMIN_HOME + "log_index/"
+INDEX_CACHE_VERSION = 1
+INDEX_CACHE_HEAD_BYTES = 1024
 
 SERVER_ID_FETCH_READ_SIZE = 10000
 FILE_READ_ENDS = ["tail", "head"]
@@ -201,17 +213,42 @@ class LogReader(object):
         return datetime.datetime(*(time.strptime(prefix, constants.DT_FMT)[0:dt_len]))
 
     def _seek_to(self, file_stream, char):
-        if file_stream and char:
-            if file_stream.tell() <= 0:
-                file_stream.seek(0, 0)
-            else:
-                tmp = file_stream.read(1)
-                while tmp != char:
-                    if file_stream.tell() <= 1:
-                        file_stream.seek(0, 0)
-                        break
-                    file_stream.seek(-2, 1)
-                    tmp = file_stream.read(1)
+        """
+        Moves file_stream just past the nearest char at or before its current
+        position, or to the start of the file if there is none. Searches backward
+        a block at a time.
+        """
+        if not file_stream or not char:
+            return
+
+        end = file_stream.tell()
+
+        if end <= 0:
+            file_stream.seek(0, 0)
+            return
+
+        tmp = file_stream.read(1)
+
+        if tmp == char:
+            return
+
+        if not tmp:
+            # At or past EOF, the last byte is expected to be char and is skipped.
+            end -= 1
+
+        while end > 0:
+            start = max(0, end - SEEK_BLOCK_BYTES)
+            file_stream.seek(start, 0)
+            block = file_stream.read(end - start)
+            idx = block.rfind(char)
+
+            if idx >= 0:
+                file_stream.seek(start + idx + 1, 0)
+                return
+
+            end = start
+
+        file_stream.seek(0, 0)
 
     def set_next_line(self, file_stream, jump=STEP, whence=1):
         file_stream.seek(int(jump), whence)
@@ -257,17 +294,11 @@ class LogReader(object):
         else:
             return self._get_next_timestamp(f, min, last_read, last)
 
-    def generate_server_log_indices(self, file_path):
-        indices = {}
-        f = open(file_path, "rb")  # binary mode to enable relative seeks in Python3
-        start_timestamp = self.parse_dt(self.read_line(f), dt_len=INDEX_DT_LEN)
-        indices[start_timestamp.strftime(constants.DT_FMT)] = 0
-        min_seek_pos = 0
+    def _extend_server_log_indices(self, f, indices, last_timestamp, min_seek_pos):
         f.seek(0, 2)
         self.set_next_line(f, 0)
         last_pos = f.tell()
-        f.seek(0, 0)
-        last_timestamp = start_timestamp
+        f.seek(min_seek_pos, 0)
 
         while True:
             if last_pos < (min_seek_pos + STEP):
@@ -300,6 +331,100 @@ class LogReader(object):
 
         return indices
 
+    def _get_index_cache_path(self, file_path):
+        key = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()
+        return os.path.join(INDEX_CACHE_DIR, key + ".json")
+
+    def _load_server_log_indices(self, file_path):
+        try:
+            with open(self._get_index_cache_path(file_path)) as f:
+                cached = json.load(f)
+
+            if cached["version"] != INDEX_CACHE_VERSION or cached[
+                "path"
+            ] != os.path.abspath(file_path):
+                return None
+
+            return cached
+        except Exception:
+            return None
+
+    def _store_server_log_indices(self, file_path, stat, head, indices):
+        cache_path = self._get_index_cache_path(file_path)
+        tmp_path = "%s.%s.tmp" % (cache_path, os.getpid())
+
+        try:
+            os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {
+                        "version": INDEX_CACHE_VERSION,
+                        "path": os.path.abspath(file_path),
+                        "inode": stat.st_ino,
+                        "size": stat.st_size,
+                        "mtime": stat.st_mtime,
+                        "head": head,
+                        "indices": list(indices.items()),
+                    },
+                    f,
+                )
+
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            self.logger.debug(
+                "Failed to store log index for %s: %s" % (file_path, str(e))
+            )
+
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def generate_server_log_indices(self, file_path):
+        """
+        Returns {hour: offset of the first line logged in that hour}. Indices are
+        cached on disk and only the part of the log written since it was last
+        indexed is searched.
+        """
+        stat = os.stat(file_path)
+        cached = self._load_server_log_indices(file_path)
+        f = open(file_path, "rb")  # binary mode to enable relative seeks in Python3
+
+        try:
+            head = hashlib.sha1(f.read(INDEX_CACHE_HEAD_BYTES)).hexdigest()
+            f.seek(0, 0)
+
+            if (
+                cached
+                and cached["inode"] == stat.st_ino
+                and cached["head"] == head
+                and cached["size"] <= stat.st_size
+                and cached["indices"]
+            ):
+                indices = OrderedDict(cached["indices"])
+
+                if cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime:
+                    return indices
+
+                # The log has grown, keep searching from the last indexed hour.
+                last_key = next(reversed(indices))
+                last_timestamp = datetime.datetime.strptime(last_key, constants.DT_FMT)
+                min_seek_pos = indices[last_key]
+            else:
+                indices = OrderedDict()
+                start_timestamp = self.parse_dt(self.read_line(f), dt_len=INDEX_DT_LEN)
+                indices[start_timestamp.strftime(constants.DT_FMT)] = 0
+                last_timestamp = start_timestamp
+                min_seek_pos = 0
+
+            self._extend_server_log_indices(f, indices, last_timestamp, min_seek_pos)
+        finally:
+            f.close()
+
+        self._store_server_log_indices(file_path, stat, head, indices)
+        return indices
+
     def read_line(self, f):
         if not f:
             return None
@@ -14,16 +14,18 @@
 
 import datetime
 import hashlib
+import os
 import pipes
 import re
 import subprocess
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures.process import BrokenProcessPool
 
 from lib import utils
 from lib.utils import constants
 
 from .log_latency import LogLatency
-from . import util
+from . import grep_engine, util
 
 READ_BLOCK_BYTES = 4096
 RETURN_REQUIRED_EVERY_NTH_BLOCK = 5
@@ -57,9 +59,12 @@ class ServerLog:
         self.server_log_line_writer_info_re = re.compile(
             SERVER_LOG_LINE_WRITER_INFO_PATTERN
         )
+        self.grep_futures = []
+        self.grep_results = None
 
     def destroy(self):
         try:
+            self._cancel_grep()
             if self.file_stream:
                 self.file_stream.close()
             del self.display_name
@@ -85,6 +90,8 @@ class ServerLog:
             del self.count_itr
             del self.slice_show_count
             del self.uniq_lines_track
+            del self.grep_futures
+            del self.grep_results
         except Exception:
             pass
 
@@ -188,6 +195,8 @@ class ServerLog:
         uniq=False,
         ns=None,
         show_relative_stats=False,
+        executor=None,
+        cache_latency=False,
     ):
         if isinstance(search_strs, str):
             search_strs = [search_strs]
@@ -207,13 +216,17 @@ class ServerLog:
         self.read_block_count = 0
         self.system_grep = system_grep
         self.set_file_stream(system_grep=system_grep)
+        self._cancel_grep()
+        self.grep_results = None
+        if not system_grep and not read_all_lines and self.search_strings:
+            self.grep_results = self._grep(executor)
         self.diff_itr = self.diff()
         self.show_itr = self.show()
         latency_start_tm = self.process_start_tm
         if latency_start_tm < self.server_start_tm:
             latency_start_tm = self.server_start_tm
         self.latency_itr = self.log_latency.compute_latency(
-            self.show_itr,
+            self._read_all_lines() if cache_latency else self.show_itr,
             self.search_strings[0],
             self.slice_duration,
             latency_start_tm,
@@ -223,6 +236,7 @@ class ServerLog:
             arg_rounding_time=rounding_time,
             arg_ns=ns,
             arg_relative_stats=show_relative_stats,
+            arg_cache=cache_latency,
         )
         self.count_itr = self.count()
         self.slice_show_count = every_nth_slice
@@ -231,7 +245,120 @@ class ServerLog:
         self.read_prev_line = False
         self.prev_line = None
 
+    def _get_end_offset(self):
+        end_hr_tm = self.neglect_minutes_seconds_time(self.process_end_tm)
+
+        for hr, offset in self.indices.items():
+            if datetime.datetime.strptime(hr, constants.DT_FMT) > end_hr_tm:
+                return offset
+
+        return os.fstat(self.file_stream.fileno()).st_size
+
+    def _grep(self, executor=None):
+        """
+        Searches the part of the log from the current position to the end of the
+        last hour being processed with grep_engine, split into ranges at hour
+        boundaries. Returns an iterator over the matching lines of each range in
+        order. Ranges are searched ahead in executor if given, else as they are
+        read.
+        """
+        ranges = grep_engine.split_range(
+            self.indices.values(), self.file_stream.tell(), self._get_end_offset()
+        )
+        search_patterns, ignore_patterns, flags = grep_engine.get_patterns(
+            self.search_strings, self.ignore_strs, self.is_casesensitive
+        )
+        range_args = [
+            (
+                self.file_name,
+                start,
+                end,
+                search_patterns,
+                ignore_patterns,
+                self.is_and,
+                flags,
+            )
+            for start, end in ranges
+        ]
+
+        if executor is None:
+            return (grep_engine.grep_range(*args) for args in range_args)
+
+        return self._get_grep_results(executor, range_args)
+
+    def _get_grep_results(self, executor, range_args):
+        """
+        Yields the results of the ranges searched in executor. At most
+        LOG_GREP_MAX_WORKERS ranges are searched ahead of the reader, the next
+        one is submitted as a result is read, so matches of the whole log are
+        not held in memory. A range is searched in this process if the pool is
+        broken, e.g. a worker died.
+        """
+        pending = deque(range_args)
+        self.grep_futures = deque()
+
+        while pending or self.grep_futures:
+            while (
+                executor is not None
+                and pending
+                and len(self.grep_futures) < constants.LOG_GREP_MAX_WORKERS
+            ):
+                args = pending.popleft()
+
+                try:
+                    future = executor.submit(grep_engine.grep_range, *args)
+                except Exception:
+                    # The pool is broken or shut down.
+                    pending.appendleft(args)
+                    executor = None
+                    break
+
+                self.grep_futures.append((future, args))
+
+            if not self.grep_futures:
+                yield grep_engine.grep_range(*pending.popleft())
+                continue
+
+            future, args = self.grep_futures.popleft()
+
+            try:
+                yield future.result()
+            except BrokenProcessPool:
+                yield grep_engine.grep_range(*args)
+
+    def _cancel_grep(self):
+        """
+        Stops searching ranges which were not read yet.
+        """
+        if self.grep_results is not None:
+            self.grep_results.close()
+
+        for f, _ in self.grep_futures:
+            f.cancel()
+
+        self.grep_futures = []
+
+    def _read_grep_block(self):
+        try:
+            self.read_block = []
+            while not self.read_block:
+                self.read_block = next(self.grep_results)
+        except StopIteration:
+            pass
+        except Exception as e:
+            self.reader.logger.warning(
+                "Failed to search %s: %s" % (self.file_name, str(e))
+            )
+            self.read_block = []
+
+        self.read_block_index = 0
+        self.read_block_size = len(self.read_block)
+
     def read_line_block(self):
+        if self.grep_results is not None:
+            self._read_grep_block()
+            return
+
         try:
             while True:
                 self.read_block = []
@@ -346,7 +473,7 @@ class ServerLog:
                 continue
             if self.read_all_lines:
                 return line
-            if not self.system_grep:
+            if not self.system_grep and self.grep_results is None:
                 if self.search_strings:
                     if self.is_and:
                         if self.is_casesensitive:
@@ -405,6 +532,18 @@ class ServerLog:
 
         return line
 
+    def _read_all_lines(self):
+        with open(self.file_name, "rb") as f:
+            for line in f:
+                line = utils.util.bytes_to_str(line)
+
+                try:
+                    tm = self.reader.parse_dt(line)
+                except Exception:
+                    continue
+
+                yield tm, line
+
     def show(self):
         while True:
             tm = None
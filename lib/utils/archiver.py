@@ -0,0 +1,226 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import os
+import tarfile
+import threading
+from typing import BinaryIO
+
+from lib.utils import constants
+
+try:
+    import zstandard
+
+    HAVE_ZSTD = True
+except ImportError:
+    HAVE_ZSTD = False
+
+GZIP_EXTENSION = ".tgz"
+ZSTD_EXTENSION = ".tar.zst"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Bytes of the tar stream compressed as one gzip member.
+BLOCK_SIZE = 1024 * 1024
+
+
+class ParallelGzipWriter:
+    """
+    File object that gzip compresses what is written to it into fp. The data is
+    split into blocks that a thread pool compresses concurrently, zlib releases
+    the GIL while compressing, and each block is written to fp in order as a
+    gzip member. Concatenated members are a valid gzip file.
+    """
+
+    def __init__(self, fp: BinaryIO, level, workers, block_size=BLOCK_SIZE):
+        self._fp = fp
+        self._level = level
+        self._block_size = block_size
+        self._max_pending = workers * 2
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="asadm-archive"
+        )
+
+    def _submit(self, block):
+        if len(self._pending) >= self._max_pending:
+            self._fp.write(self._pending.popleft().result())
+
+        self._pending.append(self._executor.submit(gzip.compress, block, self._level))
+
+    def write(self, data):
+        self._buffer += data
+
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[: self._block_size]))
+            del self._buffer[: self._block_size]
+
+        return len(data)
+
+    def close(self):
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+
+        while self._pending:
+            self._fp.write(self._pending.popleft().result())
+
+        self._executor.shutdown()
+
+
+class CollectinfoArchiver:
+    """
+    Writes files into a compressed tar archive as soon as each one is complete,
+    so the archive is finished when the last file is. Files may be added from
+    several threads.
+
+    Members are named the way tar names them, the file path without the
+    leading '/'.
+    """
+
+    def __init__(
+        self,
+        path,
+        level=constants.COLLECTINFO_ARCHIVE_LEVEL,
+        workers=constants.COLLECTINFO_ARCHIVE_WORKERS,
+        use_zstd=False,
+    ):
+        if use_zstd and not HAVE_ZSTD:
+            raise Exception("zstd compression requires the zstandard module.")
+
+        self.path = path
+        self.added = set()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._fp = open(path, "wb")
+
+        if use_zstd:
+            self._writer = zstandard.ZstdCompressor(
+                level=level, threads=workers
+            ).stream_writer(self._fp, closefd=False)
+        else:
+            self._writer = ParallelGzipWriter(self._fp, level, workers)
+
+        self._tar = tarfile.open(fileobj=self._writer, mode="w|")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def add(self, file_path):
+        """
+        Adds the file at file_path unless it was already added.
+        """
+        with self._lock:
+            if self._closed or file_path in self.added:
+                return
+
+            self._tar.add(file_path, arcname=file_path.lstrip(os.sep), recursive=False)
+            self.added.add(file_path)
+
+    def add_dir(self, dir_path):
+        """
+        Adds the files under dir_path that were not added yet.
+        """
+        for root, dirs, files in os.walk(dir_path):
+            dirs.sort()
+
+            for file in sorted(files):
+                self.add(os.path.join(root, file))
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+
+            try:
+                self._tar.close()
+                self._writer.close()
+            finally:
+                self._fp.close()
+
+    def discard(self):
+        """
+        Closes the archive and removes it.
+        """
+        try:
+            self.close()
+        finally:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def create_collectinfo_archiver(logdir, level=None, use_zstd=False):
+    """
+    Returns a CollectinfoArchiver for the archive of logdir, logdir.tgz or
+    logdir.tar.zst.
+    """
+    if level is None:
+        level = (
+            constants.COLLECTINFO_ZSTD_LEVEL
+            if use_zstd
+            else constants.COLLECTINFO_ARCHIVE_LEVEL
+        )
+
+    extension = ZSTD_EXTENSION if use_zstd else GZIP_EXTENSION
+
+    return CollectinfoArchiver(logdir + extension, level=level, use_zstd=use_zstd)
+
+
+def is_zstd_file(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC
+    except Exception:
+        return False
+
+
+def open_zstd_tarfile(path):
+    """
+    Returns a stream mode tarfile reading the zstd compressed tar at path.
+    Closing the tarfile closes the file.
+    """
+    if not HAVE_ZSTD:
+        raise Exception("zstd decompression requires the zstandard module.")
+
+    fp = open(path, "rb")
+
+    try:
+        reader = zstandard.ZstdDecompressor().stream_reader(fp, closefd=True)
+        tar = tarfile.open(fileobj=reader, mode="r|")
+    except Exception:
+        fp.close()
+        raise
+
+    # A tarfile does not close a fileobj it did not open.
+    tar_close = tar.close
+
+    def close():
+        try:
+            tar_close()
+        finally:
+            reader.close()
+
+    tar.close = close
+    return tar
@@ -31,11 +31,11 @@ import urllib.request
 import urllib.error
 import urllib.parse
 import aiohttp
-import zipfile
 from collections import OrderedDict
 from dateutil import parser as date_parser
 
 from lib.utils import constants, file_size, util, version, data
+from lib.utils.archiver import create_collectinfo_archiver
 from lib.view import terminal
 
 logger = logging.getLogger("asadm")
@@ -280,6 +280,10 @@ def _deep_merge_dicts(dict_to, dict_from):
         # already, so no need to add
         return dict_to
 
+    if isinstance(dict_to, util.FrozenDict):
+        # Shared read-only data, merge into a copy
+        dict_to = dict(dict_to)
+
     for _key in dict_from.keys():
         if _key not in dict_to:
             dict_to[_key] = dict_from[_key]
@@ -2320,27 +2324,6 @@ def _collectinfo_content(func, cmd=None, alt_cmds=[]):
     return o_line, failed_cmds
 
 
-def _zip_files(dir_path, _size=1):
-    """
-    If file size is greater then given _size, create zip of file on same location and
-    remove original one. Won't zip If zlib module is not available.
-    """
-    for root, dirs, files in os.walk(dir_path):
-        for _file in files:
-            file_path = os.path.join(root, _file)
-            size_mb = os.path.getsize(file_path) // (1024 * 1024)
-            if size_mb >= _size:
-                os.chdir(root)
-                try:
-                    newzip = zipfile.ZipFile(_file + ".zip", "w", zipfile.ZIP_DEFLATED)
-                    newzip.write(_file)
-                    newzip.close()
-                    os.remove(_file)
-                except Exception as e:
-                    print(e)
-                    pass
-
-
 def get_system_commands(port=3000):
     # Unfortunately timestamp cannot be printed in Centos with dmesg,
     # storing dmesg logs without timestamp for this particular OS.
@@ -2471,14 +2454,22 @@ def set_collectinfo_path(timestamp, output_prefix=""):
     return aslogdir, as_logfile_prefix
 
 
-def archive_log(logdir):
-    _zip_files(logdir)
-    util.shell_command(["tar -czvf " + logdir + ".tgz " + logdir])
+def archive_log(logdir, archiver=None):
+    """
+    Adds the files of logdir that are not archived yet to archiver, a new
+    logdir.tgz archive if None, and finishes the archive.
+    """
+    if archiver is None:
+        archiver = create_collectinfo_archiver(logdir)
+
+    with archiver:
+        archiver.add_dir(logdir)
+
     print("\n\n\n")
-    logger.info("Files in " + logdir + " and " + logdir + ".tgz saved.")
+    logger.info("Files in " + logdir + " and " + archiver.path + " saved.")
 
 
-def print_collectinfo_summary(logdir, failed_cmds):
+def print_collectinfo_summary(logdir, failed_cmds, archive_path=None):
     if failed_cmds:
         logger.warning(
             "Following commands are either unavailable or giving runtime error..."
@@ -2486,14 +2477,91 @@ def print_collectinfo_summary(logdir, failed_cmds):
         logger.warning(list(set(failed_cmds)))
 
     print("\n")
-    logger.info("Please provide file " + logdir + ".tgz to Aerospike Support.")
+    if archive_path is None:
+        archive_path = logdir + ".tgz"
+
+    logger.info("Please provide file " + archive_path + " to Aerospike Support.")
     logger.info("END OF ASCOLLECTINFO")
 
     # If multiple commands are given in execute_only mode then we might need coloring for next commands
     terminal.enable_color(True)
 
 
-def collect_sys_info(port=3000, timestamp="", outfile=""):
+async def _collectinfo_shell_content(runner, cmd, alt_cmds=[]):
+    """
+    Same as _collectinfo_content with util.shell_command but runs cmd, and its
+    alternatives in turn, with runner.
+    """
+    logger.info(constants.COLLECTINFO_PROGRESS_MSG % ("shell_command", " %s" % (cmd)))
+
+    o_line = constants.COLLECTINFO_SEPERATOR + str(cmd) + "\n"
+    failed_cmds = []
+    o, e = await runner.run(cmd)
+
+    if e:
+        logger.warning(str(e))
+        failed_cmds += cmd
+
+        if alt_cmds:
+            success = False
+            for alt_cmd in alt_cmds:
+                if not alt_cmd:
+                    continue
+
+                alt_cmd = [alt_cmd]
+                logger.info(
+                    "Data collection for alternative command shell_command %s  in progress..."
+                    % (str(alt_cmd))
+                )
+                o_line += str(alt_cmd) + "\n"
+                o_alt, e_alt = await runner.run(alt_cmd)
+
+                if e_alt:
+                    e = e_alt
+
+                else:
+                    failed_cmds = []
+                    success = True
+
+                    if o_alt:
+                        o = o_alt
+                    break
+
+            if not success:
+                failed_cmds += alt_cmds
+
+    if o:
+        o_line += str(o) + "\n"
+
+    return o_line, failed_cmds
+
+
+async def _collect_sys_cmds(port):
+    """
+    Runs the system commands concurrently and returns their output and failed
+    commands in the order of get_system_commands.
+    """
+    runner = util.ShellCommandRunner(
+        constants.SYS_CMD_MAX_WORKERS, timeout=constants.SYS_CMD_TIMEOUT
+    )
+    results = await asyncio.gather(
+        *[
+            _collectinfo_shell_content(runner, cmds[0:1], cmds[1:])
+            for cmds in get_system_commands(port=port)
+        ]
+    )
+    slowest = runner.slowest(constants.SYS_CMD_SLOWEST_REPORTED)
+
+    if slowest:
+        logger.info(
+            "Slowest system commands: "
+            + ", ".join("%s (%.1fs)" % (cmd, seconds) for cmd, seconds in slowest)
+        )
+
+    return results
+
+
+async def collect_sys_info(port=3000, timestamp="", outfile=""):
     failed_cmds = []
 
     cluster_online = True
@@ -2506,62 +2574,40 @@ def collect_sys_info(port=3000, timestamp="", outfile=""):
         aslogdir, as_logfile_prefix = set_collectinfo_path(ts)
         outfile = as_logfile_prefix + "sysinfo.log"
 
-    util.write_to_file(outfile, timestamp)
-
-    try:
-        for cmds in get_system_commands(port=port):
-            o, f_cmds = _collectinfo_content(
-                func=util.shell_command,
-                cmd=cmds[0:1],
-                alt_cmds=cmds[1:] if len(cmds) > 1 else [],
-            )
-            failed_cmds += f_cmds
-            util.write_to_file(outfile, o)
-    except Exception as e:
-        print(e)
-        util.write_to_file(outfile, str(e))
-
-    try:
-        o, f_cmds = _collectinfo_content(func=_collect_cpuinfo)
-        util.write_to_file(outfile, o)
-    except Exception as e:
-        util.write_to_file(outfile, str(e))
-
-    try:
-        o, f_cmds = _collectinfo_content(func=_collect_aws_data)
-        util.write_to_file(outfile, o)
-    except Exception as e:
-        util.write_to_file(outfile, str(e))
-
-    try:
-        o, f_cmds = _collectinfo_content(func=_collect_gce_data)
-        util.write_to_file(outfile, o)
-    except Exception as e:
-        util.write_to_file(outfile, str(e))
-
-    try:
-        o, f_cmds = _collectinfo_content(func=_collect_azure_data)
-        util.write_to_file(outfile, o)
-    except Exception as e:
-        util.write_to_file(outfile, str(e))
-
-    try:
-        o, f_cmds = _collectinfo_content(func=_collect_lsof)
-        util.write_to_file(outfile, o)
-    except Exception as e:
-        util.write_to_file(outfile, str(e))
+    # The system commands and the collectors are independent so they all run
+    # at once. Their output is written in order as it becomes available.
+    loop = asyncio.get_event_loop()
+    sys_cmds = asyncio.ensure_future(_collect_sys_cmds(port))
+    collectors = [
+        loop.run_in_executor(None, _collectinfo_content, func)
+        for func in (
+            _collect_cpuinfo,
+            _collect_aws_data,
+            _collect_gce_data,
+            _collect_azure_data,
+            _collect_lsof,
+            _collect_env_variables,
+            _collect_ip_link_details,
+        )
+    ]
 
-    try:
-        o, f_cmds = _collectinfo_content(func=_collect_env_variables)
-        util.write_to_file(outfile, o)
-    except Exception as e:
-        util.write_to_file(outfile, str(e))
+    with open(str(outfile), "a") as f:
+        f.write(str(timestamp))
 
-    try:
-        o, f_cmds = _collectinfo_content(func=_collect_ip_link_details)
-        util.write_to_file(outfile, o)
-    except Exception as e:
-        util.write_to_file(outfile, str(e))
+        try:
+            for o, f_cmds in await sys_cmds:
+                failed_cmds += f_cmds
+                f.write(str(o))
+        except Exception as e:
+            print(e)
+            f.write(str(e))
+
+        for collector in collectors:
+            try:
+                o, f_cmds = await collector
+                f.write(str(o))
+            except Exception as e:
+                f.write(str(e))
 
     if not cluster_online:
         # Cluster is offline so collecting only system info and archiving files
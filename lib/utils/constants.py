@@ -64,6 +64,61 @@ SERVER_FILE = 1
 SYSTEM_FILE = 2
 JSON_FILE = 3
 
+# Responses fetched from the cluster are kept in a session wide snapshot store,
+# keyed by (node, command, generation), so that commands share them, e.g. the
+# system statistics of summary and health. An entry stays fresh for the max age
+# of the first policy matching its command, SNAPSHOT_MAX_AGE otherwise. A policy
+# ending with '/' or ':' matches the commands it prefixes, any other one only
+# matches itself. Every line entered starts a new generation, which makes every
+# entry stale except those of SNAPSHOT_STATIC_COMMANDS.
+SNAPSHOT_MAX_AGE = 0.5
+SNAPSHOT_MAX_SIZE = 4096
+SNAPSHOT_STATIC_MAX_AGE = 120.0
+SNAPSHOT_SYSTEM_MAX_AGE = 60.0
+SNAPSHOT_STATIC_COMMANDS = ("build", "node", "edition", "version")
+SNAPSHOT_POLICIES = (
+    ("build", SNAPSHOT_STATIC_MAX_AGE),
+    ("node", SNAPSHOT_STATIC_MAX_AGE),
+    ("edition", SNAPSHOT_STATIC_MAX_AGE),
+    ("version", SNAPSHOT_STATIC_MAX_AGE),
+    ("system_statistics", SNAPSHOT_SYSTEM_MAX_AGE),
+)
+
+# Per node socket pool. Sockets idle for longer than SOCKET_POOL_MAX_IDLE_TIME
+# seconds are closed, idle sockets are probed every SOCKET_POOL_PROBE_INTERVAL
+# seconds, and a borrow waits at most SOCKET_POOL_BORROW_TIMEOUT seconds when
+# SOCKET_POOL_MAX_SIZE sockets are in use.
+SOCKET_POOL_MIN_SIZE = 1
+SOCKET_POOL_MAX_SIZE = 10
+SOCKET_POOL_MAX_IDLE_TIME = 55.0
+SOCKET_POOL_PROBE_INTERVAL = 10.0
+SOCKET_POOL_BORROW_TIMEOUT = 30.0
+
+# Maximum number of nodes that system statistics are collected from concurrently.
+SYS_STATS_MAX_WORKERS = 16
+
+# Maximum number of local system commands run concurrently, and the seconds a
+# command may run before it is killed.
+SYS_CMD_MAX_WORKERS = 8
+SYS_CMD_TIMEOUT = 120.0
+
+# Number of the slowest system commands logged after sysinfo is collected.
+SYS_CMD_SLOWEST_REPORTED = 5
+
+# Maximum number of processes that server logs are searched in concurrently,
+# and seconds to wait for them to start.
+LOG_GREP_MAX_WORKERS = 8
+LOG_GREP_START_TIMEOUT = 30.0
+
+# Maximum number of processes that independent health queries are executed in.
+HEALTH_MAX_WORKERS = 4
+
+# Compression levels of the collectinfo archive, gzip by default or zstd, and
+# the number of threads compressing it.
+COLLECTINFO_ARCHIVE_LEVEL = 6
+COLLECTINFO_ZSTD_LEVEL = 3
+COLLECTINFO_ARCHIVE_WORKERS = 4
+
 COLLECTINFO_SEPERATOR = "\n====ASCOLLECTINFO====\n"
 COLLECTINFO_PROGRESS_MSG = "Data collection for %s%s  in progress..."
 
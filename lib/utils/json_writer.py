@@ -0,0 +1,91 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from typing import Any, TextIO
+
+SEPARATORS = (",", ":")
+
+
+class JSONObjectWriter:
+    """
+    Writes a JSON object to fp one member at a time, so the whole object never
+    has to be encoded in memory. Objects up to depth levels below each member
+    are also written member by member, anything deeper is encoded at once.
+
+    The output is the same as json.dump(obj, fp, indent=indent,
+    separators=(",", ":")), with indent=None giving the compact format.
+    """
+
+    def __init__(self, fp: TextIO, indent=2, depth=0):
+        self._fp = fp
+        self._indent = indent
+        self._depth = depth
+        self._empty = True
+
+    def _newline(self, level):
+        if self._indent is None:
+            return ""
+
+        return "\n" + " " * (self._indent * level)
+
+    def _encode(self, value, level):
+        encoded = json.dumps(value, indent=self._indent, separators=SEPARATORS)
+
+        if self._indent is None:
+            return encoded
+
+        # Strings are encoded with escaped newlines, so every newline is
+        # indentation.
+        return encoded.replace("\n", self._newline(level))
+
+    def _write_member(self, key, value, level, depth, first):
+        self._fp.write(
+            ("" if first else ",")
+            + self._newline(level)
+            + json.dumps(str(key))
+            + SEPARATORS[1]
+        )
+        self._write_value(value, level, depth)
+
+    def _write_value(self, value, level, depth):
+        if depth <= 0 or not isinstance(value, dict) or not value:
+            self._fp.write(self._encode(value, level))
+            return
+
+        self._fp.write("{")
+
+        for i, (k, v) in enumerate(value.items()):
+            self._write_member(k, v, level + 1, depth - 1, i == 0)
+
+        self._fp.write(self._newline(level) + "}")
+
+    def write(self, key: str, value: Any):
+        """
+        Writes the member key: value of the object.
+        """
+        if self._empty:
+            self._fp.write("{")
+
+        self._write_member(key, value, 1, self._depth, self._empty)
+        self._empty = False
+
+    def close(self):
+        """
+        Ends the object. The file is left open.
+        """
+        if self._empty:
+            self._fp.write("{}")
+        else:
+            self._fp.write(self._newline(0) + "}")
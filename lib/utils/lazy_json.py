@@ -0,0 +1,216 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import MutableMapping
+import gzip
+import json
+import mmap
+import re
+from typing import Any, Callable, Union
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR = re.compile(rb"[^,}\]\s]+")
+_CONTAINER_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+
+
+class Span:
+    __slots__ = ("start", "end")
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class LazyJSONObject(MutableMapping):
+    """
+    A JSON object whose member values are only decoded when they are first
+    accessed. Decoded values are kept, so each member is decoded at most once.
+    Members are either a Span of buf to decode or an already decoded value.
+    """
+
+    def __init__(
+        self,
+        buf,
+        members: dict[str, Union[Span, Any]],
+        decode: Callable[[bytes], Any] = json.loads,
+    ):
+        self._buf = buf
+        self._members = members
+        self._decode = decode
+
+    def __getitem__(self, key):
+        value = self._members[key]
+
+        if isinstance(value, Span):
+            value = self._decode(self._buf[value.start : value.end])
+            self._members[key] = value
+
+        return value
+
+    def __setitem__(self, key, value):
+        self._members[key] = value
+
+    def __delitem__(self, key):
+        del self._members[key]
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __repr__(self):
+        return "LazyJSONObject(%s)" % list(self._members.keys())
+
+    def is_loaded(self, key):
+        return not isinstance(self._members[key], Span)
+
+    def peek(self, key):
+        """
+        Like self[key] but a member that is not loaded yet is decoded without
+        being kept.
+        """
+        value = self._members[key]
+
+        if isinstance(value, Span):
+            return self._decode(self._buf[value.start : value.end])
+
+        return value
+
+
+def _error(msg, buf, idx):
+    return json.JSONDecodeError(msg, buf[:idx].decode("utf-8", "replace"), idx)
+
+
+def _skip_ws(buf, idx):
+    return _WHITESPACE.match(buf, idx).end()
+
+
+def _skip_value(buf, idx):
+    """
+    Returns the offset just past the JSON value starting at idx without decoding
+    it.
+    """
+    c = buf[idx : idx + 1]
+
+    if c == b'"':
+        m = _STRING.match(buf, idx)
+
+        if not m:
+            raise _error("Unterminated string", buf, idx)
+
+        return m.end()
+
+    if c == b"{" or c == b"[":
+        depth = 0
+
+        for m in _CONTAINER_TOKEN.finditer(buf, idx):
+            token = m.group()
+
+            if token == b"{" or token == b"[":
+                depth += 1
+            elif token == b"}" or token == b"]":
+                depth -= 1
+
+                if depth == 0:
+                    return m.end()
+
+        raise _error("Unterminated container", buf, idx)
+
+    m = _SCALAR.match(buf, idx)
+
+    if not m:
+        raise _error("Expecting value", buf, idx)
+
+    return m.end()
+
+
+def _index_object(buf, idx, depth):
+    """
+    Indexes the JSON object starting at idx. Members of the first depth levels of
+    nested objects are indexed as LazyJSONObjects, anything deeper is recorded as
+    a span to decode on access. Returns the object and the offset just past it.
+    """
+    if buf[idx : idx + 1] != b"{":
+        raise _error("Expecting object", buf, idx)
+
+    members = {}
+    idx = _skip_ws(buf, idx + 1)
+
+    if buf[idx : idx + 1] == b"}":
+        return LazyJSONObject(buf, members), idx + 1
+
+    while True:
+        m = _STRING.match(buf, idx)
+
+        if not m:
+            raise _error("Expecting property name", buf, idx)
+
+        key = json.loads(m.group())
+        idx = _skip_ws(buf, m.end())
+
+        if buf[idx : idx + 1] != b":":
+            raise _error("Expecting ':' delimiter", buf, idx)
+
+        idx = _skip_ws(buf, idx + 1)
+
+        if depth > 1 and buf[idx : idx + 1] == b"{":
+            members[key], idx = _index_object(buf, idx, depth - 1)
+        else:
+            end = _skip_value(buf, idx)
+            members[key] = Span(idx, end)
+            idx = end
+
+        idx = _skip_ws(buf, idx)
+        c = buf[idx : idx + 1]
+
+        if c == b"}":
+            return LazyJSONObject(buf, members), idx + 1
+
+        if c != b",":
+            raise _error("Expecting ',' delimiter", buf, idx)
+
+        idx = _skip_ws(buf, idx + 1)
+
+
+def load(file_path, depth=1) -> LazyJSONObject:
+    """
+    Index the JSON object in file_path without decoding it. The file is memory
+    mapped, so only the members that are accessed are read into memory. Gzip
+    compressed files, ending in .gz, are decompressed into memory instead.
+    """
+    if file_path.endswith(".gz"):
+        with gzip.open(file_path, "rb") as f:
+            buf = f.read()
+    else:
+        buf = _map_file(file_path)
+
+    obj, idx = _index_object(buf, _skip_ws(buf, 0), depth)
+
+    if _skip_ws(buf, idx) != len(buf):
+        raise _error("Extra data", buf, idx)
+
+    return obj
+
+
+def _map_file(file_path):
+    with open(file_path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            buf = b""
+
+    return buf
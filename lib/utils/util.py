@@ -13,11 +13,15 @@
 # limitations under the License.
 
 import asyncio
+from collections import OrderedDict
+import contextvars
 import copy
 import inspect
 import io
+import os
 import pipes
 import re
+import signal
 import socket
 import subprocess
 import sys
@@ -51,12 +55,16 @@ def callable(func, *args, **kwargs):
     return lambda: func(*args, **kwargs)
 
 
+def _shell_command_args(command):
+    command = pipes.quote(" ".join(command))
+    return ["bash", "-c", "'%s'" % (command)]
+
+
 def shell_command(command) -> tuple[str, str]:
     """
     command is a list of ['cmd','arg1','arg2',...]
     """
-    command = pipes.quote(" ".join(command))
-    command = ["bash", "-c", "'%s'" % (command)]
+    command = _shell_command_args(command)
     try:
         p = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
@@ -67,18 +75,112 @@ def shell_command(command) -> tuple[str, str]:
         return bytes_to_str(out), bytes_to_str(err)
 
 
+async def shell_command_async(command, timeout=None) -> tuple[str, str]:
+    """
+    Same as shell_command but does not block the event loop. If the command is
+    still running after timeout seconds it is killed, along with any processes
+    it started, and a timeout error is returned.
+    """
+    command = _shell_command_args(command)
+    try:
+        p = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+    except Exception:
+        return "", "error"
+
+    try:
+        out, err = await asyncio.wait_for(p.communicate(), timeout)
+    except asyncio.TimeoutError:
+        try:
+            os.killpg(p.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+        # Closes the pipes once the killed processes exit.
+        await p.communicate()
+        return "", "timed out after %s seconds" % (timeout)
+    else:
+        return bytes_to_str(out), bytes_to_str(err)
+
+
+class ShellCommandRunner:
+    """
+    Runs shell commands concurrently, at most max_workers at a time, and
+    records how long each one took.
+    """
+
+    def __init__(self, max_workers, timeout=None):
+        self.timeout = timeout
+        self.timings: dict[str, float] = {}
+        self._semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(self, command) -> tuple[str, str]:
+        async with self._semaphore:
+            start = time()
+
+            try:
+                return await shell_command_async(command, self.timeout)
+            finally:
+                self.timings[" ".join(command)] = time() - start
+
+    def slowest(self, n):
+        """
+        Returns the n slowest commands as a list of (command, seconds).
+        """
+        return sorted(self.timings.items(), key=lambda t: t[1], reverse=True)[:n]
+
+
+# Output written to sys.stdout while capture_stdout runs goes to the sink of the
+# current context, so captures running concurrently in separate tasks do not mix
+# their output.
+_stdout_sink = contextvars.ContextVar("stdout_sink", default=None)
+
+
+class _ContextStdout:
+    """
+    Stands in for sys.stdout while there are active captures and forwards to the
+    sink of the current context, or to the replaced stdout if there is none.
+    """
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.captures = 0
+
+    def _target(self):
+        sink = _stdout_sink.get()
+        return self.stdout if sink is None else sink
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
 async def capture_stdout(func, *args, **kwargs):
     """
     Redirecting the stdout to use the output elsewhere
     """
 
     sys.stdout.flush()
-    old = sys.stdout
+    stdout = sys.stdout
 
-    try:
-        capturer = io.StringIO()
-        sys.stdout = capturer
+    if not isinstance(stdout, _ContextStdout):
+        stdout = _ContextStdout(stdout)
+        sys.stdout = stdout
+
+    stdout.captures += 1
+    capturer = io.StringIO()
+    token = _stdout_sink.set(capturer)
 
+    try:
         if inspect.iscoroutinefunction(func):
             await func(*args, **kwargs)
         else:
@@ -89,7 +191,11 @@ async def capture_stdout(func, *args, **kwargs):
 
         output = capturer.getvalue()
     finally:
-        sys.stdout = old
+        _stdout_sink.reset(token)
+        stdout.captures -= 1
+
+        if not stdout.captures and sys.stdout is stdout:
+            sys.stdout = stdout.stdout
 
     return output
 
@@ -652,6 +758,52 @@ def mbytes_to_bytes(data):
     return data
 
 
+class FrozenDict(dict):
+    """
+    Read-only dict for data that is shared between callers instead of being
+    copied, e.g. collectinfo snapshot data. Callers that need to modify it should
+    copy it first. copy.copy() and copy.deepcopy() return plain dicts.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("'%s' object is read-only" % type(self).__name__)
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(data):
+    """
+    Returns data with all nested dicts converted to FrozenDicts. Lists are copied
+    but stay mutable.
+    """
+    if isinstance(data, FrozenDict):
+        return data
+
+    if isinstance(data, dict):
+        return FrozenDict((k, freeze(v)) for k, v in data.items())
+
+    if isinstance(data, list):
+        return [freeze(v) for v in data]
+
+    return data
+
+
 def find_delimiter_in(value):
     """Find a good delimiter to split the value by"""
 
@@ -796,6 +948,10 @@ class async_cached(Generic[AwaitableType]):
     """
     Doesn't support lists, dicts and other unhashables
     Also doesn't support kwargs for reasons above.
+
+    Entries are kept in least-recently-used order. Once max_size entries are cached
+    the least recently used one is evicted, and expired entries are swept out
+    periodically so the cache does not grow without bound in long running sessions.
     """
 
     class _CacheableCoroutine(Generic[AwaitableReturnType]):
@@ -834,13 +990,43 @@ class async_cached(Generic[AwaitableType]):
         def raised(self) -> bool:
             return self._raised
 
-    def __init__(self, func: Callable[..., Awaitable[AwaitableType]], ttl=0.5):
+    def __init__(
+        self, func: Callable[..., Awaitable[AwaitableType]], ttl=0.5, max_size=1024
+    ):
         self.func = func
         self.ttl = ttl
-        self.cache = {}
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self._next_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _sweep(self, now: float):
+        """
+        Removes all expired entries. Runs at most once per ttl.
+        """
+        if now < self._next_sweep:
+            return
+
+        self._next_sweep = now + self.ttl
+        expired = [key for key, (_, eol) in self.cache.items() if eol <= now]
+
+        for key in expired:
+            del self.cache[key]
+
+        self.expirations += len(expired)
 
     def __setitem__(self, key, value: _CacheableCoroutine):
-        self.cache[key] = (value, time() + self.ttl)
+        now = time()
+        self._sweep(now)
+        self.cache[key] = (value, now + self.ttl)
+        self.cache.move_to_end(key)
+
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
 
     def __getitem__(self, key) -> Awaitable[AwaitableType]:
         if key in self.cache:
@@ -849,8 +1035,11 @@ class async_cached(Generic[AwaitableType]):
                 value, eol = self.cache[key]
                 if eol > time():
                     logger.debug("return cached %s: %s", key[1:], value)
+                    self.cache.move_to_end(key)
+                    self.hits += 1
                     return value
 
+        self.misses += 1
         self[key] = self._CacheableCoroutine(self.func(*key))
         return self.cache[key][0]
 
@@ -858,3 +1047,19 @@ class async_cached(Generic[AwaitableType]):
         if "disable_cache" in kwargs and kwargs["disable_cache"]:
             return self.func(*args)
         return self[args]
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the counters of this cache. Useful for tuning ttl and max_size.
+        """
+        return {
+            "size": len(self.cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
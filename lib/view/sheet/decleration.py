@@ -445,12 +445,13 @@ class BaseProjector(object):
         else:
             # Setting 'self.keys' to one or more strings indicates that the
             # field needs to be accessed by key.
-            try:
-                return next(row[k] for k in self.keys if k in row)
-            except (KeyError, StopIteration):
-                raise NoEntryException(
-                    "{} does not contain any key in {}".format(self.source, self.keys)
-                )
+            for k in self.keys:
+                if k in row:
+                    return row[k]
+
+            raise NoEntryException(
+                "{} does not contain any key in {}".format(self.source, self.keys)
+            )
 
 
 class Projectors(object):
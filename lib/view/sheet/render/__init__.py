@@ -56,6 +56,7 @@ def render(
     title_repeat=False,
     disable_aggregations=False,
     dynamic_diff=False,
+    stream=False,
 ):
     """
     Arguments:
@@ -74,6 +75,9 @@ def render(
     title_repeat -- Repeat title and row headers every n columns.
     disable_aggregations -- Disable sheet aggregations.
     dynamic_diff     -- Only show dynamic fields that aren't uniform.
+    stream       -- Return an iterator over the rendered lines instead of a
+                    string so large sheets can be output as they render. JSON
+                    is still returned as a string.
     """
     tcommon = defaultdict(lambda: None)
 
@@ -91,7 +95,7 @@ def render(
     elif style is None:
         style = sheet.default_style
 
-    return render_class[style](
+    rsheet = render_class[style](
         sheet,
         title,
         data_source,
@@ -101,4 +105,9 @@ def render(
         title_repeat=title_repeat,
         disable_aggregations=disable_aggregations,
         dynamic_diff=dynamic_diff,
-    ).render()
+    )
+
+    if stream and style != SheetStyle.json:
+        return rsheet.render_lines()
+
+    return rsheet.render()
@@ -24,6 +24,12 @@ from ..const import DynamicFieldOrder
 from ..source import source_lookup
 from .render_utils import ErrorEntry, NoEntry
 
+# Maximum number of render plans kept, the least recently used one is dropped
+# once it is reached.
+RENDER_PLAN_CACHE_SIZE = 64
+
+_render_plans = OrderedDict()
+
 
 class BaseRSheet(object):
     def __init__(
@@ -70,6 +76,7 @@ class BaseRSheet(object):
         self.disable_aggregations = disable_aggregations
         self.dynamic_diff = dynamic_diff
         self.terminal_size = get_terminal_size()
+        self._records = None
 
         self.dfields = self.get_dfields()
 
@@ -127,6 +134,19 @@ class BaseRSheet(object):
         """
         raise NotImplementedError("override")
 
+    # =========================================================================
+    # Optional overrides.
+
+    def do_render_lines(self):
+        """
+        Renders the data one line at a time so it can be output before the
+        whole sheet is rendered. Defaults to the lines of do_render.
+        """
+        render = self.do_render()
+
+        if render:
+            yield from render.splitlines()
+
     # =========================================================================
     # Other methods.
 
@@ -199,50 +219,84 @@ class BaseRSheet(object):
 
         return self.do_render()
 
+    def render_lines(self):
+        """
+        Returns an iterator over the rendered lines, None if there is nothing
+        to display. Widths are known once the fields are prepared so lines are
+        produced as each group is rendered.
+        """
+        if self.rfields is None:
+            return None
+
+        return self.do_render_lines()
+
     def get_dfields(self):
+        """
+        Returns the fields of the sheet with its DynamicFields expanded. The
+        expanded fields are kept in a render plan, keyed by the sheet and the
+        keys each DynamicFields selects with the kinds of their entries, so
+        rendering the same fields again reuses them.
+        """
+        signature = []
+
+        for dfield in self.decleration.fields:
+            if isinstance(dfield, decleration.DynamicFields):
+                keys = self._get_dynamic_keys(dfield)
+                signature.append((keys, self._infer_projector_kinds(dfield, keys)))
+
+        plan_key = (self.decleration, self.disable_aggregations, tuple(signature))
+
+        try:
+            dfields = _render_plans.pop(plan_key)
+        except KeyError:
+            dfields = self._create_dfields(signature)
+
+            if len(_render_plans) >= RENDER_PLAN_CACHE_SIZE:
+                _render_plans.popitem(last=False)
+
+        _render_plans[plan_key] = dfields
+
+        # The list is changed by diff, the fields are not.
+        return list(dfields)
+
+    def _get_dynamic_keys(self, dfield):
+        """
+        Returns the keys of the sources a DynamicFields selects, in order.
+        """
+        keys = {}
+        for_each = dfield.source in self.decleration.for_each
+
+        for sources in self.sources:
+            try:
+                row = source_lookup(sources, dfield.source)
+
+                if for_each and isinstance(row, tuple):
+                    row = row[1]
+
+                keys.update(((k, None) for k in row.keys()))
+            except (AttributeError, TypeError):
+                pass
+
+        if self.selector is not None:
+            keys = [key for key in keys if self.selector.search(key) is not None]
+
+            if dfield.order is DynamicFieldOrder.ascending:
+                keys.sort()
+            elif dfield.order is DynamicFieldOrder.descending:
+                keys.sort(reverse=True)
+
+        return tuple(keys)
+
+    def _create_dfields(self, signature):
         dfields = []
         ignore_keys = set()
+        signature = iter(signature)
 
         for dfield in self.decleration.fields:
             if isinstance(dfield, decleration.DynamicFields):
-                keys = {}
-
-                for sources in self.sources:
-                    try:
-                        if dfield.source in self.decleration.for_each and isinstance(
-                            sources[dfield.source], tuple
-                        ):
-                            keys.update(
-                                (
-                                    (k, None)
-                                    for k in source_lookup(sources, dfield.source)[
-                                        1
-                                    ].keys()
-                                )
-                            )
-                        else:
-                            keys.update(
-                                (
-                                    (k, None)
-                                    for k in source_lookup(
-                                        sources, dfield.source
-                                    ).keys()
-                                )
-                            )
-                    except (AttributeError, TypeError):
-                        pass
-
-                if self.selector is not None:
-                    keys = [
-                        key for key in keys if self.selector.search(key) is not None
-                    ]
-
-                    if dfield.order is DynamicFieldOrder.ascending:
-                        keys.sort()
-                    elif dfield.order is DynamicFieldOrder.descending:
-                        keys.sort(reverse=True)
-
-                for key in keys:
+                keys, kinds = next(signature)
+
+                for key, kind in zip(keys, kinds):
                     if key in ignore_keys:
                         continue
 
@@ -256,7 +310,7 @@ class BaseRSheet(object):
                         proj = proj_func(dfield.source, key)
 
                     else:
-                        proj = self._infer_projector(dfield, key)
+                        proj = kind(dfield.source, key)
 
                     if (
                         not self.disable_aggregations
@@ -294,54 +348,63 @@ class BaseRSheet(object):
             projector, decleration.Projectors.Number
         )
 
-    def _infer_projector(self, dfield, key):
-        proj_args = (dfield.source, key)
-
-        if not dfield.infer_projectors:
-            return decleration.Projectors.String(*proj_args)
+    def _infer_projector_kinds(self, dfield, keys):
+        """
+        Returns the projector class to use for each of keys, inferred from the
+        entries of all the sources for the key, one source at a time.
+        """
+        if not dfield.infer_projectors or dfield.projector_selector:
+            return (decleration.Projectors.String,) * len(keys)
 
-        entries = []
+        has_string = dict.fromkeys(keys, False)
+        has_float = dict.fromkeys(keys, False)
+        has_int = dict.fromkeys(keys, False)
 
         for sources in self.sources:
             try:
-                if isinstance(sources[dfield.source], tuple):
-                    entries.append(source_lookup(sources, dfield.source)[1][key])
+                row = source_lookup(sources, dfield.source)
 
-                else:
-                    entries.append(source_lookup(sources, dfield.source)[key])
+                if isinstance(row, tuple):
+                    row = row[1]
             except (KeyError, TypeError):
                 # Missing or error retrieving, ignore for inference.
-                pass
+                continue
 
-        has_string = False
-        has_float = False
-        has_int = False
+            for key in keys:
+                try:
+                    entry = row[key]
+                except (KeyError, TypeError):
+                    continue
 
-        for entry in entries:
-            try:
-                int(entry)
-                has_int = True
-                continue
-            except (ValueError, TypeError):
-                pass
+                try:
+                    int(entry)
+                    has_int[key] = True
+                    continue
+                except (ValueError, TypeError):
+                    pass
 
-            try:
-                float(entry)
-                has_float = True
-                continue
-            except (ValueError, TypeError):
-                pass
+                try:
+                    float(entry)
+                    has_float[key] = True
+                    continue
+                except (ValueError, TypeError):
+                    pass
+
+                has_string[key] = True
+
+        kinds = []
 
-            has_string = True
+        for key in keys:
+            if has_string[key]:
+                kinds.append(decleration.Projectors.String)
+            elif has_float[key]:
+                kinds.append(decleration.Projectors.Float)
+            elif has_int[key]:
+                kinds.append(decleration.Projectors.Number)
+            else:  # no entries
+                kinds.append(decleration.Projectors.String)
 
-        if has_string:
-            return decleration.Projectors.String(*proj_args)
-        elif has_float:
-            return decleration.Projectors.Float(*proj_args)
-        elif has_int:
-            return decleration.Projectors.Number(*proj_args)
-        else:  # no entries
-            return decleration.Projectors.String(*proj_args)
+        return tuple(kinds)
 
     def project_fields(self):
         projections = []
@@ -523,6 +586,25 @@ class BaseRSheet(object):
 
         return self.do_create_field(field, groups, parent_key=parent_key)
 
+    def get_record(self, group_ix, entry_ix):
+        """
+        Returns the cross-section of all fields at an entry's position. Records
+        are the same for every field, so they are built once, from the columns
+        of all the fields, the first time one is needed.
+        """
+        if self._records is None:
+            self._records = []
+
+            for group_ix_ in range(self.rfields[0].n_groups):
+                n_entries = self.rfields[0].n_entries_in_group(group_ix_)
+                columns = [
+                    [rfield.get_kv(group_ix_, ix) for ix in range(n_entries)]
+                    for rfield in self.rfields
+                ]
+                self._records.append([dict(kvs) for kvs in zip(*columns)])
+
+        return self._records[group_ix][entry_ix]
+
 
 class BaseRSubgroup(object):
     def __init__(self, rsheet, field, groups):
@@ -685,18 +767,11 @@ class BaseRField(object):
             self.groups_entry_data.append(entry_edata)
             entries = [self.entry_value(e) for e in group]
             for entry_ix, entry in enumerate(entries):
-                record = dict(
-                    (
-                        rfield.get_kv(group_ix, entry_ix)
-                        for rfield in self.rsheet.rfields
-                    )
-                )
-
                 entry_edata.append(
                     decleration.EntryData(
                         value=entry,
                         values=entries,
-                        record=record,
+                        record=self.rsheet.get_record(group_ix, entry_ix),
                         common=self.rsheet.common,
                         is_error=group[entry_ix] is ErrorEntry,
                         is_no_entry=group[entry_ix] is NoEntry,
@@ -29,13 +29,25 @@ class ColumnRSheet(BaseRSheetCLI):
         return RFieldColumn(self, field, groups, parent_key=parent_key)
 
     def do_render(self):
+        render = list(self.do_render_lines())
+
+        if not render:
+            # Sheet is empty.
+            return ""
+
+        return "\n".join(render) + "\n"
+
+    # =========================================================================
+    # Optional overrides.
+
+    def do_render_lines(self):
         rfields = self.visible_rfields
 
         try:
             n_title_lines = max(rfield.n_title_lines for rfield in rfields)
         except ValueError:
             # Sheet is empty.
-            return ""
+            return
 
         # Render field titles.
         if self.title_repeat:
@@ -82,6 +94,8 @@ class ColumnRSheet(BaseRSheetCLI):
         title_width = self._do_render_title(render, title_width)
         self._do_render_description(render, title_width, title_width)
 
+        yield from render
+
         # Render fields.
         title_lines = [
             self.decleration.formatted_vertical_separator_func().join(
@@ -95,7 +109,7 @@ class ColumnRSheet(BaseRSheetCLI):
         repeats_every = max([24, terminal_height - len(title_lines) - 1])
         num_lines = 0
 
-        render.extend(title_lines)
+        yield from title_lines
 
         for group_ix in range(num_groups):
             num_entries = rfields[0].n_entries_in_group(group_ix)
@@ -106,27 +120,24 @@ class ColumnRSheet(BaseRSheetCLI):
                     and num_lines != 0
                     and num_lines % repeats_every == 0
                 ):
-                    render.extend(title_lines)
+                    yield from title_lines
 
                 num_lines += 1
                 row = [rfield.entry_cell(group_ix, entry_ix) for rfield in rfields]
-                render.append(
-                    self.decleration.formatted_vertical_separator_func().join(row)
-                )
+                yield self.decleration.formatted_vertical_separator_func().join(row)
 
             if has_aggregates:
                 if self.title_repeat and num_lines % repeats_every == 0:
-                    render.extend(title_lines)
+                    yield from title_lines
 
                 num_lines += 1
                 row = [rfield.aggregate_cell(group_ix) for rfield in rfields]
-                render.append(
-                    self.decleration.formatted_vertical_separator_func().join(row)
-                )
+                yield self.decleration.formatted_vertical_separator_func().join(row)
 
+        render = []
         self._do_render_n_rows(render, self.n_records)
 
-        return "\n".join(render) + "\n"
+        yield from render
 
 
 class RSubgroupColumn(BaseRSubgroup):
@@ -47,10 +47,21 @@ class RowRSheet(BaseRSheetCLI):
         return RFieldRow(self, field, groups, parent_key=parent_key)
 
     def do_render(self):
+        render = list(self.do_render_lines())
+
+        if not render:
+            return None
+
+        return "\n".join(render) + "\n"
+
+    # =========================================================================
+    # Optional overrides.
+
+    def do_render_lines(self):
         render_fields = self.visible_rfields
 
         if not render_fields:
-            return None
+            return
 
         row_title_width = max(rfield.title_width for rfield in render_fields)
         row_aggr_width = max(rfield.aggregate_widths[0] + 1 for rfield in render_fields)
@@ -126,6 +137,8 @@ class RowRSheet(BaseRSheetCLI):
         self._do_render_title(render, title_width)
         self._do_render_description(render, title_width, title_width - 10)
 
+        yield from render
+
         # Render fields.
 
         # XXX - Add handling for Subgroups?
@@ -182,20 +195,18 @@ class RowRSheet(BaseRSheetCLI):
                 if has_aggregate:
                     row.append(render_field.aggregate_cell(group_ix))
 
-                render.append(
-                    self.decleration.formatted_vertical_separator_func().join(row)
-                )
+                yield self.decleration.formatted_vertical_separator_func().join(row)
 
             if num_groups > 1 and group_ix < num_groups - 1:
-                render.append(
+                yield (
                     self.decleration.formatted_horizontal_seperator_func() * title_width
                 )
 
         num_rows = len(render_fields) * num_groups - hidden_count
+        render = []
         self._do_render_n_rows(render, num_rows)
 
-        return "\n".join(render) + "\n"
-        # return ""
+        yield from render
 
     # =========================================================================
     # Other methods.
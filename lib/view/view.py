@@ -12,15 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+from collections.abc import Iterator
+from contextlib import redirect_stdout
 import datetime
+import itertools
 import locale
 import logging
+import math
 from os import path
+import re
+import signal
+import subprocess
 import sys
 import time
-from io import StringIO
+from io import StringIO, TextIOWrapper
 from pydoc import pipepager
-from typing import Tuple, Union
+from typing import Callable, Optional, Tuple, Union
 
 from lib.health import constants as health_constants
 from lib.health.util import print_dict
@@ -33,9 +41,29 @@ from lib.utils.common import (
     SummaryNamespacesDict,
 )
 from lib.view import sheet, terminal, templates
+from lib.view.terminal import get_terminal_size
 from lib.view.sheet import SheetStyle
 from lib.view.table import Orientation, Table, TitleFormats
 
+_WATCH_ESCAPE_RE = re.compile(r"\033\[[0-9;]*m")
+_WATCH_SEGMENT_RE = re.compile(r"\033\[[0-9;]*m|\033|[^\033]+")
+_WATCH_CELL_RE = re.compile(r"\S+")
+
+
+class _LogRecordCounter(logging.Handler):
+    """
+    Counts the records logged while watch executes its command. Those are printed
+    between iterations, so the previous iteration cannot be redrawn in place.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
 H1_offset = 13
 H2_offset = 15
 H_width = 80
@@ -61,21 +89,27 @@ class CliView(object):
     pager = NO_PAGER
     logger = logging.getLogger("asadm")
 
+    @staticmethod
+    def _get_less_cmd():
+        if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+            # We are running in a bundled app
+            return path.join(sys._MEIPASS, "less") + " -RSX"  # type: ignore MEIPASS is set by pyinstaller.
+
+        return "less -RSX"
+
     @staticmethod
     def print_result(out):
         if out is None or out == "":
             return
 
+        if isinstance(out, Iterator):
+            CliView._print_lines(out)
+            return
+
         if type(out) is not str:
             out = str(out)
         if CliView.pager == CliView.LESS:
-            if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
-                # We are running in a bundled app
-                less_cmd = path.join(sys._MEIPASS, "less") + " -RSX"  # type: ignore MEIPASS is set by pyinstaller.
-            else:
-                less_cmd = "less -RSX"
-
-            pipepager(out, less_cmd)
+            pipepager(out, CliView._get_less_cmd())
         elif CliView.pager == CliView.SCROLL:
             for i in out.split("\n"):
                 print(i)
@@ -83,6 +117,58 @@ class CliView(object):
         else:
             print(out)
 
+    @staticmethod
+    def _print_lines(lines):
+        """
+        Outputs lines, e.g. from a streamed sheet render, as they are
+        produced. The output matches print_result of the joined lines.
+        """
+        first_line = next(lines, None)
+
+        if first_line is None:
+            return
+
+        lines = itertools.chain([first_line], lines)
+
+        if CliView.pager == CliView.LESS:
+            CliView._pipe_lines(lines, CliView._get_less_cmd())
+            return
+
+        # A rendered string ends with a newline which print follows with an
+        # empty line.
+        lines = itertools.chain(lines, [""])
+
+        if CliView.pager == CliView.SCROLL:
+            for line in lines:
+                print(line)
+                time.sleep(0.05)
+        else:
+            for line in lines:
+                print(line)
+
+    @staticmethod
+    def _pipe_lines(lines, cmd):
+        # Same as pydoc.pipepager but writes lines as they are produced. Lines
+        # stop being consumed once the pager exits.
+        proc = subprocess.Popen(cmd, shell=True, stdin=subprocess.PIPE)
+
+        try:
+            with TextIOWrapper(proc.stdin, errors="backslashreplace") as pipe:
+                try:
+                    for line in lines:
+                        pipe.write(line + "\n")
+                except KeyboardInterrupt:
+                    pass
+        except OSError:
+            pass  # Ignore broken pipes caused by quitting the pager program.
+
+        while True:
+            try:
+                proc.wait()
+                break
+            except KeyboardInterrupt:
+                pass
+
     @staticmethod
     def print_pager():
         if CliView.pager == CliView.LESS:
@@ -321,7 +407,13 @@ class CliView(object):
         common = dict(principal=cluster.get_expected_principal())
 
         CliView.print_result(
-            sheet.render(templates.info_sindex_sheet, title, sources, common=common)
+            sheet.render(
+                templates.info_sindex_sheet,
+                title,
+                sources,
+                common=common,
+                stream=True,
+            )
         )
 
     @staticmethod
@@ -861,7 +953,9 @@ class CliView(object):
         common = dict(principal=cluster.get_expected_principal())
 
         CliView.print_result(
-            sheet.render(templates.show_pmap_sheet, title, sources, common=common)
+            sheet.render(
+                templates.show_pmap_sheet, title, sources, common=common, stream=True
+            )
         )
 
     @staticmethod
@@ -947,7 +1041,9 @@ class CliView(object):
         title = "Secondary Indexes{}".format(title_timestamp)
         sources = dict(data=filtered_data)
 
-        CliView.print_result(sheet.render(templates.show_sindex, title, sources))
+        CliView.print_result(
+            sheet.render(templates.show_sindex, title, sources, stream=True)
+        )
 
     @staticmethod
     @reserved_modifiers
@@ -967,12 +1063,12 @@ class CliView(object):
         filtered_data = None
 
         if for_:
-            filtered_data = dict(roster_data)
+            filtered_data = {}
             likes = util.compile_likes(for_)
-            for node_data in filtered_data.values():
-                for key in list(node_data.keys()):
-                    if not likes.search(key):
-                        del node_data[key]
+            for node, node_data in roster_data.items():
+                filtered_data[node] = {
+                    key: value for key, value in node_data.items() if likes.search(key)
+                }
         else:
             filtered_data = roster_data
 
@@ -984,7 +1080,7 @@ class CliView(object):
         sources = dict(
             node_names=node_names,
             node_ids=node_ids,
-            data=roster_data,
+            data=filtered_data,
         )
         common = dict(principal=cluster.get_expected_principal())
         style = SheetStyle.columns
@@ -1048,9 +1144,9 @@ class CliView(object):
                 del filtered_data[host]
                 continue
             if trid:
-                for id in dict(host_data):
-                    if id not in trid:
-                        del filtered_data[host][id]
+                filtered_data[host] = {
+                    id: job for id, job in host_data.items() if id in trid
+                }
 
         if not filtered_data:
             return
@@ -1154,39 +1250,128 @@ class CliView(object):
                         print()
 
     @staticmethod
-    def group_output(output):
-        i = 0
+    def _watch_changed_cells(previous: str, row: str) -> list[tuple[int, int]]:
+        """
+        Returns the (start, end) of the cells of row, runs of non-whitespace, that
+        differ from what previous has at the same columns. Both are plain text.
+        """
+        changed = []
 
-        while i < len(output):
-            group = output[i]
+        for m in _WATCH_CELL_RE.finditer(row):
+            start, end = m.span()
 
-            if group == "\033":
-                i += 1
+            if (
+                previous[start:end] != m.group()
+                or previous[start - 1 : start].strip()
+                or previous[end : end + 1].strip()
+            ):
+                changed.append((start, end))
 
-                while i < len(output):
-                    group = group + output[i]
-                    if output[i] == "m":
-                        i += 1
-                        break
-                    i += 1
+        return changed
 
-                yield group
+    @staticmethod
+    def _watch_highlight(row: str, cells: list[tuple[int, int]]) -> str:
+        """
+        Highlights the cells, plain text (start, end) positions, of the rendered
+        row.
+        """
+        result = []
+        pos = 0
+        cells = iter(cells)
+        cell = next(cells, None)
+
+        for m in _WATCH_SEGMENT_RE.finditer(row):
+            text = m.group()
+
+            if len(text) > 1 and text[0] == "\033":
+                result.append(text)
                 continue
-            else:
-                yield group
 
-                i += 1
+            text_start = pos
+            pos += len(text)
+            i = 0
+
+            while i < len(text):
+                while cell and cell[1] <= text_start + i:
+                    cell = next(cells, None)
+
+                if not cell:
+                    result.append(text[i:])
+                    break
+
+                if cell[0] > text_start + i:
+                    j = min(cell[0], pos) - text_start
+                    result.append(text[i:j])
+                    i = j
+                    continue
+
+                j = min(cell[1], pos) - text_start
+                result.append(terminal.inverse() + text[i:j] + terminal.uninverse())
+                i = j
+
+        return "".join(result)
 
     @staticmethod
-    def peekable(peeked, remaining):
-        for val in remaining:
-            while peeked:
-                yield peeked.pop(0)
+    def _watch_render(output, previous_rows, previous_changed, in_place):
+        """
+        Renders an iteration of watch. The rows of output that differ from
+        previous_rows, the plain rows of the previous iteration, get their changed
+        cells highlighted. When in_place the previous iteration, with as many rows,
+        is still on screen and only changed rows, and the ones highlighted last
+        time, are redrawn.
+
+        Returns (text to print, plain rows, indexes of changed rows).
+        """
+        rows = output.split("\n")
+        plain_rows = [_WATCH_ESCAPE_RE.sub("", row) for row in rows]
+        changed = set()
+        display = []
+
+        for i, (row, plain_row) in enumerate(zip(rows, plain_rows)):
+            if previous_rows is None:
+                display.append(row)
+                continue
+
+            previous = previous_rows[i] if i < len(previous_rows) else ""
 
-            yield val
+            if plain_row == previous:
+                if in_place and i not in previous_changed:
+                    # Still on screen, move on to the next row.
+                    display.append(None)
+                else:
+                    display.append(row)
+
+                continue
+
+            changed.add(i)
+            cells = CliView._watch_changed_cells(previous, plain_row)
+            display.append(CliView._watch_highlight(row, cells))
+
+        if not in_place:
+            return "\n".join(display), plain_rows, changed
+
+        text = []
+
+        for row in display:
+            if row is None:
+                text.append("\n")
+            else:
+                text.append("\r\033[2K" + row + "\n")
+
+        return "".join(text), plain_rows, changed
 
     @staticmethod
-    async def watch(ctrl, line):
+    async def watch(ctrl, line, refresh: Optional[Callable[[], None]] = None):
+        """
+        Executes the command in line every sleep seconds. Iterations start at a
+        fixed rate, iterations that would start while the previous one is still
+        running are skipped. Cells that changed since the previous iteration are
+        highlighted and, on a terminal that fits the output, only the changed rows
+        are redrawn.
+
+        refresh, if given, is called before every iteration but the first so that
+        each iteration shows newly fetched data.
+        """
         diff_highlight = True
         sleep = 2.0
         num_iterations = False
@@ -1211,103 +1396,115 @@ class CliView(object):
             diff_highlight = False
 
         real_stdout = sys.stdout
+        redraw_in_place = diff_highlight and real_stdout.isatty()
+        command = " ".join(line)
+        loop = asyncio.get_event_loop()
+        task = asyncio.current_task()
+        interrupted = False
+
+        # asyncio.sleep does not raise KeyboardInterrupt in this coroutine as
+        # time.sleep does. Ctrl-C cancels this task instead.
+        def interrupt():
+            nonlocal interrupted
+            interrupted = True
+            task.cancel()
+
+        try:
+            loop.add_signal_handler(signal.SIGINT, interrupt)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        log_records = _LogRecordCounter()
+        CliView.logger.addHandler(log_records)
 
         try:
-            sys.stdout = mystdout = StringIO()
-            previous = None
+            previous_rows = None
+            previous_changed = set()
+            next_tick = loop.time()
             count = 1
 
             while True:
-                highlight = False
-                await ctrl.execute(line[:])
-                output = mystdout.getvalue()
-                mystdout.truncate(0)
-                mystdout.seek(0)
-
-                if previous and diff_highlight:
-                    result = []
-                    prev_iterator = CliView.group_output(previous)
-                    next_peeked = []
-                    next_iterator = CliView.group_output(output)
-                    next_iterator = CliView.peekable(next_peeked, next_iterator)
-
-                    for prev_group in prev_iterator:
-                        if "\033" in prev_group:
-                            # skip prev escape seq
-                            continue
-
-                        for next_group in next_iterator:
-                            if "\033" in next_group:
-                                # add current escape seq
-                                result += next_group
-                                continue
-                            elif next_group == "\n":
-                                if prev_group != "\n":
-                                    next_peeked.append(next_group)
-                                    break
-                                if highlight:
-                                    result += terminal.uninverse()
-                                    highlight = False
-                            elif prev_group == next_group:
-                                if highlight:
-                                    result += terminal.uninverse()
-                                    highlight = False
-                            else:
-                                if not highlight:
-                                    result += terminal.inverse()
-                                    highlight = True
-
-                            result += next_group
-
-                            if "\n" == prev_group and "\n" != next_group:
-                                continue
-                            break
-
-                    for next_group in next_iterator:
-                        if next_group == " " or next_group == "\n":
-                            if highlight:
-                                result += terminal.uninverse()
-                                highlight = False
-                        else:
-                            if not highlight:
-                                result += terminal.inverse()
-                                highlight = True
-
-                        result += next_group
-
-                    if highlight:
-                        result += terminal.reset()
-                        highlight = False
-
-                    result = "".join(result)
-                    previous = output
+                if refresh and count > 1:
+                    refresh()
+
+                output = StringIO()
+                log_records.count = 0
+
+                with redirect_stdout(output):
+                    await ctrl.execute(line[:])
+
+                output = output.getvalue()
+                size = get_terminal_size()
+                in_place = (
+                    redraw_in_place
+                    and not log_records.count
+                    and previous_rows is not None
+                    and len(previous_rows) == output.count("\n") + 1
+                    and len(previous_rows) + 1 < size.lines
+                    and max(len(row) for row in previous_rows) < size.columns
+                )
+
+                if diff_highlight:
+                    result, previous_rows, previous_changed = CliView._watch_render(
+                        output, previous_rows, previous_changed, in_place
+                    )
                 else:
                     result = output
-                    previous = output
 
-                ts = time.time()
-                st = datetime.datetime.fromtimestamp(ts).strftime(" %Y-%m-%d %H:%M:%S")
-                command = " ".join(line)
-                print(
-                    "[%s '%s' sleep: %ss iteration: %s" % (st, command, sleep, count),
-                    end=" ",
-                    file=real_stdout,
+                st = datetime.datetime.fromtimestamp(time.time()).strftime(
+                    " %Y-%m-%d %H:%M:%S"
+                )
+                header = "[%s '%s' sleep: %ss iteration: %s" % (
+                    st,
+                    command,
+                    sleep,
+                    count,
                 )
+
                 if num_iterations:
-                    print(" of %s" % (num_iterations), end=" ", file=real_stdout)
-                print("]", file=real_stdout)
-                print(result, file=real_stdout)
+                    header += "  of %s" % (num_iterations)
+
+                header += " ]"
+
+                if in_place:
+                    # Back to the header of the previous iteration.
+                    real_stdout.write(
+                        "\033[%dA\r\033[2K%s\n%s"
+                        % (len(previous_rows) + 1, header, result)
+                    )
+                    real_stdout.flush()
+                else:
+                    print(header, file=real_stdout)
+                    print(result, file=real_stdout)
 
                 if num_iterations and num_iterations <= count:
                     break
 
                 count += 1
-                time.sleep(sleep)
+                next_tick += sleep
+                now = loop.time()
+
+                if next_tick < now and sleep > 0:
+                    # Skip the ticks missed while the command was running.
+                    next_tick += math.ceil((now - next_tick) / sleep) * sleep
+
+                await asyncio.sleep(max(0, next_tick - now))
 
         except (KeyboardInterrupt, SystemExit):
+            return
+        except asyncio.CancelledError:
+            if not interrupted:
+                raise
+
             return
         finally:
-            sys.stdout = real_stdout
+            CliView.logger.removeHandler(log_records)
+
+            try:
+                loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+
             print("")
 
     @staticmethod
@@ -1406,6 +1603,32 @@ class CliView(object):
         )
         print(s)
 
+    @staticmethod
+    def _print_assert_changes(ho):
+        changes = ho.get(health_constants.HealthResultType.ASSERT_CHANGES)
+
+        if not changes:
+            return
+
+        states = {True: "PASS", False: "FAIL", None: "SKIP"}
+        s = (
+            "\n"
+            + terminal.bold()
+            + "Changed Since Last Run".center(H_width, "_")
+            + terminal.unbold()
+        )
+
+        for change in changes:
+            assert_result = change["assert"]
+            s += CliView._get_header(
+                "%s -> %s" % (states[change["previous"]], states[change["current"]])
+            ) + CliView._get_msg(
+                [assert_result[health_constants.AssertResultKey.FAIL_MSG]],
+                level=assert_result[health_constants.AssertResultKey.LEVEL],
+            )
+
+        print(s)
+
     @staticmethod
     def _print_debug_messages(ho):
         try:
@@ -1825,13 +2048,14 @@ class CliView(object):
         if not ho:
             return
         o_s = None
+        stdout = sys.stdout
 
         if output_file is not None:
             try:
                 o_s = open(output_file, "a")
                 sys.stdout = o_s
             except Exception:
-                sys.stdout = sys.__stdout__
+                sys.stdout = stdout
 
         CliView._print_debug_messages(ho)
         if debug:
@@ -1840,6 +2064,7 @@ class CliView(object):
         CliView._print_status(
             ho[health_constants.HealthResultType.STATUS_COUNTERS], verbose=verbose
         )
+        CliView._print_assert_changes(ho)
         CliView._print_assert_summary(
             ho[health_constants.HealthResultType.ASSERT],
             verbose=verbose,
@@ -1849,7 +2074,7 @@ class CliView(object):
 
         if o_s:
             o_s.close()
-        sys.stdout = sys.__stdout__
+        sys.stdout = stdout
 
     ###########################
 
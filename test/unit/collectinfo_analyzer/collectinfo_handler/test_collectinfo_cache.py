@@ -0,0 +1,135 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from lib.collectinfo_analyzer.collectinfo_handler import collectinfo_cache
+from lib.collectinfo_analyzer.collectinfo_handler.collectinfo_cache import (
+    CollectinfoCache,
+)
+from lib.utils import lazy_json
+
+
+class CollectinfoCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = CollectinfoCache(os.path.join(self.dir, "cache"), max_files=2)
+        self.data = {
+            "2021-01-01 00:00:00 UTC": {
+                "null": {
+                    "1.1.1.1:3000": {
+                        "as_stat": {
+                            "statistics": {
+                                "namespace": {
+                                    "test": {
+                                        "service": {"objects": "1", "a": None},
+                                        "set": {
+                                            "s1": {"objects": "1", "x": 1.5},
+                                            "s2": {"objects": "2"},
+                                        },
+                                    },
+                                    "bar": {"service": {"objects": "3"}},
+                                },
+                                "service": {"cluster_size": 1},
+                            },
+                            "meta_data": {"node_id": "A"},
+                        },
+                        "sys_stat": {"uname": {"nodename": "n1"}, "hosts": ["a"]},
+                    },
+                }
+            },
+        }
+        self.license = {"license_usage": {"count": 1}}
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_columnar_round_trip(self):
+        table = {"s1": {"a": 1, "b": "2"}, "s2": {"b": None}}
+        columnar = collectinfo_cache._to_columnar(table)
+
+        self.assertEqual(columnar, (["s1", "s2"], {"a": ([0], [1]), "b": ["2", None]}))
+        self.assertEqual(collectinfo_cache._from_columnar(columnar), table)
+
+    def test_store_and_load(self):
+        self.cache.store("key", self.data, self.license)
+        data, license_data_usage = self.cache.load("key")
+
+        self.assertEqual(data, self.data)
+        self.assertEqual(license_data_usage, self.license)
+
+    def test_load_is_lazy(self):
+        self.cache.store("key", self.data, self.license)
+        data, _ = self.cache.load("key")
+        as_stat = data["2021-01-01 00:00:00 UTC"]["null"]["1.1.1.1:3000"]["as_stat"]
+
+        self.assertIsInstance(as_stat, lazy_json.LazyJSONObject)
+        self.assertEqual(as_stat["meta_data"], {"node_id": "A"})
+        self.assertFalse(as_stat.is_loaded("statistics"))
+
+    def test_load_returns_none_when_missing_or_incompatible(self):
+        self.assertIsNone(self.cache.load("key"))
+
+        self.cache.store("key", self.data, self.license)
+        collectinfo_cache.CACHE_VERSION += 1
+
+        try:
+            self.assertIsNone(self.cache.load("key"))
+        finally:
+            collectinfo_cache.CACHE_VERSION -= 1
+
+    def test_store_does_not_keep_lazy_sections(self):
+        path = os.path.join(self.dir, "ascinfo.json")
+
+        with open(path, "w") as f:
+            json.dump(self.data, f)
+
+        data = lazy_json.load(path, depth=5)
+        self.cache.store("key", data, self.license)
+        as_stat = data["2021-01-01 00:00:00 UTC"]["null"]["1.1.1.1:3000"]["as_stat"]
+
+        self.assertFalse(as_stat.is_loaded("statistics"))
+        self.assertEqual(self.cache.load("key")[0], self.data)
+
+    def test_store_evicts_oldest(self):
+        for i, key in enumerate(["a", "b", "c"]):
+            self.cache.store(key, self.data, self.license)
+            os.utime(self.cache._path(key), (i, i))
+
+        self.assertEqual(
+            sorted(os.listdir(self.cache.cache_dir)), ["b.cache", "c.cache"]
+        )
+
+    def test_key_changes_with_content(self):
+        path = os.path.join(self.dir, "ascinfo.json")
+
+        with open(path, "w") as f:
+            f.write("{}")
+
+        key = self.cache.key(path)
+
+        self.assertEqual(key, self.cache.key(path))
+
+        with open(path, "w") as f:
+            f.write("{ }")
+
+        self.assertNotEqual(key, self.cache.key(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
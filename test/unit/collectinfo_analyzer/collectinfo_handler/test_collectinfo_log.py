@@ -0,0 +1,71 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import unittest
+
+from lib.collectinfo_analyzer.collectinfo_handler.collectinfo_log import (
+    CollectinfoLog,
+)
+from lib.utils.util import FrozenDict
+
+from test.unit.collectinfo_analyzer.util import create_collectinfo_data
+
+
+class CollectinfoSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        data = create_collectinfo_data(num_nodes=2, num_stats=3)
+        timestamp = list(data.keys())[0]
+        nodes = data[timestamp]["c1"]
+        node = list(nodes.keys())[0]
+        namespaces = nodes[node]["as_stat"]["statistics"]["namespace"]
+        namespaces["bad ns"] = {"service": {}}
+        namespaces["ns0"]["set"]["bad set"] = {"objects": "1"}
+        self.node = node
+        self.snapshot = CollectinfoLog("", [], data, {}).snapshots[timestamp]
+
+    def test_get_data_shares_read_only_sections(self):
+        stats = self.snapshot.get_statistics(stanza="namespace")
+        ns0 = stats[self.node]["ns0"]
+
+        self.assertIsInstance(ns0, FrozenDict)
+        self.assertIs(
+            self.snapshot.get_statistics(stanza="namespace")[self.node]["ns0"], ns0
+        )
+        self.assertRaises(TypeError, ns0.__setitem__, "stat_0", "1")
+        self.assertRaises(TypeError, ns0.pop, "stat_0")
+
+        stats_copy = copy.deepcopy(stats)
+        stats_copy[self.node]["ns0"]["stat_0"] = "changed"
+
+        self.assertEqual(ns0["stat_0"], "0")
+
+    def test_get_data_returns_new_outer_dicts(self):
+        stats = self.snapshot.get_statistics(stanza="namespace")
+        del stats[self.node]
+
+        self.assertIn(self.node, self.snapshot.get_statistics(stanza="namespace"))
+
+    def test_get_data_drops_names_with_spaces(self):
+        self.assertNotIn(
+            "bad ns", self.snapshot.get_statistics(stanza="namespace")[self.node]
+        )
+        self.assertNotIn(
+            "ns0 bad set", self.snapshot.get_statistics(stanza="set")[self.node]
+        )
+        self.assertIn("ns0 set0", self.snapshot.get_statistics(stanza="set")[self.node])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks summary and health against a synthetic 100 node collectinfo. Set
+ASADM_BENCHMARK=1 to run them, e.g.
+
+    ASADM_BENCHMARK=1 python -m unittest test.unit.collectinfo_analyzer.test_collectinfo_benchmark
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import unittest
+from mock import patch
+import warnings
+
+from lib.collectinfo_analyzer.collectinfo_command_controller import (
+    CollectinfoCommandController,
+)
+from lib.collectinfo_analyzer.collectinfo_handler import log_handler
+from lib.collectinfo_analyzer.health_check_controller import HealthCheckController
+from lib.collectinfo_analyzer.summary_controller import SummaryController
+
+from test.unit.collectinfo_analyzer.util import create_collectinfo_data
+
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    import asynctest
+
+NUM_NODES = 100
+RUNS = 1
+
+
+@unittest.skipUnless(os.environ.get("ASADM_BENCHMARK"), "ASADM_BENCHMARK not set")
+class CollectinfoBenchmark(asynctest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        cinfo_dir = os.path.join(self.dir, "collectinfo")
+        os.makedirs(cinfo_dir)
+
+        with open(os.path.join(cinfo_dir, "20210101_000000_ascinfo.json"), "w") as f:
+            json.dump(
+                create_collectinfo_data(
+                    num_nodes=NUM_NODES, num_namespaces=4, num_sets=10, num_stats=100
+                ),
+                f,
+            )
+
+        patch(
+            "lib.collectinfo_analyzer.collectinfo_handler.log_handler.COLLECTINFO_DIR",
+            os.path.join(self.dir, "extracted/"),
+        ).start()
+        patch(
+            "lib.collectinfo_analyzer.collectinfo_handler.log_handler.COLLECTINFO_CACHE_DIR",
+            os.path.join(self.dir, "cache/"),
+        ).start()
+        self.view_mock = patch("lib.base_controller.BaseController.view").start()
+        self.log_handler = log_handler.CollectinfoLogHandler(cinfo_dir)
+        CollectinfoCommandController.log_handler = self.log_handler
+        HealthCheckController.health_check_input_created = False
+
+    def tearDown(self):
+        self.log_handler.close()
+        patch.stopall()
+        shutil.rmtree(self.dir)
+
+    async def _measure(self, name, controller, line):
+        tracemalloc.start()
+        start = time.perf_counter()
+
+        try:
+            for _ in range(RUNS):
+                HealthCheckController.health_check_input_created = False
+                await controller.execute(line[:])
+        finally:
+            elapsed = (time.perf_counter() - start) / RUNS
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        sys.stderr.write(
+            "\n%s on %s nodes: %.3fs per run, peak memory %.1f MiB\n"
+            % (name, NUM_NODES, elapsed, peak / 1024 / 1024)
+        )
+
+    async def test_summary(self):
+        await self._measure("summary", SummaryController(), [])
+        self.view_mock.print_summary.assert_called()
+
+    async def test_health(self):
+        await self._measure("health", HealthCheckController(), [])
+        self.view_mock.print_health_output.assert_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+def create_collectinfo_data(
+    num_nodes=3,
+    num_namespaces=2,
+    num_sets=4,
+    num_stats=50,
+    timestamp="2021-01-01 00:00:00 UTC",
+):
+    """
+    Returns synthetic ascinfo.json data: {timestamp: {cluster: {node: {...}}}}
+    """
+    nodes = {}
+
+    for n in range(num_nodes):
+        ip = "10.0.%d.%d:3000" % (n // 256, n % 256)
+        namespaces = {}
+
+        for ns in range(num_namespaces):
+            namespaces["ns%d" % ns] = {
+                "service": {
+                    "memory-size": "1073741824",
+                    "memory_used_bytes": "1048576",
+                    **{"stat_%d" % i: str(i * n) for i in range(num_stats)},
+                },
+                "set": {
+                    "set%d" % s: {"objects": str(s), "memory_data_bytes": "1024"}
+                    for s in range(num_sets)
+                },
+                "sindex": {
+                    "idx%d" % ns: {"set": "set0", "bin": "bin", "type": "NUMERIC"}
+                },
+                "bin": {"bin_names": "1", "bin_names_quota": "65535"},
+            }
+
+        nodes[ip] = {
+            "as_stat": {
+                "meta_data": {
+                    "node_id": "BB9%03X" % n,
+                    "ip": ip,
+                    "asd_build": "6.0.0.0",
+                    "edition": "Aerospike Enterprise Edition",
+                },
+                "statistics": {
+                    "service": {
+                        "cluster_size": str(num_nodes),
+                        "cluster_principal": "BB9000",
+                        **{"stat_%d" % i: str(i) for i in range(num_stats)},
+                    },
+                    "namespace": namespaces,
+                },
+                "config": {
+                    "service": {"proto-fd-max": "15000", "cluster-name": "c1"},
+                    "namespace": {
+                        ns: {"service": {"replication-factor": "2"}}
+                        for ns in namespaces
+                    },
+                },
+            },
+            "sys_stat": {
+                "uname": {"nodename": "node%d" % n, "kernel_release": "5.4.0"},
+                "lsb": {"description": "Ubuntu 20.04"},
+            },
+        }
+
+    return {timestamp: {"c1": nodes}}
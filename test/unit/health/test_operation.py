@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import unittest
 
 from lib.health import operation
@@ -295,3 +296,241 @@ class OperationTest(unittest.TestCase):
             expected,
             "AssertDetailOperation.operate did not return the expected result",
         )
+
+
+SELECT_DATA = {
+    "SNAPSHOT000": {
+        "NAMESPACE": {
+            "CONFIG": {
+                ("C1", "CLUSTER"): {
+                    ("N1", "NODE"): {
+                        ("NS1", "NAMESPACE"): {
+                            ("CONFIG1", "KEY"): 2,
+                            ("CONFIG2", "KEY"): "abcd",
+                            ("SET1", "SET"): {("CONFIG1", "KEY"): 3},
+                        },
+                        ("NS2", "NAMESPACE"): {("CONFIG3", "KEY"): [1, 2]},
+                    },
+                    ("N2", "NODE"): {
+                        ("NS1", "NAMESPACE"): {("CONFIG1", "KEY"): 4},
+                        ("NS2", "NAMESPACE"): {},
+                    },
+                }
+            },
+            "STATISTICS": {
+                ("C1", "CLUSTER"): {
+                    ("N1", "NODE"): {("NS1", "NAMESPACE"): {("CONFIG1", "KEY"): 5}}
+                }
+            },
+        },
+        "SERVICE": {
+            "CONFIG": {("C1", "CLUSTER"): {("N1", "NODE"): {("CONFIG2", "KEY"): 888}}}
+        },
+    },
+    "SNAPSHOT001": {
+        "SERVICE": {
+            "CONFIG": {("C1", "CLUSTER"): {("N1", "NODE"): {("CONFIG2", "KEY"): 999}}}
+        },
+    },
+}
+
+
+class SelectIndexTest(unittest.TestCase):
+    def test_select_matches_select_keys_from_dict(self):
+        index = operation.SelectIndex()
+        selects = [
+            dict(keys=[(False, "CONFIG1", None)], from_keys=["SNAPSHOT000"]),
+            dict(
+                keys=[(False, "CONFIG1", "C1"), (True, "^CONF.*$", None)],
+                from_keys=["SNAPSHOT000", "NAMESPACE", "CONFIG"],
+                save_param="",
+                config_param=True,
+            ),
+            dict(
+                keys=[(False, "*", None)],
+                from_keys=["ALL", "SERVICE"],
+                ignore_keys=[(True, "^CONFIG1$")],
+                save_param="saved",
+            ),
+            dict(keys=[(False, "CONFIG2", None)], from_keys=["ALL"]),
+            dict(keys=[(False, "CONFIG4", None)], from_keys=["SNAPSHOT001"]),
+            dict(keys=[(False, "CONFIG1", None)], from_keys=["STATISTICS"]),
+        ]
+
+        for kwargs in selects:
+            expected = operation.select_keys_from_dict(SELECT_DATA, **kwargs)
+            result = index.select(SELECT_DATA, **kwargs)
+
+            if isinstance(result, operation.HealthVector):
+                result = result.to_dict()
+
+            self.assertEqual(result, expected)
+            self.assertEqual(list(result.items()), list(expected.items()))
+
+    def test_select_reuses_results(self):
+        index = operation.SelectIndex()
+        keys = [(False, "CONFIG1", None)]
+        result = index.select(SELECT_DATA, keys=keys, from_keys=["SNAPSHOT000"])
+
+        self.assertIs(
+            index.select(SELECT_DATA, keys=list(keys), from_keys=["SNAPSHOT000"]),
+            result,
+        )
+        self.assertIsNot(
+            index.select(dict(SELECT_DATA), keys=keys, from_keys=["SNAPSHOT000"]),
+            result,
+        )
+
+    def test_select_raises_like_select_keys_from_dict(self):
+        index = operation.SelectIndex()
+        data = {"SNAPSHOT000": {"SERVICE": {}}}
+
+        self.assertRaises(
+            operation.HealthException,
+            index.select,
+            data,
+            keys=[(False, "CONFIG1", None)],
+            from_keys=["SNAPSHOT000", "SERVICE"],
+        )
+        self.assertRaises(operation.HealthException, index.select, SELECT_DATA, keys=[])
+
+
+VECTOR_DATA = {
+    ("C1", "CLUSTER"): {
+        node: {
+            ns: {("objects", "KEY"): (value, [("objects", value, True)] if i else [])}
+            for ns, value in ((("NS2", "NAMESPACE"), 10 * i), (("NS1", "NAMESPACE"), i))
+        }
+        for i, node in enumerate(
+            [("N3", "NODE"), ("N1", "NODE"), ("N2", "NODE"), ("N4", "NODE")]
+        )
+    }
+}
+
+
+class HealthVectorTest(unittest.TestCase):
+    def setUp(self):
+        self.vector = operation.HealthVector.from_dict(VECTOR_DATA)
+
+    def assertOrderedEqual(self, result, expected):
+        if isinstance(result, operation.HealthVector):
+            result = result.to_dict()
+
+        self.assertEqual(result, expected)
+
+        if isinstance(expected, dict):
+            self.assertEqual(list(result), list(expected))
+
+            for _key in expected:
+                self.assertOrderedEqual(result[_key], expected[_key])
+
+    def test_from_dict(self):
+        self.assertEqual(len(self.vector), 8)
+        self.assertOrderedEqual(self.vector, VECTOR_DATA)
+        self.assertIs(copy.deepcopy(self.vector), self.vector)
+
+        for data in (
+            {},
+            {("C1", "CLUSTER"): {}},
+            {"C1": {("objects", "KEY"): (1, [])}},
+            {("objects", "KEY"): ([1], [])},
+            {("objects", "KEY"): (1, None)},
+        ):
+            self.assertIsNone(operation.HealthVector.from_dict(data))
+
+    def test_binary_operation(self):
+        maximum = operation.AggOperation("MAX").operate(self.vector)
+        cases = [
+            ("*", self.vector, (3, [("x", 1, True)])),
+            (">", (15, []), self.vector),
+            ("/", self.vector, (0, [])),
+            ("/", (30, []), self.vector),
+            ("-", self.vector, operation.HealthVector.from_dict(VECTOR_DATA)),
+            ("==", self.vector, ("abc", [])),
+            ("<", self.vector, maximum),
+            (">=", maximum, self.vector),
+        ]
+
+        for op, arg1, arg2 in cases:
+            result = operation.BinaryOperation(op).operate(
+                arg1, arg2, save_param="saved"
+            )
+            expected = operation.BinaryOperation(op).operate(
+                operation._to_dict(arg1), operation._to_dict(arg2), save_param="saved"
+            )
+
+            self.assertIsInstance(result, operation.HealthVector)
+            self.assertEqual(result, expected)
+
+    def test_aggregation_and_complex_operations(self):
+        for op, group_by in (
+            (operation.AggOperation("MAX"), None),
+            (operation.AggOperation("+"), ["CLUSTER", "NAMESPACE"]),
+            (operation.AggOperation("AVG"), ["NODE"]),
+            (operation.AggOperation("COUNT"), ["CLUSTER", "NODE"]),
+            (operation.AggOperation("=="), ["CLUSTER", "NAMESPACE"]),
+            (operation.ComplexOperation("SD_ANOMALY"), ["CLUSTER", "NAMESPACE"]),
+            (operation.ComplexOperation("NO_MATCH"), ["CLUSTER", "NAMESPACE"]),
+        ):
+            kwargs = dict(
+                result_comp_op="==", result_comp_val=(1, []), save_param="saved"
+            )
+            result = op.operate(self.vector, group_by=group_by, **kwargs)
+            expected = op.operate(
+                copy.deepcopy(VECTOR_DATA), group_by=copy.copy(group_by), **kwargs
+            )
+
+            self.assertIsInstance(result, operation.HealthVector)
+            self.assertOrderedEqual(result, expected)
+
+    def test_sd_anomaly(self):
+        data = copy.deepcopy(VECTOR_DATA)
+        data[("C1", "CLUSTER")][("N1", "NODE")][("NS1", "NAMESPACE")][
+            ("objects", "KEY")
+        ] = (1000, [("objects", 1000, True)])
+        result = operation.ComplexOperation("SD_ANOMALY").operate(
+            operation.HealthVector.from_dict(data),
+            group_by=["CLUSTER", "NAMESPACE"],
+            result_comp_op="==",
+            result_comp_val=(1.5, []),
+        )
+
+        self.assertOrderedEqual(
+            result,
+            {
+                ("C1", "CLUSTER"): {
+                    ("NS2", "NAMESPACE"): (False, []),
+                    ("NS1", "NAMESPACE"): (True, [("N1/objects", 1000, True)]),
+                }
+            },
+        )
+
+    def test_group_by_and_assert(self):
+        for group_by in (["NODE"], ["CLUSTER", "NAMESPACE"], ["KEY", "NODE"]):
+            self.assertOrderedEqual(
+                operation.do_multiple_group_by(self.vector, group_by),
+                operation.do_multiple_group_by(
+                    copy.deepcopy(VECTOR_DATA), copy.copy(group_by)
+                ),
+            )
+
+        self.assertEqual(
+            operation.find_kv_vector(operation.NOKEY, self.vector, recurse=True),
+            operation.find_kv_vector(operation.NOKEY, VECTOR_DATA, recurse=True),
+        )
+
+        op = operation.AssertDetailOperation("==")
+        data = operation.BinaryOperation(">").operate(self.vector, (2, []))
+
+        self.assertEqual(
+            op.operate(data, (False, []), "error", "OPERATIONS", 1),
+            op.operate(data.to_dict(), (False, []), "error", "OPERATIONS", 1),
+        )
+
+    def test_unsupported_grouping_uses_dict_form(self):
+        self.assertRaises(
+            operation.HealthException,
+            operation.AggOperation("MAX").operate,
+            self.vector,
+            group_by=["RACK"],
+        )
@@ -0,0 +1,480 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import marshal
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from mock import patch
+
+from lib.health import health_checker
+from lib.health.constants import AssertResultKey, HealthResultType
+from lib.health.exceptions import SyntaxException
+from lib.health.health_checker import HealthChecker
+from lib.health.parser import HealthParser
+
+DATA = {
+    "SNAPSHOT000": {
+        "SERVICE": {
+            "STATISTICS": {
+                ("C1", "CLUSTER"): {
+                    ("n1", "NODE"): {("uptime", "KEY"): 10, ("objects", "KEY"): 4},
+                    ("n2", "NODE"): {("uptime", "KEY"): 20, ("objects", "KEY"): 4},
+                }
+            }
+        }
+    }
+}
+
+QUERIES = [
+    's = select "uptime" from SERVICE.STATISTICS',
+    "t = do s > 15",
+    "m = do MAX(s)",
+    "g = group by CLUSTER t",
+    "s",
+    "u = do t && undefined",
+    'ASSERT(t, False, "error", "OPERATIONS", WARNING, "desc", "ok", s, > 5)',
+    'ASSERT(t, False, "error", "OPERATIONS", CRITICAL)',
+    'ASSERT(t, False "error")',
+    "x y",
+    "undefined",
+    "@",
+]
+
+
+class HealthParserTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = HealthParser()
+        self.parser.build()
+        self.parser.clear_health_cache()
+        self.parser.set_health_data(DATA)
+
+    def tearDown(self):
+        self.parser.clear_health_cache()
+
+    def _execute(self, execute):
+        results = []
+
+        for query in QUERIES:
+            try:
+                results.append(("result", execute(query)))
+            except Exception as e:
+                results.append((type(e), str(e)))
+
+        self.parser.clear_health_cache()
+        return results
+
+    def test_compiled_plans_match_parsing(self):
+        expected = self._execute(self.parser.parse)
+        plans = {}
+
+        for query in QUERIES:
+            try:
+                plans[query] = marshal.loads(
+                    marshal.dumps(self.parser.compile(query, resolve_vars=False))
+                )
+            except Exception:
+                plans[query] = None
+
+        self.assertEqual(plans["x y"], None)
+        self.assertEqual(
+            self._execute(lambda q: self.parser.execute(q, plans[q])), expected
+        )
+        self.assertEqual(expected[3][0], "result")
+        self.assertEqual(expected[5][0], SyntaxException)
+        self.assertEqual(
+            expected[10], (SyntaxException, "Syntax error : Insufficient tokens")
+        )
+
+    def test_execute_does_not_parse_compiled_plans(self):
+        plans = [self.parser.compile(q, resolve_vars=False) for q in QUERIES[:4]]
+
+        with patch.object(self.parser, "compile") as compile_mock:
+            for query, plan in zip(QUERIES[:4], plans):
+                self.parser.execute(query, plan)
+
+            compile_mock.assert_not_called()
+
+
+class HealthCheckerQueryPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.query_file = os.path.join(self.dir, "queries.hql")
+
+        with open(self.query_file, "w") as f:
+            f.write(";\n".join(QUERIES) + ";\n")
+
+        patch.object(health_checker, "QUERY_PLAN_CACHE_DIR", self.dir).start()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.dir)
+
+    def _execute(self):
+        checker = HealthChecker()
+        checker.set_health_input_data(DATA)
+        return checker.execute(query_file=self.query_file)
+
+    def test_query_plans_are_cached_on_disk(self):
+        expected = self._execute()
+        plan_files = [f for f in os.listdir(self.dir) if f.endswith(".plan")]
+
+        self.assertEqual(len(plan_files), 1)
+
+        with patch.object(HealthChecker, "_compile_query") as compile_mock:
+            self.assertEqual(self._execute(), expected)
+            compile_mock.assert_not_called()
+
+    def test_query_plans_are_keyed_by_version(self):
+        self._execute()
+
+        with patch.object(HealthChecker, "_compile_query") as compile_mock:
+            checker = HealthChecker()
+            checker.asadm_version = "9.9.9"
+            checker.set_health_input_data(DATA)
+            checker.execute(query_file=self.query_file)
+
+            compile_mock.assert_called()
+
+
+class HealthCheckerVersionFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "SNAPSHOT000": {
+                "METADATA": {
+                    "CLUSTER": {
+                        ("C1", "CLUSTER"): {
+                            ("n1", "NODE"): {("version", "KEY"): "5.0.0"},
+                            ("n2", "NODE"): {("version", "KEY"): "6.0.0"},
+                        }
+                    }
+                },
+                "SERVICE": DATA["SNAPSHOT000"]["SERVICE"],
+            }
+        }
+        self.checker = HealthChecker()
+        self.checker.set_health_input_data(self.data)
+
+    def test_filter_health_input_data(self):
+        line = "SET CONSTRAINT VERSION >= 6.0"
+        self.checker._filter_and_set_health_input_data(line)
+        filtered = self.checker.health_parser.health_input_data
+        statistics = filtered["SNAPSHOT000"]["SERVICE"]["STATISTICS"]
+
+        self.assertEqual(list(statistics[("C1", "CLUSTER")]), [("n2", "NODE")])
+        self.assertIs(
+            statistics[("C1", "CLUSTER")][("n2", "NODE")],
+            DATA["SNAPSHOT000"]["SERVICE"]["STATISTICS"][("C1", "CLUSTER")][
+                ("n2", "NODE")
+            ],
+        )
+        self.assertEqual(
+            list(DATA["SNAPSHOT000"]["SERVICE"]["STATISTICS"][("C1", "CLUSTER")]),
+            [("n1", "NODE"), ("n2", "NODE")],
+        )
+
+        self.checker._filter_and_set_health_input_data(line)
+        self.assertIs(self.checker.health_parser.health_input_data, filtered)
+
+        self.checker.set_health_input_data(self.data)
+        self.checker._filter_and_set_health_input_data(line)
+        self.assertIsNot(self.checker.health_parser.health_input_data, filtered)
+
+
+class HealthCheckerParallelTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.query_file = os.path.join(self.dir, "queries.hql")
+        queries = QUERIES + [
+            "SET CONSTRAINT VERSION ALL",
+            's = select "objects" from SERVICE.STATISTICS',
+            'ASSERT(s, 4, "objects", "OPERATIONS", WARNING)',
+            "m",
+            "exit",
+            "s",
+        ]
+
+        with open(self.query_file, "w") as f:
+            f.write(";\n".join(queries) + ";\n")
+
+        patch.object(health_checker, "QUERY_PLAN_CACHE_DIR", self.dir).start()
+        patch.object(HealthChecker, "_is_parallel_input", return_value=True).start()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.dir)
+
+    def _execute(self, max_workers):
+        checker = HealthChecker()
+        checker.max_workers = max_workers
+        checker.set_health_input_data(DATA)
+        return checker.execute(query_file=self.query_file)
+
+    def test_parallel_execution_matches_serial(self):
+        execute_in_parallel = HealthChecker._execute_queries_in_parallel
+        outcomes = []
+
+        def record_outcomes(checker, *args):
+            outcomes.append(execute_in_parallel(checker, *args))
+            return outcomes[-1]
+
+        with patch.object(
+            HealthChecker,
+            "_execute_queries_in_parallel",
+            side_effect=record_outcomes,
+            autospec=True,
+        ):
+            result = self._execute(2)
+
+        self.assertIsNotNone(outcomes[0])
+        self.assertEqual(result, self._execute(1))
+
+    def test_get_query_groups(self):
+        checker = HealthChecker()
+        checker.set_health_input_data(DATA)
+        queries = [
+            's = select "uptime" from SERVICE.STATISTICS',
+            "t = do s > 15",
+            's = select "objects" from SERVICE.STATISTICS',
+            "u = do s + 1",
+            "x y",
+            "t",
+        ]
+        plans = checker._get_query_plans(queries)
+        groups = checker._get_query_groups(queries, plans)
+
+        self.assertEqual(
+            sorted([q[0] for q in group] for group in groups),
+            [[0, 1, 5], [2, 3], [4]],
+        )
+        # s is reassigned in another group.
+        self.assertEqual([q[4] for q in groups[1]], ["s", None])
+
+    def test_parallel_execution_needs_fork(self):
+        checker = HealthChecker()
+        checker.max_workers = 2
+        checker.set_health_input_data(DATA)
+        queries = ['s = select "uptime" from SERVICE.STATISTICS', "x y"]
+        plans = checker._get_query_plans(queries)
+
+        with patch.object(
+            health_checker.multiprocessing, "get_start_method", return_value="spawn"
+        ):
+            self.assertIsNone(checker._execute_queries_in_parallel(queries, plans))
+
+        with patch.object(health_checker.threading, "active_count", return_value=2):
+            self.assertIsNone(checker._execute_queries_in_parallel(queries, plans))
+
+    def test_reassignment_across_groups_is_executed_serially(self):
+        checker = HealthChecker()
+        checker.max_workers = 2
+        checker.set_health_input_data(DATA)
+
+        with patch.object(checker, "_execute_query_group", side_effect=Exception()):
+            queries = ['s = select "uptime" from SERVICE.STATISTICS', "t = do s > 15"]
+            self.assertIsNone(
+                checker._execute_queries_in_parallel(
+                    queries, checker._get_query_plans(queries)
+                )
+            )
+
+
+class HealthCheckerCollectinfoParallelTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.query_file = os.path.join(self.dir, "queries.hql")
+        nodes = [
+            ("n%d" % i, "NODE")
+            for i in range(health_checker.PARALLEL_QUERIES_MIN_NODES)
+        ]
+
+        # Health input of a collectinfo from as many nodes as needed to fork.
+        self.data = {
+            "SNAPSHOT000": {
+                "METADATA": {
+                    "CLUSTER": {
+                        ("C1", "CLUSTER"): {
+                            node: {("version", "KEY"): "6.0.0"} for node in nodes
+                        }
+                    }
+                },
+                "SERVICE": {
+                    "STATISTICS": {
+                        ("C1", "CLUSTER"): {
+                            node: {("uptime", "KEY"): i, ("objects", "KEY"): 4}
+                            for i, node in enumerate(nodes)
+                        }
+                    }
+                },
+            }
+        }
+
+        with open(self.query_file, "w") as f:
+            f.write(";\n".join(QUERIES[:7] + ["x y"]) + ";\n")
+
+        patch.object(health_checker, "QUERY_PLAN_CACHE_DIR", self.dir).start()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.dir)
+
+    def _execute(self, max_workers):
+        checker = HealthChecker()
+        checker.max_workers = max_workers
+        checker.set_health_input_data(self.data)
+        return checker.execute(query_file=self.query_file)
+
+    def test_collectinfo_input_is_executed_in_forked_workers(self):
+        # Like the collectinfo analyzer, as opposed to live mode which has the
+        # threads of its event loop and system statistics.
+        if multiprocessing.get_start_method() != "fork":
+            self.skipTest("fork is not the default start method")
+
+        if threading.active_count() != 1:
+            self.skipTest("other threads are running")
+
+        execute_in_parallel = HealthChecker._execute_queries_in_parallel
+        outcomes = []
+
+        def record_outcomes(checker, *args):
+            outcomes.append(execute_in_parallel(checker, *args))
+            return outcomes[-1]
+
+        patch.object(
+            HealthChecker,
+            "_execute_queries_in_parallel",
+            side_effect=record_outcomes,
+            autospec=True,
+        ).start()
+        pool_mock = patch.object(
+            health_checker,
+            "ProcessPoolExecutor",
+            side_effect=health_checker.ProcessPoolExecutor,
+        ).start()
+
+        result = self._execute(2)
+
+        self.assertIsNotNone(outcomes[0])
+        pool_mock.assert_called_once()
+        self.assertEqual(
+            pool_mock.call_args[1]["mp_context"].get_start_method(), "fork"
+        )
+        self.assertEqual(result, self._execute(1))
+
+
+class HealthCheckerIncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.query_file = os.path.join(self.dir, "queries.hql")
+        queries = [
+            's = select "uptime" from SERVICE.STATISTICS',
+            "t = do s > 15",
+            'ASSERT(t, False, "uptime", "OPERATIONS", WARNING)',
+            'c = select "proto-fd-max" from SERVICE.CONFIG',
+            "d = do c > 100",
+            'ASSERT(d, True, "fds", "OPERATIONS", WARNING)',
+            "x y",
+        ]
+
+        with open(self.query_file, "w") as f:
+            f.write(";\n".join(queries) + ";\n")
+
+        patch.object(health_checker, "QUERY_PLAN_CACHE_DIR", self.dir).start()
+        self.checker = HealthChecker()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.dir)
+
+    def _data(self, uptime):
+        return {
+            "SNAPSHOT000": {
+                "SERVICE": {
+                    "STATISTICS": {
+                        ("C1", "CLUSTER"): {
+                            ("n1", "NODE"): {("uptime", "KEY"): 10},
+                            ("n2", "NODE"): {("uptime", "KEY"): uptime},
+                        }
+                    },
+                    "CONFIG": {
+                        ("C1", "CLUSTER"): {
+                            ("n1", "NODE"): {("proto-fd-max", "KEY"): 1000},
+                            ("n2", "NODE"): {("proto-fd-max", "KEY"): 1000},
+                        }
+                    },
+                }
+            }
+        }
+
+    def _execute(self, uptime):
+        executed = []
+        get_query_outcome = self.checker._get_query_outcome
+
+        def record_query(query, plan=None):
+            executed.append(query)
+            return get_query_outcome(query, plan)
+
+        self.checker.set_health_input_data(self._data(uptime))
+
+        with patch.object(self.checker, "_get_query_outcome", side_effect=record_query):
+            result = self.checker.execute(query_file=self.query_file)
+
+        return result, executed
+
+    def test_unchanged_queries_are_not_executed_again(self):
+        expected, executed = self._execute(20)
+
+        self.assertEqual(len(executed), 7)
+
+        result, executed = self._execute(20)
+
+        self.assertEqual(result, expected)
+        # Queries which fail to compile are always executed.
+        self.assertEqual(executed, ["x y"])
+        self.assertEqual(result[HealthResultType.ASSERT_CHANGES], [])
+
+    def test_changed_sections_are_executed_again(self):
+        self._execute(20)
+        result, executed = self._execute(5)
+
+        self.assertEqual(
+            executed,
+            [
+                's = select "uptime" from SERVICE.STATISTICS',
+                "t = do s > 15",
+                'ASSERT(t, False, "uptime", "OPERATIONS", WARNING)',
+                "x y",
+            ],
+        )
+
+        checker = HealthChecker()
+        checker.set_health_input_data(self._data(5))
+        expected = checker.execute(query_file=self.query_file)
+        expected[HealthResultType.ASSERT_CHANGES] = result[
+            HealthResultType.ASSERT_CHANGES
+        ]
+        self.assertEqual(result, expected)
+
+        changes = result[HealthResultType.ASSERT_CHANGES]
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]["index"], 2)
+        self.assertEqual((changes[0]["previous"], changes[0]["current"]), (False, True))
+        self.assertEqual(changes[0]["assert"][AssertResultKey.FAIL_MSG], "uptime")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -156,6 +156,7 @@ class ClusterTest(asynctest.TestCase):
 
     def setUp(self):
         patch("lib.live_cluster.client.node.JsonDynamicConfigHandler").start()
+        patch("lib.live_cluster.client.node.ASSocketPool.start").start()
         lib.live_cluster.client.node.Node._info_cinfo = patch(
             "lib.live_cluster.client.node.Node._info_cinfo"
         ).start()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from ctypes import ArgumentError
 import time
 from unittest.mock import call
@@ -211,12 +212,14 @@ class NodeTest(asynctest.TestCase):
         as_socket_mock.connect.return_value = True
         as_socket_mock.login.returns_value = True
         as_socket_mock.get_session_info.return_value = "token", 59
-        self.assertEqual(self.node.socket_pool, {self.node.port: set()})
+        pool = self.node._get_socket_pool(self.node.ip, self.node.port)
+        self.assertEqual(len(pool), 0)
 
         self.assertTrue(await self.node.login())
 
         as_socket_mock.close.assert_not_called()
-        self.assertEqual(self.node.socket_pool, {self.node.port: set([as_socket_mock])})
+        self.assertEqual(len(pool), 1)
+        self.assertIn(as_socket_mock, pool)
         self.assertEqual("token", self.node.session_token)
         self.assertEqual(59, self.node.session_expiration)
 
@@ -281,7 +284,6 @@ class NodeTest(asynctest.TestCase):
         self.assertTrue(await self.node.login())
         self.node.logger.warning.assert_not_called()
 
-    # TODO: Make unit tests for socket pool
     async def test_get_connection_uses_socket_pool(self):
         class ASSocket_Mock(AsyncMock):
             settimeout = Mock()
@@ -294,13 +296,18 @@ class NodeTest(asynctest.TestCase):
         as_socket_mock2.is_connected.return_value = False
         as_socket_mock2.name = 2
         self.node._initialize_socket_pool()
-        self.node.socket_pool[self.node.port].add(as_socket_mock2)
-        self.node.socket_pool[self.node.port].add(as_socket_mock1)
+        pool = self.node._get_socket_pool(self.node.ip, self.node.port)
+        pool.probe_interval = 0
+        pool.add(as_socket_mock1)
+        pool.add(as_socket_mock2)
 
         sock = await self.node._get_connection(self.node.ip, self.node.port)
 
-        # just making sure the correct one was returned since we are dealing with a set.
+        # The most recently added socket is not connected and is discarded.
         self.assertEqual(sock.name, 1)
+        as_socket_mock2.close.assert_called_once()
+        self.assertEqual(pool.stats()["reused"], 1)
+        self.assertEqual(pool.stats()["discarded"], 1)
 
     @patch("lib.live_cluster.client.node.ASSocket", autospec=True)
     async def test_get_connection_returns_new_socket(self, as_socket_mock):
@@ -311,7 +318,9 @@ class NodeTest(asynctest.TestCase):
 
         as_socket_in_pool = ASSocket_Mock()
         as_socket_in_pool.is_connected.return_value = False
-        self.node.socket_pool[self.node.port].add(as_socket_in_pool)
+        pool = self.node._get_socket_pool(self.node.ip, self.node.port)
+        pool.probe_interval = 0
+        pool.add(as_socket_in_pool)
 
         self.node.session_token = "session-token"
         as_socket_mock.connect.return_value = True
@@ -3816,6 +3825,159 @@ class NodeTest(asynctest.TestCase):
                 tc.assocket_func, tc.args, self.node.ip
             )
 
+    def test_execute_system_command_parses_status(self):
+        conn = MagicMock()
+        conn.before = (
+            "uname -a; echo ASADM_CMD_STATUS:$?\r\nLinux host\r\nASADM_CMD_STATUS:0\r\n"
+        )
+
+        status, out = self.node._execute_system_command(conn, "uname -a")
+
+        conn.sendline.assert_called_once_with("uname -a; echo ASADM_CMD_STATUS:$?")
+        self.assertEqual(status, 0)
+        self.assertEqual(out, "uname -a; echo ASADM_CMD_STATUS:$?\r\nLinux host\r\n")
+
+        conn.before = "bad-cmd; echo ASADM_CMD_STATUS:$?\r\nASADM_CMD_STATUS:127\r\n"
+
+        status, _ = self.node._execute_system_command(conn, "bad-cmd")
+
+        self.assertEqual(status, 127)
+
+    @patch("lib.live_cluster.client.node.Node._get_remote_host_system_statistics")
+    async def test_info_system_statistics_remote(self, remote_stats_mock):
+        def side_effect(commands):
+            self.node.sys_stats_timings["uname"] = 0.5
+            return {"uname": {"kernel_name": "Linux"}}
+
+        remote_stats_mock.side_effect = side_effect
+        self.node.localhost = False
+
+        result = await self.node.info_system_statistics(
+            default_user="user", commands=["uname"], collect_remote_data=True
+        )
+
+        self.assertDictEqual(result, {"uname": {"kernel_name": "Linux"}})
+        remote_stats_mock.assert_called_once_with(["uname"])
+        self.assertEqual(self.node.sys_default_user_id, "user")
+
+        timings = await self.node.info_system_statistics_timings()
+
+        self.assertDictEqual(timings["commands"], {"uname": 0.5})
+        self.assertGreaterEqual(timings["total"], 0)
+
+    @patch("lib.utils.util.shell_command_async")
+    async def test_info_system_statistics_localhost(self, shell_mock):
+        outputs = {
+            "uname -a": ("Linux host 5.4.0 x86_64 GNU/Linux\n", ""),
+            "hostname -I": ("", "not supported"),
+            "hostname": ("host\n", ""),
+        }
+
+        async def side_effect(command, timeout=None):
+            await asyncio.sleep(0)
+            return outputs[command[0]]
+
+        shell_mock.side_effect = side_effect
+        self.node.localhost = True
+
+        result = await self.node.info_system_statistics(commands=["uname", "hostname"])
+
+        self.assertEqual(list(result.keys()), ["hostname", "uname"])
+        self.assertEqual(result["uname"]["kernel_name"], "Linux")
+        self.assertEqual(
+            [c[0][0][0] for c in shell_mock.call_args_list],
+            ["hostname -I", "uname -a", "hostname"],
+        )
+        self.assertEqual(set(self.node.sys_stats_timings), {"hostname", "uname"})
+
+    async def test_info_system_statistics_remote_disabled(self):
+        self.node.localhost = False
+
+        result = await self.node.info_system_statistics(commands=["uname"])
+
+        self.assertDictEqual(result, {})
+
+
+class NodeInfoBatchTest(asynctest.TestCase):
+    async def setUp(self):
+        self.get_fully_qualified_domain_name = patch(
+            "lib.live_cluster.client.node.get_fully_qualified_domain_name"
+        ).start()
+        getaddrinfo = patch("socket.getaddrinfo")
+
+        self.addCleanup(patch.stopall)
+
+        lib.live_cluster.client.node.Node.info_build = patch(
+            "lib.live_cluster.client.node.Node.info_build", AsyncMock()
+        ).start()
+        self.info_request_mock = patch(
+            "lib.live_cluster.client.node.Node._info_request", AsyncMock()
+        ).start()
+        socket.getaddrinfo = getaddrinfo.start()
+
+        lib.live_cluster.client.node.Node.info_build.return_value = "5.0.0.11"
+        self.get_fully_qualified_domain_name.return_value = "host.domain.local"
+        socket.getaddrinfo.return_value = [(2, 1, 6, "", ("192.1.1.1", 3000))]
+
+        def side_effect(command, ip, port):
+            if command == ["node", "service-clear-std", "features", "peers-clear-std"]:
+                return {
+                    "node": "A00000000000000",
+                    "service-clear-std": "192.1.1.1:3000",
+                    "peers-clear-std": "2,3000,[]",
+                    "features": "features",
+                }
+
+            if isinstance(command, str):
+                return command + "-value"
+
+            return {c: c + "-value" for c in command if c != "missing"}
+
+        self.info_request_mock.side_effect = side_effect
+        self.node: Node = await Node("192.1.1.1")
+        self.info_request_mock.reset_mock()
+
+    async def test_info_commands_in_same_tick_are_batched(self):
+        results = await asyncio.gather(
+            self.node.info("namespace/test"),
+            self.node.info("namespace/bar"),
+            self.node.info("sets"),
+        )
+
+        self.assertListEqual(
+            results, ["namespace/test-value", "namespace/bar-value", "sets-value"]
+        )
+        self.info_request_mock.assert_called_once_with(
+            ["namespace/test", "namespace/bar", "sets"], "192.1.1.1", 3000
+        )
+
+    async def test_info_single_command_is_not_batched(self):
+        self.assertEqual(await self.node.info("build"), "build-value")
+        self.info_request_mock.assert_called_once_with("build", "192.1.1.1", 3000)
+
+    async def test_info_batch_falls_back_for_missing_command(self):
+        results = await asyncio.gather(
+            self.node.info("statistics"), self.node.info("missing")
+        )
+
+        self.assertListEqual(results, ["statistics-value", "missing-value"])
+        self.info_request_mock.assert_has_calls(
+            [
+                call(["statistics", "missing"], "192.1.1.1", 3000),
+                call("missing", "192.1.1.1", 3000),
+            ]
+        )
+
+    async def test_info_batch_exception_is_returned_to_all(self):
+        self.info_request_mock.side_effect = IOError("Could not connect")
+
+        results = await asyncio.gather(
+            self.node.info("statistics"), self.node.info("namespaces")
+        )
+
+        for result in results:
+            self.assertIsInstance(result, IOError)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+from mock import patch
+from mock.mock import AsyncMock
+
+from lib.live_cluster.client.snapshot_store import SnapshotStore
+
+import warnings
+
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    import asynctest
+
+
+class SnapshotStoreTest(asynctest.TestCase):
+    def setUp(self) -> None:
+        self.store = SnapshotStore(
+            policies=(("build", 100.0), ("statistics", 10.0), ("namespace/", 10.0)),
+            max_age=0.5,
+            max_size=3,
+            static_commands=("build",),
+        )
+        self.fetch_mock = AsyncMock(side_effect=lambda command: command + "-result")
+        self.time_mock = patch(
+            "lib.live_cluster.client.snapshot_store.time.monotonic", return_value=0.0
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def test_get_max_age(self):
+        self.assertEqual(self.store.get_max_age("build"), 100.0)
+        self.assertEqual(self.store.get_max_age("namespace/test"), 10.0)
+        self.assertEqual(self.store.get_max_age(("statistics", 1, 2)), 10.0)
+        self.assertEqual(self.store.get_max_age("statistics/xdr"), 0.5)
+        self.assertEqual(self.store.get_max_age("builds"), 0.5)
+
+    async def test_get_is_fresh_for_policy_max_age(self):
+        self.assertEqual(
+            await self.store.get("n1", "statistics", self.fetch_mock, "statistics"),
+            "statistics-result",
+        )
+        self.time_mock.return_value = 10.0
+        await self.store.get("n1", "statistics", self.fetch_mock, "statistics")
+
+        self.fetch_mock.assert_called_once()
+
+        self.time_mock.return_value = 10.1
+        await self.store.get("n1", "statistics", self.fetch_mock, "statistics")
+        await self.store.get("n2", "statistics", self.fetch_mock, "statistics")
+
+        self.assertEqual(self.fetch_mock.call_count, 3)
+        self.assertEqual(self.store.stats()["hits"], 1)
+
+    async def test_get_shares_concurrent_fetches(self):
+        results = await asyncio.gather(
+            *[self.store.get("n1", "build", self.fetch_mock, "build") for _ in range(3)]
+        )
+
+        self.assertEqual(results, ["build-result"] * 3)
+        self.fetch_mock.assert_called_once()
+
+    async def test_new_generation(self):
+        await self.store.get("n1", "statistics", self.fetch_mock, "statistics")
+        await self.store.get("n1", "build", self.fetch_mock, "build")
+        self.store.new_generation()
+        await self.store.get("n1", "statistics", self.fetch_mock, "statistics")
+        await self.store.get("n1", "build", self.fetch_mock, "build")
+
+        # Static commands are kept across generations.
+        self.assertEqual(self.fetch_mock.call_count, 3)
+        self.assertEqual(self.store.stats()["generation"], 1)
+
+    async def test_get_does_not_keep_exceptions(self):
+        error = IOError("error")
+        results = [error, "build-result"]
+
+        async def return_result(command):
+            return results.pop(0)
+
+        # Raised by the fetch
+        self.fetch_mock.side_effect = error
+
+        with self.assertRaises(IOError):
+            await self.store.get("n1", "build", self.fetch_mock, "build")
+
+        # Returned by the fetch
+        self.fetch_mock.side_effect = return_result
+
+        self.assertIs(
+            await self.store.get("n1", "build", self.fetch_mock, "build"), error
+        )
+        self.assertEqual(
+            await self.store.get("n1", "build", self.fetch_mock, "build"),
+            "build-result",
+        )
+        self.assertEqual(self.fetch_mock.call_count, 3)
+
+    async def test_get_evicts_least_recently_used(self):
+        for command in ["build", "statistics", "namespace/a", "namespace/b"]:
+            await self.store.get("n1", command, self.fetch_mock, command)
+
+        self.assertEqual(self.store.stats()["evictions"], 1)
+        await self.store.get("n1", "build", self.fetch_mock, "build")
+
+        self.assertEqual(self.fetch_mock.call_count, 5)
@@ -0,0 +1,117 @@
+import asyncio
+from mock.mock import AsyncMock, Mock
+
+from lib.live_cluster.client.socket_pool import ASSocketPool
+
+import warnings
+
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    import asynctest
+
+
+class ASSocketPoolTest(asynctest.TestCase):
+    def setUp(self) -> None:
+        self.create_socket_mock = AsyncMock()
+        self.create_socket_mock.side_effect = lambda: self.new_socket_mock()
+        self.pool = ASSocketPool(
+            self.create_socket_mock,
+            min_size=1,
+            max_size=2,
+            max_idle_time=0.0,
+            probe_interval=60.0,
+            borrow_timeout=0.1,
+        )
+
+    def new_socket_mock(self):
+        sock = AsyncMock()
+        sock.settimeout = Mock()
+        sock.is_connected.return_value = True
+        return sock
+
+    async def tearDown(self) -> None:
+        await self.pool.close()
+
+    async def test_acquire_reuses_released_socket(self):
+        sock = await self.pool.acquire()
+        await self.pool.release(sock)
+
+        self.assertIs(await self.pool.acquire(), sock)
+        self.create_socket_mock.assert_called_once()
+        sock.is_connected.assert_not_called()
+        self.assertEqual(self.pool.stats()["created"], 1)
+        self.assertEqual(self.pool.stats()["reused"], 1)
+
+    async def test_acquire_returns_none_when_socket_cant_connect(self):
+        self.create_socket_mock.side_effect = None
+        self.create_socket_mock.return_value = None
+
+        self.assertIsNone(await self.pool.acquire())
+        self.assertEqual(self.pool.size, 0)
+
+    async def test_acquire_waits_for_release_when_full(self):
+        sock1 = await self.pool.acquire()
+        await self.pool.acquire()
+
+        async def release_later():
+            await asyncio.sleep(0.01)
+            await self.pool.release(sock1)
+
+        _, sock = await asyncio.gather(release_later(), self.pool.acquire())
+
+        self.assertIs(sock, sock1)
+        self.assertEqual(self.pool.stats()["waits"], 1)
+        self.assertGreater(self.pool.stats()["wait_time"], 0)
+
+    async def test_acquire_times_out_when_full(self):
+        await self.pool.acquire()
+        await self.pool.acquire()
+
+        await self.assertAsyncRaises(IOError, self.pool.acquire())
+
+    async def test_discard_frees_space_for_new_socket(self):
+        sock1 = await self.pool.acquire()
+        await self.pool.acquire()
+        await self.pool.discard(sock1)
+
+        self.assertIsNot(await self.pool.acquire(), sock1)
+        sock1.close.assert_called_once()
+        self.assertEqual(self.pool.stats()["discarded"], 1)
+
+    async def test_add_does_not_exceed_max_size(self):
+        self.assertTrue(self.pool.add(self.new_socket_mock()))
+        self.assertTrue(self.pool.add(self.new_socket_mock()))
+        self.assertFalse(self.pool.add(self.new_socket_mock()))
+        self.assertEqual(len(self.pool), 2)
+
+    async def test_prewarm_opens_min_size_sockets(self):
+        await self.pool.prewarm()
+
+        self.assertEqual(len(self.pool), 1)
+        self.create_socket_mock.assert_called_once()
+
+    async def test_probe_discards_dead_sockets(self):
+        self.pool.probe_interval = 0
+        self.pool.max_idle_time = 60.0
+        sock = self.new_socket_mock()
+        dead_sock = self.new_socket_mock()
+        dead_sock.is_connected.return_value = False
+        self.pool.add(sock)
+        self.pool.add(dead_sock)
+
+        await self.pool._probe_idle()
+
+        self.assertEqual(len(self.pool), 1)
+        self.assertIn(sock, self.pool)
+        self.assertNotIn(dead_sock, self.pool)
+        self.assertEqual(self.pool.stats()["discarded"], 1)
+
+    async def test_probe_evicts_idle_sockets_above_min_size(self):
+        self.pool.probe_interval = 0
+        self.pool.add(self.new_socket_mock())
+        self.pool.add(self.new_socket_mock())
+
+        await self.pool._probe_idle()
+
+        self.assertEqual(len(self.pool), 1)
+        self.assertEqual(self.pool.stats()["discarded"], 1)
@@ -0,0 +1,144 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from mock import MagicMock, patch, AsyncMock
+
+from lib.live_cluster.collectinfo_controller import CollectinfoController
+
+import warnings
+
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    import asynctest
+
+
+class CollectinfoControllerTest(asynctest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        self.prefix = os.path.join(self.dir, "20210101_")
+        self.controller = CollectinfoController()
+        self.controller.cluster = MagicMock()
+        self.snapshots = [
+            {"node1": {"as_stat": {"i": i, "names": ["a", "b"]}}} for i in range(3)
+        ]
+        self.get_data_mock = patch.object(
+            self.controller,
+            "_get_collectinfo_data_json",
+            AsyncMock(side_effect=self.snapshots),
+        ).start()
+        self.timestamps = patch(
+            "lib.live_cluster.collectinfo_controller.time.strftime",
+            side_effect=["t1", "t2", "t3"],
+        ).start()
+        self.sleep_mock = patch(
+            "lib.live_cluster.collectinfo_controller.asyncio.sleep", AsyncMock()
+        ).start()
+
+        self.addCleanup(patch.stopall)
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    async def _dump(self, snp_count, wait_time=5):
+        await self.controller._dump_collectinfo_json(
+            None, self.prefix, None, None, None, None, None, False, snp_count, wait_time
+        )
+
+        with open(self.prefix + "ascinfo.json") as f:
+            return f.read()
+
+    async def test_dump_collectinfo_json(self):
+        expected = json.dumps(
+            dict(zip(["t1", "t2", "t3"], self.snapshots)),
+            indent=2,
+            separators=(",", ":"),
+        )
+
+        self.assertEqual(await self._dump(3), expected)
+        # Sleeping is mocked so the snapshots are due 5 and 10 seconds after the
+        # first one started.
+        self.assertEqual(self.sleep_mock.call_count, 2)
+
+        for c, due in zip(self.sleep_mock.call_args_list, [5, 10]):
+            self.assertAlmostEqual(c[0][0], due, delta=1)
+
+        # Every snapshot but the first is fetched anew.
+        self.assertEqual(self.controller.cluster.new_snapshot_generation.call_count, 2)
+
+    async def test_dump_collectinfo_json_compact_and_compressed(self):
+        await self.controller._dump_collectinfo_json(
+            None,
+            self.prefix,
+            None,
+            None,
+            None,
+            None,
+            None,
+            False,
+            2,
+            5,
+            compact_json=True,
+            compress_json=True,
+        )
+
+        self.assertFalse(os.path.exists(self.prefix + "ascinfo.json"))
+
+        with gzip.open(self.prefix + "ascinfo.json.gz", "rt") as f:
+            self.assertEqual(
+                f.read(),
+                json.dumps(
+                    dict(zip(["t1", "t2"], self.snapshots)), separators=(",", ":")
+                ),
+            )
+
+    async def test_dump_collectinfo_json_keeps_collected_snapshots(self):
+        self.get_data_mock.side_effect = [self.snapshots[0], Exception("failed")]
+
+        with self.assertRaises(Exception):
+            await self._dump(2)
+
+        with open(self.prefix + "ascinfo.json") as f:
+            self.assertEqual(json.load(f), {"t1": self.snapshots[0]})
+
+    async def test_capture_all_and_write_to_file(self):
+        self.controller.nodes = "all"
+        filename = self.prefix + "ascollectinfo.log"
+
+        async def printer(line):
+            self.controller.mods["line"] = line
+            await asyncio.sleep(0)
+            print(self.controller.mods["line"])
+
+        async def failer(line):
+            raise Exception("failed " + line[0])
+
+        await self.controller._collectinfo_capture_all_and_write_to_file(
+            filename,
+            [
+                [(printer, ["a"]), (failer, ["b"]), (printer, ["c"])],
+                [(printer, ["d"])],
+            ],
+        )
+
+        with open(filename) as f:
+            content = f.read()
+
+        self.assertIn("['a']", content)
+        self.assertIn("failed b", content)
+        self.assertNotIn("['c']", content)
+        self.assertLess(content.index("failed b"), content.index("['d']"))
@@ -17,8 +17,10 @@ from lib.base_controller import ShellException
 from mock import patch, AsyncMock
 from mock.mock import call
 
+from lib.get_controller import GetPmapController
 from lib.live_cluster.show_controller import (
     ShowBestPracticesController,
+    ShowController,
     ShowConfigController,
     ShowJobsController,
     ShowRacksController,
@@ -872,3 +874,48 @@ class ShowRacksControllerTest(asynctest.TestCase):
 
         self.getter_mock.get_racks.assert_called_with(nodes="principal", flip=False)
         self.view_mock.show_racks.assert_called_with(resp, **self.controller.mods)
+
+
+class ShowPmapControllerTest(asynctest.TestCase):
+    def setUp(self) -> None:
+        node = "1.1.1.1:3000"
+        self.cluster_mock = patch(
+            "lib.live_cluster.live_cluster_command_controller.LiveClusterCommandController.cluster",
+            AsyncMock(),
+        ).start()
+        self.cluster_mock.info_statistics.return_value = {node: {"cluster_key": "ck"}}
+        self.cluster_mock.info_namespaces.return_value = {node: ["test"]}
+        self.cluster_mock.info_namespace_statistics.return_value = {
+            node: {
+                "dead_partitions": "0",
+                "unavailable_partitions": "0",
+                "migrate_tx_partitions_remaining": "0",
+                "migrate_rx_partitions_remaining": "0",
+            }
+        }
+        self.cluster_mock.info.side_effect = lambda cmd, nodes="all": {
+            "node": {node: "BB9"},
+            "partition-info": {node: "test:0:A:2:0:0:0:0:0:0:0:0"},
+        }[cmd]
+        self.view_mock = patch("lib.base_controller.BaseController.view").start()
+        GetPmapController._pmap_cache.clear()
+
+        self.addCleanup(GetPmapController._pmap_cache.clear)
+        self.addCleanup(patch.stopall)
+
+    async def test_pmap_is_cached_across_commands(self):
+        await ShowController().execute(["pmap"])
+        await ShowController().execute(["pmap"])
+
+        partition_info_calls = [
+            c
+            for c in self.cluster_mock.info.call_args_list
+            if c[0][0] == "partition-info"
+        ]
+
+        self.assertEqual(len(partition_info_calls), 1)
+        self.assertEqual(self.view_mock.show_pmap.call_count, 2)
+        self.assertEqual(
+            self.view_mock.show_pmap.call_args_list[0],
+            self.view_mock.show_pmap.call_args_list[1],
+        )
@@ -0,0 +1,251 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from mock import MagicMock, patch
+
+from lib.log_analyzer.log_handler import grep_engine, log_handler, log_reader
+from lib.log_analyzer.log_handler.log_handler import LogHandler
+from lib.log_analyzer.log_handler.log_reader import LogReader
+from lib.log_analyzer.log_handler.server_log import ServerLog
+
+LOG_LINES = [
+    "Jan 01 2021 00:00:00 GMT: INFO (info): (ticker.c:100) {test} objects: 1\n",
+    "Jan 01 2021 00:30:00 GMT: INFO (info): (ticker.c:200) fds: proto (1,2,3)\n",
+    "no timestamp objects: 2\n",
+    "Jan 01 2021 01:00:00 GMT: INFO (info): (ticker.c:100) {bar} Objects: 3\n",
+    "Jan 01 2021 01:30:00 GMT: INFO (info): (ticker.c:100) {test} objects: 4\n",
+    "Jan 01 2021 02:00:00 GMT: INFO (info): (hb.c:10) heartbeat objects\n",
+]
+
+
+class GrepEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.log = os.path.join(self.dir, "aerospike.log")
+
+        with open(self.log, "w") as f:
+            f.write("".join(LOG_LINES))
+
+        patch.object(
+            log_reader, "INDEX_CACHE_DIR", os.path.join(self.dir, "index")
+        ).start()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.dir)
+
+    def _grep(self, search, ignore=[], is_and=False, is_casesensitive=True, start=0):
+        search_patterns, ignore_patterns, flags = grep_engine.get_patterns(
+            search, ignore, is_casesensitive
+        )
+
+        return grep_engine.grep_range(
+            self.log,
+            start,
+            os.path.getsize(self.log),
+            search_patterns,
+            ignore_patterns,
+            is_and,
+            flags,
+        )
+
+    def test_grep_range(self):
+        self.assertEqual(
+            self._grep(["objects"]),
+            [LOG_LINES[0], LOG_LINES[2], LOG_LINES[4], LOG_LINES[5]],
+        )
+        self.assertEqual(
+            self._grep(["objects", "{test}"], is_and=True),
+            [LOG_LINES[0], LOG_LINES[4]],
+        )
+        self.assertEqual(
+            self._grep(["objects", "fds"], ignore=["{test}"]),
+            [LOG_LINES[1], LOG_LINES[2], LOG_LINES[5]],
+        )
+        self.assertEqual(
+            self._grep(["objects"], start=len(LOG_LINES[0])),
+            [LOG_LINES[2], LOG_LINES[4], LOG_LINES[5]],
+        )
+
+    def test_grep_range_case_insensitive_strings_are_patterns(self):
+        self.assertEqual(
+            self._grep(["objects: [34]"], is_casesensitive=False),
+            [LOG_LINES[3], LOG_LINES[4]],
+        )
+        self.assertEqual(self._grep(["objects: [34]"]), [])
+
+    def test_grep_range_anchors_match_every_line(self):
+        self.assertEqual(
+            self._grep(["^jan 01 2021 0[01]:30"], is_casesensitive=False),
+            [LOG_LINES[1], LOG_LINES[4]],
+        )
+        self.assertEqual(
+            self._grep([r"objects: \d$"], is_casesensitive=False),
+            [LOG_LINES[0], LOG_LINES[2], LOG_LINES[3], LOG_LINES[4]],
+        )
+
+    def test_grep_range_matches_within_lines(self):
+        self.assertEqual(self._grep([r"1\s+Jan"], is_casesensitive=False), [])
+
+    def test_split_range(self):
+        self.assertEqual(
+            grep_engine.split_range([0, 10, 25, 40], 0, 50, min_range_bytes=15),
+            [(0, 25), (25, 40), (40, 50)],
+        )
+        self.assertEqual(
+            grep_engine.split_range([0, 10, 25, 40], 10, 30, min_range_bytes=1),
+            [(10, 25), (25, 30)],
+        )
+        self.assertEqual(grep_engine.split_range([0, 10], 10, 10), [])
+
+    def _show(self, server_log, **kwargs):
+        server_log.set_input(**kwargs)
+        lines = []
+
+        for _, line in server_log.show_iterator():
+            if not line:
+                break
+
+            lines.append(line)
+
+        return lines
+
+    def test_server_log_grep(self):
+        server_log = ServerLog("node", self.log, LogReader())
+        start_tm = server_log.get_start_tm("Jan 01 2021 01:00:00")
+        cases = [
+            dict(search_strs=["objects"], start_tm=server_log.server_start_tm),
+            dict(search_strs=["OBJECTS"], is_casesensitive=False, start_tm=start_tm),
+            dict(
+                search_strs=["^jan 01 2021 0[012]:[03]0"],
+                is_casesensitive=False,
+                start_tm=server_log.server_start_tm,
+            ),
+            dict(
+                search_strs=["objects"],
+                ignore_strs=["bar"],
+                start_tm=start_tm,
+                duration="1:00:00",
+            ),
+        ]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for kwargs in cases:
+                with patch.object(ServerLog, "_grep", return_value=None):
+                    expected = self._show(server_log, **kwargs)
+
+                with patch.object(grep_engine, "GREP_MIN_RANGE_BYTES", 1):
+                    self.assertEqual(self._show(server_log, **kwargs), expected)
+                    self.assertEqual(
+                        self._show(server_log, executor=executor, **kwargs),
+                        expected,
+                    )
+
+        server_log.destroy()
+
+    @patch.object(grep_engine, "GREP_MIN_RANGE_BYTES", 1)
+    @patch("lib.utils.constants.LOG_GREP_MAX_WORKERS", 2)
+    def test_server_log_grep_searches_ahead_of_reader(self):
+        server_log = ServerLog("node", self.log, LogReader())
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor = MagicMock(wraps=executor)
+            server_log.set_input(
+                search_strs=["objects"],
+                start_tm=server_log.server_start_tm,
+                executor=executor,
+            )
+            server_log.read_line_block()
+
+            # The first range is read and the second searched ahead.
+            self.assertEqual(server_log.read_block, [LOG_LINES[0]])
+            self.assertEqual(executor.submit.call_count, 2)
+
+            # The last of the 3 ranges is not searched once the reader stops.
+            server_log.set_input(
+                search_strs=["objects"], start_tm=server_log.server_start_tm
+            )
+
+            self.assertEqual(executor.submit.call_count, 2)
+            self.assertEqual(list(server_log.grep_futures), [])
+
+        server_log.destroy()
+
+    def test_server_log_grep_with_broken_pool(self):
+        server_log = ServerLog("node", self.log, LogReader())
+        kwargs = dict(search_strs=["objects"], start_tm=server_log.server_start_tm)
+        expected = self._show(server_log, **kwargs)
+        broken_future = MagicMock()
+        broken_future.result.side_effect = BrokenProcessPool()
+        executors = [MagicMock(), MagicMock()]
+
+        # The pool breaks when submitting, or while searching.
+        executors[0].submit.side_effect = BrokenProcessPool()
+        executors[1].submit.return_value = broken_future
+
+        with patch.object(grep_engine, "GREP_MIN_RANGE_BYTES", 1):
+            for executor in executors:
+                self.assertEqual(
+                    self._show(server_log, executor=executor, **kwargs), expected
+                )
+
+        self.assertTrue(executors[1].submit.called)
+        server_log.destroy()
+
+    def test_get_grep_executor(self):
+        handler = types.SimpleNamespace(
+            grep_executor=None, grep_executor_failed=False, logger=MagicMock()
+        )
+        executor = LogHandler._get_grep_executor(handler)
+
+        try:
+            server_log = ServerLog("node", self.log, LogReader())
+            kwargs = dict(search_strs=["objects"], start_tm=server_log.server_start_tm)
+            expected = self._show(server_log, **kwargs)
+
+            with patch.object(grep_engine, "GREP_MIN_RANGE_BYTES", 1):
+                self.assertEqual(
+                    self._show(server_log, executor=executor, **kwargs), expected
+                )
+
+            server_log.destroy()
+        finally:
+            executor.shutdown()
+
+    def test_get_grep_executor_fails_to_start(self):
+        handler = types.SimpleNamespace(
+            grep_executor=None, grep_executor_failed=False, logger=MagicMock()
+        )
+        pool_mock = patch.object(log_handler, "ProcessPoolExecutor").start()
+        pool_mock.return_value.submit.return_value.result.side_effect = (
+            BrokenProcessPool()
+        )
+
+        self.assertIsNone(LogHandler._get_grep_executor(handler))
+        pool_mock.return_value.shutdown.assert_called_once()
+
+        # Logs are searched in this process from then on.
+        self.assertIsNone(LogHandler._get_grep_executor(handler))
+        pool_mock.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
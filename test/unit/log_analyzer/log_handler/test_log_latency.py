@@ -0,0 +1,150 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import unittest
+from mock import patch
+
+from lib.log_analyzer.log_handler.log_latency import LogLatency
+from lib.log_analyzer.log_handler.log_reader import LogReader
+from lib.utils import constants
+
+
+def _log_lines(num_dumps):
+    lines = []
+    values = [0] * 17
+
+    for i in range(num_dumps):
+        prefix = "Jan 01 2021 00:%02d:%02d GMT: INFO (info): " % (i // 6, i % 6 * 10)
+
+        for b in range(4):
+            values[b] += (i + 1) * (4 - b)
+
+        lines.append(
+            prefix
+            + "(hist.c:240) histogram dump: {test}-read (%d total) msec\n" % sum(values)
+        )
+        lines.append(
+            prefix
+            + "(hist.c:257)  (00: %010d) (01: %010d) (02: %010d)\n" % tuple(values[:3])
+        )
+        lines.append(prefix + "(hist.c:257)  (03: %010d)\n" % values[3])
+        lines.append(prefix + "(ticker.c:100) {test} objects: %d\n" % i)
+
+    return lines
+
+
+class LogLatencyTest(unittest.TestCase):
+    def setUp(self):
+        self.reader = LogReader()
+        self.latency = LogLatency(self.reader)
+        self.latency._set_bucket_details("read")
+
+    def _itr(self, lines):
+        for line in lines:
+            yield self.reader.parse_dt(line), line
+
+    def _compute(self, lines, **kwargs):
+        args = dict(
+            arg_hist="read",
+            arg_slice=datetime.timedelta(seconds=10),
+            arg_from=datetime.datetime(2021, 1, 1),
+            arg_end_date=datetime.datetime(2021, 1, 2),
+            arg_num_buckets=3,
+            arg_every_nth=1,
+        )
+        args.update(kwargs)
+
+        return [
+            (tm, {k: dict(v) for k, v in res.items()})
+            for tm, res in self.latency.compute_latency(self._itr(lines), **args)
+        ]
+
+    def test_read_bucket_values(self):
+        lines = _log_lines(1)
+        total, values, line = self.latency._read_bucket_values(
+            lines[0], self._itr(lines[1:])
+        )
+
+        self.assertEqual(total, 10)
+        self.assertEqual(values, [4, 3, 2, 1] + [0] * 13)
+        self.assertEqual(line, lines[3])
+
+    def test_read_bucket_values_incomplete(self):
+        lines = _log_lines(1)
+
+        self.assertEqual(
+            self.latency._read_bucket_values(lines[0], self._itr(lines[1:2])),
+            (0, 0, 0),
+        )
+
+    def test_bucket_arithmetic(self):
+        new_values, slice_values = self.latency._subtract_buckets(
+            [5, 3, 9] + [0] * 14, [2, 4, 1] + [0] * 14
+        )
+
+        self.assertEqual(new_values[:3], [5, 4, 9])
+        self.assertEqual(slice_values[:3], [3, 0, 8])
+        self.assertEqual(
+            self.latency._add_buckets([1, 2] + [0] * 15, [3, 4] + [0] * 15)[:2],
+            [4, 6],
+        )
+
+        percentages = self.latency._bucket_percentages(8, [4, 2, 2] + [0] * 14)
+
+        self.assertEqual(percentages[:3], [50.0, 25.0, 25.0])
+        self.assertEqual(self.latency._percentage_over(0, percentages), 50.0)
+        self.assertEqual(self.latency._bucket_percentages(0, [0] * 17), [0.0] * 17)
+
+    def test_compute_latency(self):
+        result = self._compute(_log_lines(3))
+
+        self.assertEqual(len(result), 3)
+        tm, latency = result[0]
+        self.assertEqual(tm, datetime.datetime(2021, 1, 1, 0, 0, 10))
+        self.assertEqual(
+            latency,
+            {
+                ("ops/sec", None): {"Jan 01 2021 00:00:10": "2.0"},
+                (1, "ms"): {"Jan 01 2021 00:00:10": "60.00"},
+                (2, "ms"): {"Jan 01 2021 00:00:10": "30.00"},
+                (4, "ms"): {"Jan 01 2021 00:00:10": "10.00"},
+            },
+        )
+        self.assertEqual(result[-1][0], constants.END_ROW_KEY)
+        self.assertEqual(result[-1][1][("ops/sec", None)]["max"], "3.0")
+
+    def test_compute_latency_reuses_cached_dumps(self):
+        lines = _log_lines(12)
+        expected = self._compute(
+            lines, arg_num_buckets=2, arg_slice=datetime.timedelta(seconds=30)
+        )
+
+        self.assertEqual(self._compute(lines, arg_cache=True), self._compute(lines))
+
+        with patch.object(LogLatency, "_read_bucket_values") as read_mock:
+            self.assertEqual(
+                self._compute(
+                    lines,
+                    arg_cache=True,
+                    arg_num_buckets=2,
+                    arg_slice=datetime.timedelta(seconds=30),
+                ),
+                expected,
+            )
+            read_mock.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from mock import patch
+
+from lib.log_analyzer.log_handler import log_reader
+from lib.log_analyzer.log_handler.log_reader import LogReader
+
+
+def _log_lines(start_hour, num_hours, lines_per_hour=200):
+    lines = []
+
+    for hour in range(start_hour, start_hour + num_hours):
+        for i in range(lines_per_hour):
+            lines.append(
+                "Jan 01 2021 %02d:%02d:%02d GMT: INFO (info): (ticker.c:100) line %d\n"
+                % (hour, i * 60 // lines_per_hour, i % 60, i)
+            )
+
+    return "".join(lines)
+
+
+class SeekToTest(unittest.TestCase):
+    def setUp(self):
+        self.reader = LogReader()
+
+    def _seek_to(self, data, pos):
+        f = io.BytesIO(data)
+        f.seek(pos)
+        self.reader._seek_to(f, b"\n")
+        return f.tell()
+
+    def test_seek_to(self):
+        data = b"first\nsecond\nthird\n"
+
+        self.assertEqual(self._seek_to(data, 0), 0)
+        self.assertEqual(self._seek_to(data, 3), 0)
+        self.assertEqual(self._seek_to(data, 5), 6)
+        self.assertEqual(self._seek_to(data, 9), 6)
+        self.assertEqual(self._seek_to(data, 12), 13)
+        self.assertEqual(self._seek_to(data, len(data)), 13)
+
+    def test_seek_to_across_blocks(self):
+        data = b"a" * 100 + b"\n" + b"b" * 100 + b"\n"
+
+        with patch.object(log_reader, "SEEK_BLOCK_BYTES", 7):
+            self.assertEqual(self._seek_to(data, 150), 101)
+            self.assertEqual(self._seek_to(data, 50), 0)
+
+
+class GenerateServerLogIndicesTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.log = os.path.join(self.dir, "aerospike.log")
+        patch.object(
+            log_reader, "INDEX_CACHE_DIR", os.path.join(self.dir, "index")
+        ).start()
+        self.reader = LogReader()
+
+        with open(self.log, "w") as f:
+            f.write(_log_lines(0, 3))
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.dir)
+
+    def _expected_indices(self):
+        indices = {}
+
+        with open(self.log, "rb") as f:
+            pos = 0
+
+            for line in f:
+                hour = line[:14].decode() + ":00:00"
+                indices.setdefault(hour, pos)
+                pos += len(line)
+
+        return indices
+
+    def test_generate_server_log_indices(self):
+        indices = self.reader.generate_server_log_indices(self.log)
+
+        self.assertEqual(dict(indices), self._expected_indices())
+        self.assertEqual(len(os.listdir(log_reader.INDEX_CACHE_DIR)), 1)
+
+    def test_reuses_persisted_indices(self):
+        indices = self.reader.generate_server_log_indices(self.log)
+
+        with patch.object(
+            LogReader, "_extend_server_log_indices"
+        ) as extend_mock, patch.object(
+            LogReader, "_store_server_log_indices"
+        ) as store_mock:
+            self.assertEqual(self.reader.generate_server_log_indices(self.log), indices)
+            extend_mock.assert_not_called()
+            store_mock.assert_not_called()
+
+    def test_extends_persisted_indices_when_log_grows(self):
+        self.reader.generate_server_log_indices(self.log)
+
+        with open(self.log, "a") as f:
+            f.write(_log_lines(3, 2))
+
+        with patch.object(
+            LogReader,
+            "_get_next_timestamp",
+            side_effect=LogReader._get_next_timestamp,
+            autospec=True,
+        ) as search_mock:
+            indices = self.reader.generate_server_log_indices(self.log)
+
+        self.assertEqual(dict(indices), self._expected_indices())
+        # The search resumes from the last indexed hour.
+        self.assertEqual(
+            len([c for c in search_mock.call_args_list if c[0][2] == 0]), 0
+        )
+
+    def test_rebuilds_indices_when_log_is_replaced(self):
+        self.reader.generate_server_log_indices(self.log)
+
+        with open(self.log, "w") as f:
+            f.write(_log_lines(5, 4))
+
+        self.assertEqual(
+            dict(self.reader.generate_server_log_indices(self.log)),
+            self._expected_indices(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -117,7 +117,10 @@ class GetPmapControllerTest(asynctest.TestCase):
         }
         cluster_mock.info = AsyncMock()
         cluster_mock.info.side_effect = self.mock_info_call
+        self.cluster_mock = cluster_mock
         self.controller = GetPmapController(cluster_mock)
+        GetPmapController._pmap_cache.clear()
+        self.addCleanup(GetPmapController._pmap_cache.clear)
 
     async def test_get_pmap_data(self):
         self.partition_info = {
@@ -174,6 +177,78 @@ class GetPmapControllerTest(asynctest.TestCase):
         actual_output = await self.controller.get_pmap()
         self.assertEqual(expected_output, actual_output)
 
+    async def test_get_pmap_data_is_cached_by_cluster_key(self):
+        self.partition_info = {
+            "10.71.71.169:3000": "test:0:A:2:0:0:0:0:0:0:0:0;test:1:A:0:0:0:0:0:0:0:0:0"
+        }
+        stats = self.cluster_mock.info_namespace_statistics.return_value
+        stats["10.71.71.169:3000"].update(
+            {
+                "migrate_tx_partitions_remaining": "0",
+                "migrate_rx_partitions_remaining": "0",
+            }
+        )
+
+        def partition_info_calls():
+            return [
+                c
+                for c in self.cluster_mock.info.call_args_list
+                if c[0][0] == "partition-info"
+            ]
+
+        expected_output = await self.controller.get_pmap()
+        self.assertEqual(
+            expected_output["10.71.71.169:3000"]["test"]["master_partition_count"], 1
+        )
+
+        self.partition_info = {}
+        actual_output = await self.controller.get_pmap()
+
+        self.assertEqual(expected_output, actual_output)
+        self.assertEqual(len(partition_info_calls()), 1)
+
+        # Migrating nodes are requested again.
+        stats["10.71.71.169:3000"]["migrate_rx_partitions_remaining"] = "10"
+        self.partition_info = {
+            "10.71.71.169:3000": "test:0:A:0:0:0:0:0:0:0:0:0;test:1:A:0:0:0:0:0:0:0:0:0"
+        }
+        actual_output = await self.controller.get_pmap()
+
+        self.assertEqual(len(partition_info_calls()), 2)
+        self.assertEqual(
+            actual_output["10.71.71.169:3000"]["test"]["master_partition_count"], 2
+        )
+
+        # As are nodes whose cluster key changed.
+        stats["10.71.71.169:3000"]["migrate_rx_partitions_remaining"] = "0"
+        self.cluster_mock.info_statistics.return_value = {
+            "10.71.71.169:3000": {"cluster_key": "ck2"}
+        }
+        await self.controller.get_pmap()
+        self.assertEqual(len(partition_info_calls()), 3)
+        actual_output = await self.controller.get_pmap()
+
+        self.assertEqual(len(partition_info_calls()), 3)
+        self.assertEqual(
+            actual_output["10.71.71.169:3000"]["test"]["cluster_key"], "ck2"
+        )
+
+    async def test_get_pmap_data_with_invalid_partitions(self):
+        self.partition_info = {
+            "10.71.71.169:3000": "test:0:A:2:0:0:0:0:0:0:0:0;test:4096:A:0:0:0:0:0:0:0:0:0;"
+            "test:2:A:0:0:0"
+        }
+
+        with patch("builtins.print") as print_mock:
+            actual_output = await self.controller.get_pmap()
+
+        print_mock.assert_called_once_with(
+            "For test found partition-ID 4096 which is beyond legal partitions(0...4096)"
+        )
+        self.assertEqual(
+            actual_output["10.71.71.169:3000"]["test"]["master_partition_count"], 1
+        )
+
 
 class GetConfigControllerTest(asynctest.TestCase):
     def mock_info_call(self, cmd, nodes="all"):
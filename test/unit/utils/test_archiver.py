@@ -0,0 +1,130 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+from lib.utils import archiver
+from lib.utils.archiver import (
+    CollectinfoArchiver,
+    ParallelGzipWriter,
+    create_collectinfo_archiver,
+)
+
+
+class ParallelGzipWriterTest(unittest.TestCase):
+    def test_write(self):
+        data = os.urandom(1000) + b"abc" * 5000
+        fp = io.BytesIO()
+        writer = ParallelGzipWriter(fp, level=6, workers=2, block_size=1024)
+
+        for i in range(0, len(data), 700):
+            writer.write(data[i : i + 700])
+
+        writer.close()
+
+        self.assertEqual(gzip.decompress(fp.getvalue()), data)
+
+
+class CollectinfoArchiverTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.logdir = os.path.join(self.tmp_dir, "collect_info_20210101_000000")
+        os.makedirs(os.path.join(self.logdir, "sub"))
+        self.files = {
+            os.path.join(self.logdir, "ascinfo.json"): b'{"a": 1}',
+            os.path.join(self.logdir, "sysinfo.log"): os.urandom(5000),
+            os.path.join(self.logdir, "sub", "aerospike.conf"): b"service {}",
+        }
+
+        for path, content in self.files.items():
+            with open(path, "wb") as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def read_archive(self, path):
+        with tarfile.open(path) as tar:
+            return {
+                "/" + m.name: tar.extractfile(m).read()
+                for m in tar.getmembers()
+                if m.isfile()
+            }
+
+    def test_archive(self):
+        path = self.logdir + ".tgz"
+        ar = CollectinfoArchiver(path, level=1, workers=2)
+        ar._writer._block_size = 1024
+        first = os.path.join(self.logdir, "sysinfo.log")
+
+        with ar:
+            ar.add(first)
+            ar.add(first)
+            ar.add_dir(self.logdir)
+
+        self.assertEqual(self.read_archive(path), self.files)
+        self.assertEqual(ar.added, set(self.files))
+
+        # Adding after close is ignored
+        ar.add(first)
+        ar.close()
+
+    def test_archive_discard(self):
+        path = self.logdir + ".tgz"
+
+        with self.assertRaises(ValueError):
+            with CollectinfoArchiver(path) as ar:
+                ar.add_dir(self.logdir)
+                raise ValueError()
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_create_collectinfo_archiver(self):
+        ar = create_collectinfo_archiver(self.logdir)
+        ar.discard()
+
+        self.assertEqual(ar.path, self.logdir + ".tgz")
+
+        if not archiver.HAVE_ZSTD:
+            with self.assertRaises(Exception):
+                create_collectinfo_archiver(self.logdir, use_zstd=True)
+
+            self.assertFalse(os.path.exists(self.logdir + ".tar.zst"))
+
+    @unittest.skipUnless(archiver.HAVE_ZSTD, "zstandard is not installed")
+    def test_archive_zstd(self):
+        ar = create_collectinfo_archiver(self.logdir, use_zstd=True)
+
+        with ar:
+            ar.add_dir(self.logdir)
+
+        self.assertEqual(ar.path, self.logdir + ".tar.zst")
+        self.assertTrue(archiver.is_zstd_file(ar.path))
+
+        tar = archiver.open_zstd_tarfile(ar.path)
+        files = {}
+
+        try:
+            for m in tar:
+                files["/" + m.name] = tar.extractfile(m).read()
+        finally:
+            tar.close()
+
+        self.assertEqual(files, self.files)
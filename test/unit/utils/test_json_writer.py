@@ -0,0 +1,70 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import unittest
+from mock import patch
+
+from lib.utils import json_writer
+from lib.utils.json_writer import JSONObjectWriter
+
+
+class JSONObjectWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "t1": {
+                "cluster": {
+                    "n1": {"as_stat": {"a": [1, {"b": "x\\ny"}], "empty": {}}},
+                    "n2": {},
+                }
+            },
+            "t2": {},
+            "t3": {"cluster": {"n1": None}},
+        }
+
+    def _write(self, data, **kwargs):
+        f = io.StringIO()
+        writer = JSONObjectWriter(f, **kwargs)
+
+        for k, v in data.items():
+            writer.write(k, v)
+
+        writer.close()
+        return f.getvalue()
+
+    def test_write_matches_json_dumps(self):
+        for indent in (2, None):
+            for depth in range(4):
+                for data in (self.data, {}):
+                    self.assertEqual(
+                        self._write(data, indent=indent, depth=depth),
+                        json.dumps(data, indent=indent, separators=(",", ":")),
+                    )
+
+    def test_write_encodes_values_below_depth(self):
+        with patch.object(
+            json_writer.json, "dumps", side_effect=json.dumps
+        ) as dumps_mock:
+            self._write(self.data, depth=2)
+
+        encoded = [c[0][0] for c in dumps_mock.call_args_list]
+
+        self.assertIn(self.data["t1"]["cluster"]["n1"], encoded)
+        self.assertNotIn(self.data["t1"], encoded)
+        self.assertNotIn(self.data["t1"]["cluster"], encoded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright 2013-2021 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from lib.utils import lazy_json
+
+
+class LazyJSONTest(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "2021-01-01 00:00:00 UTC": {
+                "cluster": {
+                    "1.1.1.1:3000": {
+                        "as_stat": {
+                            "config": {"service": {"a": "b"}, "list": [1, "]}"]},
+                            "meta_data": {"node_id": "A", "ip": "1.1.1.1:3000"},
+                            "empty": {},
+                            "number": -1.5e3,
+                        },
+                        "sys_stat": {"uname": {"nodename": 'x"\\{y'}},
+                    },
+                }
+            },
+        }
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.data, f, indent=2)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_load_matches_json_load(self):
+        obj = lazy_json.load(self.path, depth=5)
+
+        self.assertEqual(obj, self.data)
+
+    def test_load_decodes_members_on_access(self):
+        obj = lazy_json.load(self.path, depth=5)
+        as_stat = obj["2021-01-01 00:00:00 UTC"]["cluster"]["1.1.1.1:3000"]["as_stat"]
+
+        self.assertIsInstance(as_stat, lazy_json.LazyJSONObject)
+        self.assertFalse(as_stat.is_loaded("config"))
+
+        meta_data = as_stat["meta_data"]
+
+        self.assertEqual(meta_data, {"node_id": "A", "ip": "1.1.1.1:3000"})
+        self.assertTrue(as_stat.is_loaded("meta_data"))
+        self.assertFalse(as_stat.is_loaded("config"))
+        self.assertIs(as_stat["meta_data"], meta_data)
+
+    def test_load_raises_on_invalid_json(self):
+        with open(self.path, "w") as f:
+            f.write('{"a": {"b": 1}')
+
+        self.assertRaises(ValueError, lazy_json.load, self.path, 2)
+
+        with open(self.path, "w") as f:
+            f.write("")
+
+        self.assertRaises(ValueError, lazy_json.load, self.path)
+
+    def test_load_gzip(self):
+        gz_path = self.path + ".gz"
+
+        with gzip.open(gz_path, "wt") as f:
+            json.dump(self.data, f)
+
+        try:
+            self.assertEqual(lazy_json.load(gz_path, depth=3), self.data)
+        finally:
+            os.remove(gz_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import asyncio
+import copy
 import warnings
 
 with warnings.catch_warnings():
@@ -42,6 +43,24 @@ class UtilTest(asynctest.TestCase):
             "get_value_from_dict did not return the expected result",
         )
 
+    def test_freeze(self):
+        data = {"a": {"b": 1}, "c": [{"d": 2}]}
+        frozen = util.freeze(data)
+
+        self.assertEqual(frozen, data)
+        self.assertIsInstance(frozen["a"], util.FrozenDict)
+        self.assertIsInstance(frozen["c"][0], util.FrozenDict)
+        self.assertIs(util.freeze(frozen), frozen)
+        self.assertRaises(TypeError, frozen.__setitem__, "a", 1)
+        self.assertRaises(TypeError, frozen["a"].update, {"b": 2})
+        self.assertRaises(TypeError, frozen.setdefault, "e", 1)
+
+        copied = copy.deepcopy(frozen)
+        copied["a"]["b"] = 2
+
+        self.assertNotIsInstance(copied["a"], util.FrozenDict)
+        self.assertEqual(frozen["a"]["b"], 1)
+
     async def test_async_cached(self):
         tester_count = 0
 
@@ -91,3 +110,84 @@ class UtilTest(asynctest.TestCase):
             Exception, asyncio.wait_for(cached_tester_exc(), 0.1)
         )
         self.assertTrue(await cached_tester_exc())
+
+    async def test_async_cached_evicts_lru(self):
+        async def tester(arg1: int) -> int:
+            return arg1
+
+        cached_tester = util.async_cached(tester, ttl=5.0, max_size=2)
+
+        await cached_tester(1)
+        await cached_tester(2)
+        await cached_tester(1)  # 2 is now least recently used
+        await cached_tester(3)
+
+        self.assertIn((1,), cached_tester.cache)
+        self.assertNotIn((2,), cached_tester.cache)
+        self.assertIn((3,), cached_tester.cache)
+        self.assertDictEqual(
+            cached_tester.stats(),
+            {
+                "size": 2,
+                "max_size": 2,
+                "hits": 1,
+                "misses": 3,
+                "evictions": 1,
+                "expirations": 0,
+            },
+        )
+
+    async def test_async_cached_sweeps_expired(self):
+        async def tester(command: str) -> str:
+            return command
+
+        cached_tester = util.async_cached(tester, ttl=0.1)
+
+        await cached_tester("build")
+        await cached_tester("statistics")
+        await asyncio.sleep(0.2)
+        await cached_tester("node")
+
+        self.assertNotIn(("build",), cached_tester.cache)
+        self.assertNotIn(("statistics",), cached_tester.cache)
+        self.assertIn(("node",), cached_tester.cache)
+        self.assertEqual(cached_tester.stats()["expirations"], 2)
+
+    async def test_capture_stdout_concurrently(self):
+        async def printer(name: str):
+            for i in range(3):
+                print(name, i)
+                await asyncio.sleep(0)
+
+        stdout = util.sys.stdout
+        outputs = await asyncio.gather(
+            util.capture_stdout(printer, "a"), util.capture_stdout(printer, "b")
+        )
+
+        self.assertEqual(outputs, ["a 0\na 1\na 2\n", "b 0\nb 1\nb 2\n"])
+        self.assertIs(util.sys.stdout, stdout)
+
+    async def test_shell_command_async(self):
+        out, err = await util.shell_command_async(["echo", "hello"])
+
+        self.assertEqual((out, err), ("hello\n", ""))
+
+        start = util.time()
+        out, err = await util.shell_command_async(["sleep 5 | cat"], timeout=0.2)
+
+        self.assertLess(util.time() - start, 2)
+        self.assertEqual(out, "")
+        self.assertIn("timed out", err)
+
+    async def test_shell_command_runner(self):
+        runner = util.ShellCommandRunner(2)
+        start = util.time()
+        outputs = await asyncio.gather(
+            *[runner.run(["sleep 0.2; echo", str(i)]) for i in range(4)]
+        )
+
+        # 4 commands, 2 at a time.
+        self.assertGreaterEqual(util.time() - start, 0.4)
+        self.assertEqual([o for o, _ in outputs], ["0\n", "1\n", "2\n", "3\n"])
+        self.assertEqual(len(runner.timings), 4)
+        self.assertEqual(len(runner.slowest(2)), 2)
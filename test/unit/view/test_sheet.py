@@ -19,6 +19,8 @@ with warnings.catch_warnings():
     warnings.filterwarnings("ignore", category=DeprecationWarning)
     import unittest2 as unittest
 
+from mock import patch
+
 from lib.view import sheet
 from lib.view.sheet import (
     Aggregators,
@@ -33,6 +35,7 @@ from lib.view.sheet import (
     Subgroup,
 )
 from lib.view.sheet.decleration import ComplexAggregator
+from lib.view.sheet.render.base_rsheet import BaseRSheet
 
 
 def do_render(*args, **kwargs):
@@ -960,6 +963,95 @@ class SheetTest(unittest.TestCase):
         self.assertEqual(group3record0["f"]["raw"], None)
         self.assertEqual(group3record0["g"]["raw"], None)
 
+    def test_sheet_dynamic_field_render_plan(self):
+        test_sheet = Sheet(
+            (DynamicFields("d", aggregator_selector=self.numeric_sum_selector),),
+            from_source="d",
+        )
+        sources = dict(d=dict(n0=dict(f=1, g="a"), n2=dict(f=2, g="b")))
+        create_dfields = BaseRSheet._create_dfields
+
+        with patch.object(
+            BaseRSheet, "_create_dfields", autospec=True, side_effect=create_dfields
+        ) as create_mock:
+            render = do_render(test_sheet, "test", sources)
+            self.assertEqual(create_mock.call_count, 1)
+
+            # Only the values changed, so the render plan is reused.
+            sources = dict(d=dict(n0=dict(f=3, g="c"), n2=dict(f=4, g="d")))
+            render = do_render(test_sheet, "test", sources)
+            self.assertEqual(create_mock.call_count, 1)
+            self.assertEqual(render["groups"][0]["aggregates"]["f"]["raw"], 7)
+
+            # A float value changes the projector of f.
+            sources = dict(d=dict(n0=dict(f="3.5", g="c"), n2=dict(f=4, g="d")))
+            render = do_render(test_sheet, "test", sources)
+            self.assertEqual(create_mock.call_count, 2)
+            self.assertEqual(render["groups"][0]["aggregates"]["f"]["raw"], 7.5)
+
+            do_render(test_sheet, "test", sources, selectors=["g"])
+            self.assertEqual(create_mock.call_count, 3)
+
+    def test_sheet_records_are_shared_by_fields(self):
+        records = []
+
+        def record_converter(edata):
+            records.append(edata.record)
+            return edata.value
+
+        test_sheet = Sheet(
+            (
+                Field("f", Projectors.Number("d", "f"), converter=record_converter),
+                Field("g", Projectors.Number("d", "g"), converter=record_converter),
+            ),
+            from_source="d",
+        )
+        sources = dict(d=dict(n0=dict(f=1, g=2), n1=dict(f=3, g=4)))
+        sheet.render(test_sheet, "test", sources, style=SheetStyle.json)
+
+        self.assertEqual(records[0], dict(f=1, g=2))
+        self.assertEqual(records[1], dict(f=3, g=4))
+        self.assertIs(records[0], records[2])
+        self.assertIs(records[1], records[3])
+
+    def test_sheet_stream(self):
+        test_sheet = Sheet(
+            (
+                Field("g", Projectors.String("d", "g")),
+                Field("f", Projectors.Number("d", "f"), aggregator=Aggregators.sum()),
+            ),
+            from_source="d",
+            group_by="g",
+        )
+        sources = dict(
+            d=dict(n0=dict(f=1, g="a"), n1=dict(f=3, g="a"), n2=dict(f=4, g="b"))
+        )
+
+        for style in (SheetStyle.columns, SheetStyle.rows):
+            lines = sheet.render(test_sheet, "test", sources, style=style, stream=True)
+
+            self.assertEqual(
+                "\n".join(lines) + "\n",
+                sheet.render(test_sheet, "test", sources, style=style),
+            )
+
+        # JSON is not streamed, it does not end with a newline.
+        self.assertEqual(
+            sheet.render(
+                test_sheet, "test", sources, style=SheetStyle.json, stream=True
+            ),
+            sheet.render(test_sheet, "test", sources, style=SheetStyle.json),
+        )
+
+    def test_sheet_stream_empty(self):
+        test_sheet = Sheet((Field("f", Projectors.Number("d", "f")),), from_source="d")
+        sources = dict(d=dict(n0=dict(g=1)))
+
+        for style in (SheetStyle.columns, SheetStyle.rows):
+            lines = sheet.render(test_sheet, "test", sources, style=style, stream=True)
+
+            self.assertEqual(list(lines), [])
+
     # def test_sheet_dynamic_field_every_nth_row(self):
     #     pass
 
@@ -12,14 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from io import StringIO
+import os
+import tempfile
 import unittest
-from mock import patch
+from mock import AsyncMock, MagicMock, patch
 
+from lib.health.constants import AssertLevel
 from lib.view import templates
 from lib.view.view import CliView
 from lib.view.sheet.const import SheetStyle
 from lib.live_cluster.client.node import ASInfoError
 
+import warnings
+
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    import asynctest
+
 
 class CliViewTest(unittest.TestCase):
     def setUp(self) -> None:
@@ -293,3 +303,118 @@ class CliViewTest(unittest.TestCase):
             "Racks (test-stamp)",
             sources,
         )
+
+    def test_print_assert_changes(self):
+        change = {
+            "index": 2,
+            "query": 'ASSERT(t, False, "uptime", "OPERATIONS", WARNING)',
+            "previous": False,
+            "current": True,
+            "assert": {"Failmsg": "uptime", "Level": AssertLevel.WARNING},
+        }
+
+        with patch("builtins.print") as print_mock:
+            CliView._print_assert_changes({"assert_changes": []})
+            print_mock.assert_not_called()
+
+            CliView._print_assert_changes({"assert_changes": [change]})
+            output = print_mock.call_args[0][0]
+
+        self.assertIn("Changed Since Last Run", output)
+        self.assertIn("FAIL -> PASS:", output)
+        self.assertIn("uptime", output)
+
+    def test_print_result_lines(self):
+        with patch("builtins.print") as print_mock:
+            CliView.print_result(iter([]))
+            print_mock.assert_not_called()
+
+            CliView.print_result(iter(["a", "b"]))
+
+        self.assertEqual([c[0][0] for c in print_mock.call_args_list], ["a", "b", ""])
+
+    def test_print_result_lines_to_pager(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out_file = os.path.join(tmp, "out")
+
+            with patch.object(CliView, "pager", CliView.LESS), patch.object(
+                CliView, "_get_less_cmd", return_value="cat > " + out_file
+            ):
+                CliView.print_result(iter(["a", "b"]))
+
+            with open(out_file) as f:
+                self.assertEqual(f.read(), "a\nb\n")
+
+
+class CliViewWatchTest(asynctest.TestCase):
+    def setUp(self) -> None:
+        patch("lib.view.view.terminal.inverse", return_value="[").start()
+        patch("lib.view.view.terminal.uninverse", return_value="]").start()
+        self.addCleanup(patch.stopall)
+
+    def test_watch_render(self):
+        result, rows, changed = CliView._watch_render(
+            "\033[1mName\033[0m | a\nn1 | 10 | x\nn2 | 7 | y\n", None, set(), False
+        )
+
+        self.assertEqual(result, "\033[1mName\033[0m | a\nn1 | 10 | x\nn2 | 7 | y\n")
+        self.assertEqual(rows, ["Name | a", "n1 | 10 | x", "n2 | 7 | y", ""])
+        self.assertEqual(changed, set())
+
+        result, rows, changed = CliView._watch_render(
+            "\033[1mName\033[0m | a\nn1 | 11 | x\nn2 | 7 | yz\n", rows, changed, False
+        )
+
+        self.assertEqual(
+            result, "\033[1mName\033[0m | a\nn1 | [11] | x\nn2 | 7 | [yz]\n"
+        )
+        self.assertEqual(changed, {1, 2})
+
+        # Only changed rows and the ones highlighted before are redrawn.
+        result, rows, changed = CliView._watch_render(
+            "\033[1mName\033[0m | a\nn1 | 12 | x\nn2 | 7 | yz\n", rows, changed, True
+        )
+
+        self.assertEqual(
+            result,
+            "\n\r\033[2Kn1 | [12] | x\n\r\033[2Kn2 | 7 | yz\n\n",
+        )
+        self.assertEqual(changed, {1})
+
+    def test_watch_highlight_across_escapes(self):
+        self.assertEqual(
+            CliView._watch_highlight("a \033[1mbc\033[0md e", [(2, 5)]),
+            "a \033[1m[bc]\033[0m[d] e",
+        )
+
+    async def test_watch(self):
+        count = 0
+
+        async def execute(line):
+            nonlocal count
+            count += 1
+            print("n1 | {}".format(count))
+
+        ctrl = MagicMock()
+        ctrl.execute = AsyncMock(side_effect=execute)
+        refresh = MagicMock()
+        sleep_mock = patch("lib.view.view.asyncio.sleep", AsyncMock()).start()
+        patch("lib.view.view.terminal.color_enabled", True).start()
+
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            await CliView.watch(ctrl, ["1", "3", "show", "stat"], refresh=refresh)
+
+        lines = stdout.getvalue().split("\n")
+
+        self.assertEqual(ctrl.execute.call_count, 3)
+        ctrl.execute.assert_called_with(["show", "stat"])
+        self.assertEqual(refresh.call_count, 2)
+        self.assertIn("'show stat' sleep: 1.0s iteration: 3  of 3 ]", lines[6])
+        self.assertEqual(lines[7], "n1 | [3]")
+
+        # Sleeping is mocked so iterations are due 1 and 2 seconds after the
+        # first one started.
+        self.assertEqual(sleep_mock.call_count, 2)
+
+        for c, due in zip(sleep_mock.call_args_list, [1, 2]):
+            self.assertAlmostEqual(c[0][0], due, delta=0.5)